@@ -0,0 +1,192 @@
+"""Headless batch processing of a directory of quiz workbooks."""
+from __future__ import annotations
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ui.file_handler import FileHandler
+
+
+DEFAULT_SHEET_PATTERN = 'Team Analysis'
+MANIFEST_NAME = 'batch_manifest.json'
+
+
+@dataclass
+class BatchJob:
+    """One workbook sheet to process."""
+    input_file: str
+    sheet_name: str
+    output_file: str
+
+
+@dataclass
+class BatchJobResult:
+    """Outcome and per-stage timings of a batch job."""
+    input_file: str
+    sheet_name: str
+    output_file: str
+    status: str
+    timings: Dict[str, float] = field(default_factory=dict)
+    num_students: int = 0
+    num_questions: int = 0
+    error: Optional[str] = None
+
+
+def list_matching_sheets(workbook: Path, sheet_pattern: str) -> List[str]:
+    """Get the sheet names of a workbook that match a glob pattern."""
+    from sheet_reader import list_sheets
+    return list_sheets(workbook, sheet_pattern)
+
+
+def discover_jobs(input_dir: Path, output_dir: Path,
+                  sheet_pattern: str = DEFAULT_SHEET_PATTERN) -> Tuple[List[BatchJob], List[BatchJobResult]]:
+    """Find every matching sheet of every workbook under a directory.
+
+    Output files mirror the input directory layout. Workbooks with more than
+    one matching sheet get one output file per sheet. Workbooks that cannot
+    be opened, or have no matching sheet, get no job; they are returned as
+    'failed' and 'skipped' results so the manifest still lists them.
+    """
+    jobs, unprocessed = [], []
+    for workbook in FileHandler.get_input_files(input_dir):
+        relative = workbook.relative_to(input_dir)
+        try:
+            sheets = list_matching_sheets(workbook, sheet_pattern)
+        except Exception as exc:
+            unprocessed.append(BatchJobResult(str(workbook), sheet_pattern, '', status='failed',
+                                              error=f"{type(exc).__name__}: {exc}"))
+            continue
+        if not sheets:
+            unprocessed.append(BatchJobResult(str(workbook), sheet_pattern, '', status='skipped',
+                                              error=f"No sheet matches '{sheet_pattern}'"))
+            continue
+        for sheet_name in sheets:
+            stem = relative.stem if len(sheets) == 1 else f"{relative.stem} - {sheet_name}"
+            output_file = output_dir / relative.parent / f"{stem}.xlsx"
+            jobs.append(BatchJob(str(workbook), sheet_name, str(output_file)))
+    return jobs, unprocessed
+
+
+def run_job(job: BatchJob, total_points: float, raw_score_per_question: float) -> BatchJobResult:
+    """Load, process and save one sheet, recording failures instead of raising."""
+    from quiz_processor import QuizProcessor
+
+    result = BatchJobResult(job.input_file, job.sheet_name, job.output_file, status='ok')
+    try:
+        start = time.perf_counter()
+        processor = QuizProcessor(Path(job.input_file), job.sheet_name, total_points, raw_score_per_question)
+        result.timings['load'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = processor.score()
+        result.timings['process'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Path(job.output_file).parent.mkdir(parents=True, exist_ok=True)
+        processor.save_to_excel(scores, Path(job.output_file))
+        result.timings['save'] = time.perf_counter() - start
+
+        result.num_students = scores.num_students
+        result.num_questions = len(scores.question_numbers)
+    except Exception as exc:
+        result.status = 'failed'
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.timings['total'] = sum(result.timings.values())
+    return result
+
+
+def run_batch(input_dir: Path, output_dir: Path, total_points: float, raw_score_per_question: float,
+              sheet_pattern: str = DEFAULT_SHEET_PATTERN, workers: Optional[int] = None) -> Dict:
+    """Process every matching sheet under a directory in a process pool and write a manifest.
+
+    Raises ValueError when ``workers`` is below 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+    started = time.perf_counter()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs, unprocessed = discover_jobs(input_dir, output_dir, sheet_pattern)
+    workers = workers or os.cpu_count() or 1
+
+    results: List[BatchJobResult] = list(unprocessed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_job, job, total_points, raw_score_per_question): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                # The worker process itself died; record it and keep going.
+                results.append(BatchJobResult(job.input_file, job.sheet_name, job.output_file,
+                                              status='failed', error=f"{type(exc).__name__}: {exc}"))
+
+    results.sort(key=lambda r: (r.input_file, r.sheet_name))
+    manifest = {
+        'input_dir': str(input_dir),
+        'output_dir': str(output_dir),
+        'sheet_pattern': sheet_pattern,
+        'total_points': total_points,
+        'raw_score_per_question': raw_score_per_question,
+        'workers': workers,
+        'elapsed_seconds': time.perf_counter() - started,
+        'succeeded': sum(r.status == 'ok' for r in results),
+        'failed': sum(r.status == 'failed' for r in results),
+        'skipped': sum(r.status == 'skipped' for r in results),
+        'jobs': [asdict(r) for r in results]
+    }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def positive_int(text: str) -> int:
+    """Parse a command line integer that must be at least 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for batch processing."""
+    parser = argparse.ArgumentParser(description="Process every quiz workbook in a directory.")
+    parser.add_argument('input_dir', nargs='?', type=Path, default=Path('inputdata'),
+                        help="Directory searched recursively for .xlsx files (default: inputdata)")
+    parser.add_argument('-o', '--output-dir', type=Path, default=Path('outputdata'),
+                        help="Directory for processed reports and the manifest (default: outputdata)")
+    parser.add_argument('--sheet', default=DEFAULT_SHEET_PATTERN,
+                        help="Sheet name or glob pattern to process (default: 'Team Analysis')")
+    parser.add_argument('--total-points', type=float, required=True,
+                        help="Total points for each quiz")
+    parser.add_argument('--raw-per-question', type=float, required=True,
+                        help="Raw score possible per question")
+    parser.add_argument('-j', '--workers', type=positive_int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a batch from the command line; returns a non-zero exit code if any job failed or was skipped."""
+    args = build_parser().parse_args(argv)
+    manifest = run_batch(args.input_dir, args.output_dir, args.total_points, args.raw_per_question,
+                         args.sheet, args.workers)
+
+    for job in manifest['jobs']:
+        label = f"{job['input_file']} [{job['sheet_name']}]"
+        if job['status'] == 'ok':
+            print(f"OK      {label} -> {job['output_file']} ({job['timings']['total']:.2f}s)")
+        else:
+            print(f"{job['status'].upper():<7} {label}: {job['error']}")
+    print(f"\n{manifest['succeeded']} succeeded, {manifest['failed']} failed, {manifest['skipped']} skipped "
+          f"in {manifest['elapsed_seconds']:.2f}s. Manifest: {args.output_dir / MANIFEST_NAME}")
+    return 1 if manifest['failed'] or manifest['skipped'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""Compare patching the previous report with writing it again after a new export.
+
+Each run changes the scores of a fraction of the teams in a new export,
+carries edits made on the previous export forward, then either patches
+the previous report with :func:`report_formats.patch_report` or writes
+the whole report with :func:`report_formats.write_report`.
+
+Run from the project root:
+    python -m benchmarks.bench_delta
+"""
+from __future__ import annotations
+import tempfile
+import time
+from pathlib import Path
+from quiz_processor import QuizProcessor
+from delta_processor import carry_forward, diff_exports
+from report_formats import parquet_available, patch_report, write_report
+from ui.score_change import ScoreChange
+from benchmarks.synthetic import generate_score_edits, generate_team_analysis_frame
+
+
+NUM_STUDENTS = 20_000
+NUM_QUESTIONS = 50
+EDIT_FRACTION = 0.0005
+CHANGED_TEAM_FRACTIONS = [0.001, 0.01, 0.1]
+
+
+def new_export(df, score_columns, fraction: float):
+    """Copy an export and change the first score of the given fraction of teams."""
+    teams = df['Team'].drop_duplicates()
+    step = max(1, round(1 / fraction))
+    changed = df['Team'].isin(teams.iloc[::step])
+    column = score_columns[min(score_columns)]
+    df = df.copy()
+    df.loc[changed, column] = (df.loc[changed, column] + 1) % 6
+    return df
+
+
+def main() -> None:
+    """Print the diff, carry-forward, patch and full-write times per format and change fraction."""
+    df = generate_team_analysis_frame(NUM_STUDENTS, num_questions=NUM_QUESTIONS)
+    previous = QuizProcessor(Path('previous.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+    edits = [ScoreChange(team, q_num, previous.get_team_score(team, q_num), score)
+             for team, q_num, score in generate_score_edits(previous.teams, previous.question_numbers,
+                                                            EDIT_FRACTION)]
+    previous.set_team_scores(*zip(*[(c.team_name, c.question_number, c.new_score) for c in edits]))
+    previous.record_score_changes(edits)
+    formats = ['csv', 'jsonl'] + (['parquet'] if parquet_available() else [])
+
+    print(f"{NUM_STUDENTS} students, {NUM_QUESTIONS} questions, {len(edits)} edits carried forward")
+    print(f"  {'changed':>8} {'format':<8} {'diff (s)':>9} {'carry (s)':>10} {'patch (s)':>10} {'full (s)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        for fmt in formats:
+            write_report(previous.score(), previous.changed_scores, out_dir / f"previous.{fmt}", fmt)
+        for fraction in CHANGED_TEAM_FRACTIONS:
+            original = QuizProcessor(Path('previous.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+            current = QuizProcessor(Path('current.xlsx'), 'Team Analysis', 10.0, 5.0,
+                                    data=new_export(df, previous.score_columns, fraction))
+            start = time.perf_counter()
+            diff = diff_exports(original, current)
+            diff_time = time.perf_counter() - start
+            start = time.perf_counter()
+            carried = carry_forward(edits, current)
+            current.record_score_changes(carried.applied)
+            carry_time = time.perf_counter() - start
+            result = current.score()
+            teams = diff.affected_teams | {c.team_name for c in edits}
+            for fmt in formats:
+                start = time.perf_counter()
+                patch_report(out_dir / f"previous.{fmt}", out_dir / f"patched.{fmt}", result,
+                             current.changed_scores, teams)
+                patch_time = time.perf_counter() - start
+                start = time.perf_counter()
+                write_report(result, current.changed_scores, out_dir / f"full.{fmt}", fmt)
+                full_time = time.perf_counter() - start
+                print(f"  {fraction:>8.1%} {fmt:<8} {diff_time:>9.3f} {carry_time:>10.3f} "
+                      f"{patch_time:>10.3f} {full_time:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare report write time, peak memory and file size per output format.
+
+The chunked CSV, Parquet and JSON Lines writers are compared with the
+streaming Excel writer and with writing CSV from the full per-student
+frame. Time comes from an untraced run. Peak memory is the tracemalloc peak
+of a second run; it covers numpy and pandas buffers but not pyarrow's own
+allocator.
+
+Run from the project root:
+    python -m benchmarks.bench_export
+"""
+from __future__ import annotations
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+from quiz_processor import QuizProcessor
+from report_formats import REPORT_FORMATS, parquet_available, write_report
+from report_writer import report_frame
+from benchmarks.synthetic import generate_score_edits, generate_team_analysis_frame
+
+
+COHORTS = [5_000, 20_000]
+NUM_QUESTIONS = 50
+EDIT_FRACTION = 0.01
+
+
+def measure(write: Callable[[], None]) -> Tuple[float, float]:
+    """Run a write twice: untraced for wall time in seconds, then traced for peak memory in MiB."""
+    gc.collect()
+    start = time.perf_counter()
+    write()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    try:
+        write()
+        return elapsed, tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def measure_cohort(num_students: int, out_dir: Path) -> List[Tuple[str, float, float, float]]:
+    """Write one cohort in every format; returns (format, seconds, peak MiB, file MiB) rows."""
+    df = generate_team_analysis_frame(num_students, num_questions=NUM_QUESTIONS)
+    processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+    edits = generate_score_edits(processor.teams, processor.question_numbers, EDIT_FRACTION)
+    processor.set_team_scores(*zip(*edits))
+    processor.changed_scores = {}
+    for team, q_num, _ in edits:
+        processor.changed_scores.setdefault(team, set()).add(q_num)
+    result = processor.score()
+
+    rows = []
+    formats = [fmt for fmt in REPORT_FORMATS if fmt != 'parquet' or parquet_available()]
+    for fmt in formats:
+        path = out_dir / f"report_{num_students}.{fmt}"
+        seconds, peak = measure(lambda: write_report(result, processor.changed_scores, path, fmt))
+        rows.append((fmt, seconds, peak, path.stat().st_size / 2**20))
+
+    path = out_dir / f"report_{num_students}_frame.csv"
+    seconds, peak = measure(lambda: report_frame(result).to_csv(path, index=False))
+    rows.append(('csv (full frame)', seconds, peak, path.stat().st_size / 2**20))
+    return rows
+
+
+def main() -> None:
+    """Print a table of write cost per format for each cohort size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_students in COHORTS:
+            print(f"{num_students} students, {NUM_QUESTIONS} questions")
+            print(f"  {'format':<18} {'time (s)':>9} {'peak (MiB)':>11} {'file (MiB)':>11}")
+            for fmt, seconds, peak, size in measure_cohort(num_students, Path(tmp)):
+                print(f"  {fmt:<18} {seconds:>9.3f} {peak:>11.1f} {size:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
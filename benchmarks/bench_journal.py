@@ -0,0 +1,61 @@
+"""Compare journal autosave with the full Excel snapshot save, and time replay.
+
+Run from the project root:
+    python -m benchmarks.bench_journal
+"""
+from __future__ import annotations
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+from quiz_processor import QuizProcessor
+from score_journal import ScoreJournal
+from ui.score_change import ScoreChange
+from benchmarks.synthetic import generate_score_edits, generate_team_analysis_frame
+
+
+NUM_STUDENTS = 20_000
+NUM_QUESTIONS = 50
+EDIT_COUNTS = [100, 1_000, 10_000]
+
+
+def excel_snapshot_seconds(processor: QuizProcessor, changes: list, path: Path) -> float:
+    """Time one save of the changes list plus every team's scores, as the web app's Save Changes does."""
+    start = time.perf_counter()
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame([vars(c) for c in changes]).to_excel(writer, index=False, sheet_name='Score Changes')
+        processor.store.to_frame().to_excel(writer, index=False, sheet_name='Current Scores')
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print per-edit autosave cost, replay time and the Excel snapshot cost per edit count."""
+    df = generate_team_analysis_frame(NUM_STUDENTS, num_questions=NUM_QUESTIONS)
+    print(f"{NUM_STUDENTS} students, {NUM_QUESTIONS} questions")
+    print(f"{'edits':>7} {'append/edit (us)':>17} {'replay (s)':>11} {'excel save (s)':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in EDIT_COUNTS:
+            processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+            edits = generate_score_edits(processor.teams, processor.question_numbers,
+                                         count / (len(processor.teams) * NUM_QUESTIONS))
+            journal = ScoreJournal(Path(tmp) / f"journal_{count}.jsonl")
+            changes = []
+            start = time.perf_counter()
+            for team, q_num, score in edits:
+                change = ScoreChange(team, q_num, processor.get_team_score(team, q_num), score)
+                processor.set_team_score(team, q_num, score)
+                journal.append(change)
+                changes.append(change)
+            append_us = (time.perf_counter() - start) / len(edits) * 1e6
+
+            fresh = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+            start = time.perf_counter()
+            journal.replay(fresh)
+            replay = time.perf_counter() - start
+
+            excel = excel_snapshot_seconds(processor, changes, Path(tmp) / f"snapshot_{count}.xlsx")
+            print(f"{len(edits):>7} {append_us:>17.1f} {replay:>11.4f} {excel:>15.3f}")
+
+
+if __name__ == '__main__':
+    main()
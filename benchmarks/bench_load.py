@@ -0,0 +1,46 @@
+"""Compare cold (Excel parse) and warm (columnar sidecar) workbook loads.
+
+Run from the project root:
+    python -m benchmarks.bench_load
+"""
+from __future__ import annotations
+import tempfile
+import time
+from pathlib import Path
+from quiz_processor import QuizProcessor
+from sidecar_cache import SidecarCache
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+ROW_COUNTS = [1_000, 10_000]
+SHEET_NAME = 'Team Analysis'
+
+
+def time_load(workbook: Path, use_sidecar: bool) -> float:
+    """Return the wall time to build a processor from the workbook."""
+    start = time.perf_counter()
+    QuizProcessor(workbook, SHEET_NAME, 10.0, 5.0, use_sidecar=use_sidecar)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print cold and warm load times for each row count."""
+    if not SidecarCache.is_available():
+        print("pyarrow is not installed; the sidecar cache is disabled.")
+        return
+
+    print(f"{'rows':>8} {'cold (s)':>10} {'warm (s)':>10} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in ROW_COUNTS:
+            workbook = Path(tmp) / f"quiz_{rows}.xlsx"
+            generate_team_analysis_frame(rows, num_questions=100).to_excel(
+                workbook, sheet_name=SHEET_NAME, index=False)
+
+            SidecarCache().invalidate(workbook, SHEET_NAME)
+            cold = time_load(workbook, use_sidecar=True)
+            warm = time_load(workbook, use_sidecar=True)
+            print(f"{rows:>8} {cold:>10.3f} {warm:>10.4f} {cold / warm:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Measure the per-session memory saved by the typed load schema.
+
+The baseline frame has the dtypes ``pd.read_excel`` infers: object text
+columns and float64 scores. Each session holds the loaded frame plus the
+processor's store, aggregates and statistics, measured with the session
+pool's own size estimate.
+
+Run from the project root:
+    python -m benchmarks.bench_load_schema
+"""
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Tuple
+from quiz_processor import QuizProcessor
+from web.session_store import estimate_processor_bytes
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+COHORTS = [(10_000, 50), (50_000, 100)]
+TEXT_COLUMNS = ['Team', 'Student Name', 'Email Address']
+
+
+def build(df, compact_dtypes: bool) -> Tuple[QuizProcessor, float]:
+    """Build a processor and return it with the build time in seconds."""
+    start = time.perf_counter()
+    processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df,
+                              compact_dtypes=compact_dtypes)
+    return processor, time.perf_counter() - start
+
+
+def main() -> None:
+    """Print frame and session sizes with inferred and typed dtypes for each cohort."""
+    print(f"{'students':>9} {'questions':>9} {'dtypes':<9} {'frame (MiB)':>12} {'session (MiB)':>14} "
+          f"{'build (s)':>10}")
+    for num_students, num_questions in COHORTS:
+        df = generate_team_analysis_frame(num_students, num_questions=num_questions)
+        df = df.astype({col: object for col in TEXT_COLUMNS})
+        sizes = {}
+        for label, compact in (('inferred', False), ('typed', True)):
+            processor, seconds = build(df, compact)
+            frame = processor.df.memory_usage(deep=True).sum() / 2**20
+            sizes[label] = estimate_processor_bytes(processor) / 2**20
+            print(f"{num_students:>9} {num_questions:>9} {label:<9} {frame:>12.1f} {sizes[label]:>14.1f} "
+                  f"{seconds:>10.3f}")
+        saved = sizes['inferred'] - sizes['typed']
+        print(f"{'':>19} saved per session: {saved:.1f} MiB ({saved / sizes['inferred']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
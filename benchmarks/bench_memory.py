@@ -0,0 +1,78 @@
+"""Compare the memory held by per-student results with the compact team-level result.
+
+Run from the project root:
+    python -m benchmarks.bench_memory
+"""
+from __future__ import annotations
+import gc
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+from quiz_processor import QuizProcessor
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+COHORTS = [10_000, 50_000]
+TEAM_SIZE = 5
+NUM_QUESTIONS = 100
+
+
+def retained_mb(build: Callable[[], Any]) -> Tuple[Any, float]:
+    """Build an object and return it with the traced memory it still holds in MiB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        gc.collect()
+        return value, (tracemalloc.get_traced_memory()[0] - before) / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def per_student_scores(processor: QuizProcessor) -> Any:
+    """Per-student raw and adjusted score matrices, as held by a row-per-student model."""
+    result = processor.score()
+    idx = result.student_team_index
+    return result.raw_scores[idx], result.adjusted_scores[idx]
+
+
+def measure_cohort(num_students: int) -> List[Tuple[str, float]]:
+    """Measure retained memory of each result representation for one cohort size."""
+    df = generate_team_analysis_frame(num_students, team_size=TEAM_SIZE, num_questions=NUM_QUESTIONS)
+    processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+
+    _, records = retained_mb(lambda: processor.process_data()[0])
+    _, frame = retained_mb(lambda: processor._create_output_dataframe(processor.score()))
+    _, student_scores = retained_mb(lambda: per_student_scores(processor))
+    result64, compact64 = retained_mb(processor.score)
+    result32, compact32 = retained_mb(lambda: processor.score('float32'))
+    team_scores64 = (result64.raw_scores.nbytes + result64.adjusted_scores.nbytes) / 2**20
+    team_scores32 = (result32.raw_scores.nbytes + result32.adjusted_scores.nbytes) / 2**20
+    return [
+        ('list-of-dicts records', records),
+        ('per-student report frame', frame),
+        ('per-student score matrices', student_scores),
+        ('team score matrices float64', team_scores64),
+        ('team score matrices float32', team_scores32),
+        ('compact result float64', compact64),
+        ('compact result float32', compact32),
+    ]
+
+
+def main() -> None:
+    """Print retained memory per representation and the per-student to team score ratio."""
+    for num_students in COHORTS:
+        rows = measure_cohort(num_students)
+        print(f"\n{num_students} students, team size {TEAM_SIZE}, {NUM_QUESTIONS} questions")
+        print(f"  {'representation':<30} {'MB':>10}")
+        for name, size in rows:
+            print(f"  {name:<30} {size:>10.1f}")
+        sizes = dict(rows)
+        print(f"  per-student / team score ratio: "
+              f"{sizes['per-student score matrices'] / sizes['team score matrices float64']:.1f}x")
+        print("  (the compact result shares its student table with the processor's store)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Compare the incrementally kept question statistics with rescanning the sheet per view.
+
+The rescan baseline computes the same per-question figures from
+``processor.df`` column by column, as a view without the statistics would.
+
+Run from the project root:
+    python -m benchmarks.bench_question_stats
+"""
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Callable
+import pandas as pd
+from quiz_processor import QuizProcessor
+from scoring_engine import QuestionStatistics
+from benchmarks.synthetic import generate_score_edits, generate_team_analysis_frame
+
+
+COHORTS = [(5_000, 120), (20_000, 120), (20_000, 300)]
+EDITS = 1_000
+REPEATS = 5
+
+
+def best_of(run: Callable[[], object], repeats: int = REPEATS) -> float:
+    """Return the fastest wall time of several runs in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def rescan_statistics(processor: QuizProcessor) -> pd.DataFrame:
+    """Compute mean, full-marks share and distribution by scanning each score column."""
+    teams = processor.df.drop_duplicates('Team')
+    max_score = processor.raw_score_per_question
+    rows = []
+    for q_num in processor.question_numbers:
+        scores = teams[processor.score_columns[q_num]].dropna()
+        rows.append({
+            'Question': f'Q{q_num}',
+            'Mean': scores.mean(),
+            'Full Marks %': (scores >= max_score).mean() * 100,
+            'Distribution': pd.cut(scores, 10).value_counts(sort=False).tolist()
+        })
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    """Print build, per-view and per-edit costs for each cohort."""
+    print(f"{'students':>9} {'questions':>9} {'build (ms)':>11} {'view (ms)':>10} "
+          f"{'rescan (ms)':>12} {'edit (us)':>10}")
+    for num_students, num_questions in COHORTS:
+        df = generate_team_analysis_frame(num_students, num_questions=num_questions)
+        processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+        build = best_of(lambda: QuestionStatistics(processor.store.scores, processor.raw_score_per_question))
+        view = best_of(lambda: (processor.question_stats_frame(), processor.question_distribution_frame()))
+        rescan = best_of(lambda: rescan_statistics(processor))
+
+        edits = generate_score_edits(processor.teams, processor.question_numbers,
+                                     EDITS / (len(processor.teams) * num_questions))
+        start = time.perf_counter()
+        for team, q_num, score in edits:
+            processor.set_team_score(team, q_num, score)
+        edit = (time.perf_counter() - start) / len(edits)
+        print(f"{num_students:>9} {num_questions:>9} {build * 1000:>11.1f} {view * 1000:>10.2f} "
+              f"{rescan * 1000:>12.1f} {edit * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Compare full-sheet and column-selective reads across Excel reader engines.
+
+Sheets carry extra answer-text columns, as LMS exports do. Run from the
+project root:
+    python -m benchmarks.bench_reader
+"""
+from __future__ import annotations
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+from sheet_reader import calamine_available, read_quiz_sheet
+from benchmarks.synthetic import write_team_analysis_workbook
+
+
+SHEETS = [(2_000, 40, 40), (10_000, 50, 100)]
+SHEET_NAME = 'Team Analysis'
+
+
+def time_read(workbook: Path, engine: str, all_columns: bool) -> Tuple[float, int]:
+    """Return the wall time and column count of one sheet read."""
+    start = time.perf_counter()
+    df = read_quiz_sheet(workbook, SHEET_NAME, engine, all_columns=all_columns)
+    return time.perf_counter() - start, len(df.columns)
+
+
+def main() -> None:
+    """Print read times per engine and column selection for each sheet shape."""
+    engines: List[str] = ['openpyxl'] + (['calamine'] if calamine_available() else [])
+    if len(engines) == 1:
+        print("python-calamine is not installed; only openpyxl is measured.")
+
+    print(f"{'rows':>7} {'scores':>7} {'extra':>6} {'engine':<9} {'columns':<9} {'read':>5} {'seconds':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows, questions, extra in SHEETS:
+            workbook = write_team_analysis_workbook(Path(tmp) / f"wide_{rows}.xlsx", rows,
+                                                    num_questions=questions, extra_columns=extra)
+            for engine in engines:
+                for all_columns in (True, False):
+                    seconds, read = time_read(workbook, engine, all_columns)
+                    selection = 'all' if all_columns else 'required'
+                    print(f"{rows:>7} {questions:>7} {extra:>6} {engine:<9} {selection:<9} {read:>5} {seconds:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Compare the vectorized scoring engine against the previous groupby/iterrows loop.
+
+The engine column times deriving the aggregates from the score matrix and
+then taking the scoring snapshot, the work the legacy loop did in one
+pass. The snapshot column times :meth:`QuizProcessor.score` alone, which
+only copies aggregates kept current since load.
+
+Run from the project root:
+    python -m benchmarks.bench_scoring
+"""
+from __future__ import annotations
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from quiz_processor import QuizProcessor
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+ROW_COUNTS = [1_000, 10_000, 100_000]
+
+
+def legacy_process_data(processor: QuizProcessor) -> List[Dict]:
+    """Reference implementation of the per-team loop replaced by the engine."""
+    results = []
+    points_per_question = processor.total_points / len(processor.question_numbers)
+    for team_name, team_data in processor.df.groupby('Team'):
+        first_student = team_data.iloc[0]
+        earned_raw_scores = [
+            float(first_student[f"{q_num}_Score"])
+            for q_num in processor.question_numbers
+            if f"{q_num}_Score" in processor.df.columns
+        ]
+        team_raw_total = sum(earned_raw_scores)
+        team_adjusted_total = (team_raw_total * processor.total_points) / processor.max_possible_raw_total
+        adjusted_scores = [
+            (score * points_per_question) / processor.raw_score_per_question
+            for score in earned_raw_scores
+        ]
+        for _, student in team_data.iterrows():
+            results.append({
+                'Team Name': team_name,
+                'Student ID': student['Student ID'],
+                'Student Name': student['Student Name'],
+                'Email Address': student['Email Address'],
+                'Raw Scores': earned_raw_scores,
+                'Student Raw Total': team_raw_total,
+                'Team Raw Total': team_raw_total,
+                'Team Adjusted Total': team_adjusted_total,
+                'Adjusted Scores': adjusted_scores,
+                'Student Adjusted Total': team_adjusted_total
+            })
+    return results
+
+
+def score_from_scratch(processor: QuizProcessor) -> None:
+    """Derive the totals and question statistics from the score matrix, then take the snapshot."""
+    processor.set_parameters(processor.total_points, processor.raw_score_per_question)
+    processor.score()
+
+
+def time_call(func: Callable[[], object]) -> float:
+    """Return the wall time of a single call in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print legacy vs vectorized timings for each row count."""
+    print(f"{'rows':>8} {'legacy (s)':>12} {'engine (s)':>12} {'snapshot (s)':>13} {'records (s)':>12} "
+          f"{'speedup':>9}")
+    for rows in ROW_COUNTS:
+        df = generate_team_analysis_frame(rows, team_size=5, num_questions=100)
+        processor = QuizProcessor(Path('synthetic.xlsx'), 'Team Analysis', 10.0, 5.0, data=df)
+
+        legacy = time_call(lambda: legacy_process_data(processor))
+        engine = time_call(lambda: score_from_scratch(processor))
+        snapshot = time_call(processor.score)
+        records = time_call(processor.process_data)
+        print(f"{rows:>8} {legacy:>12.3f} {engine:>12.4f} {snapshot:>13.4f} {records:>12.3f} "
+              f"{legacy / engine:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
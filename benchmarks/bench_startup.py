@@ -0,0 +1,131 @@
+"""Measure CLI startup and per-module import times and check them against budgets.
+
+Import times are the cumulative times reported by ``python -X importtime``
+for a fresh interpreter importing only that module.
+
+Run from the project root:
+    python -m benchmarks.bench_startup
+"""
+from __future__ import annotations
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CLI_HELP_BUDGET_SECONDS = 0.5
+RUNS = 5
+
+# Cumulative import-time budgets in milliseconds. The last three modules do
+# numeric or spreadsheet work at module level and necessarily load
+# numpy/pandas or openpyxl; everything else must stay free of them.
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    'ui': 30,
+    'ui.score_change': 30,
+    'ui.input_validator': 30,
+    'ui.file_handler': 30,
+    'ui.menu_handler': 30,
+    'ui.quiz_input_handler': 30,
+    'ui.score_editor': 30,
+    'cli': 30,
+    'sidecar_cache': 30,
+    'sheet_reader': 30,
+    'score_journal': 30,
+    'bulk_edits': 30,
+    'delta_processor': 30,
+    'streaming_processor': 30,
+    'quiz_processor': 50,
+    'batch_processor': 80,
+    'workbook_processor': 50,
+    'scoring_engine': 1500,
+    'team_store': 1500,
+    'report_writer': 1500,
+    'report_formats': 1500,
+}
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'streamlit')
+LIGHT_MODULES = [name for name, budget in IMPORT_BUDGETS_MS.items() if budget < 1000]
+
+
+def best_wall_time(command: List[str], runs: int = RUNS) -> float:
+    """Return the fastest wall time of several runs of a command."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def streamlit_imported_by_cli() -> bool:
+    """Check whether building the CLI parser pulls in Streamlit."""
+    probe = "import sys, cli; cli.build_parser(); print('streamlit' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout.strip()
+    return output == 'True'
+
+
+def parse_importtime(stderr: str, module: str) -> Optional[float]:
+    """Get a module's cumulative import time in milliseconds from -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    return None
+
+
+def import_time_ms(module: str, runs: int = 3) -> float:
+    """Return the best cumulative import time of a module over several fresh interpreters."""
+    times = []
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=PROJECT_ROOT, check=True, capture_output=True, text=True).stderr
+        elapsed = parse_importtime(stderr, module)
+        if elapsed is None:
+            raise RuntimeError(f"No importtime entry for {module}")
+        times.append(elapsed)
+    return min(times)
+
+
+def heavy_modules_loaded(module: str) -> List[str]:
+    """List the heavyweight dependencies loaded by importing a module."""
+    probe = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return output.split()
+
+
+def main() -> int:
+    """Print startup timings; returns non-zero when a budget is exceeded."""
+    interpreter = best_wall_time([sys.executable, '-c', 'pass'])
+    cli_help = best_wall_time([sys.executable, '-m', 'cli', '--help'])
+    print(f"interpreter startup:  {interpreter:.3f}s")
+    print(f"python -m cli --help: {cli_help:.3f}s (budget {CLI_HELP_BUDGET_SECONDS:.1f}s)")
+
+    failures = []
+    if cli_help > CLI_HELP_BUDGET_SECONDS:
+        failures.append("CLI startup exceeds its budget")
+    if streamlit_imported_by_cli():
+        failures.append("the CLI imports Streamlit")
+
+    print(f"\n{'module':<24} {'import (ms)':>12} {'budget (ms)':>12}")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed = import_time_ms(module)
+        print(f"{module:<24} {elapsed:>12.1f} {budget:>12.0f}")
+        if elapsed > budget:
+            failures.append(f"importing {module} takes {elapsed:.1f}ms (budget {budget:.0f}ms)")
+    for module in LIGHT_MODULES:
+        loaded = heavy_modules_loaded(module)
+        if loaded:
+            failures.append(f"importing {module} loads {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
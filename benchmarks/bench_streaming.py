@@ -0,0 +1,67 @@
+"""Compare in-memory and streaming processing of CSV quiz tables.
+
+The in-memory path loads the whole table into QuizProcessor and writes the
+report; the streaming path reads the table in chunks with
+StreamingQuizProcessor, once sorted by team and once shuffled, which adds
+the spill-to-disk partition step. Time comes from an untraced run and peak
+memory from a second, traced run (pyarrow's allocator is not traced).
+
+Run from the project root:
+    python -m benchmarks.bench_streaming
+"""
+from __future__ import annotations
+import tempfile
+from pathlib import Path
+from typing import List, Tuple
+from quiz_processor import QuizProcessor
+from streaming_processor import StreamingQuizProcessor
+from benchmarks.bench_export import measure
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+COHORTS = [50_000, 200_000]
+NUM_QUESTIONS = 30
+CHUNK_ROWS = 20_000
+PARTITION_ROWS = 20_000
+
+
+def process_in_memory(input_file: Path, output_file: Path) -> None:
+    """Load the whole table and write the report."""
+    processor = QuizProcessor(input_file, 'Team Analysis', 10.0, 5.0, use_sidecar=False)
+    processor.save_report(processor.score(), output_file)
+
+
+def process_streaming(input_file: Path, output_file: Path) -> None:
+    """Stream the table in chunks and write the report."""
+    StreamingQuizProcessor(input_file, 10.0, 5.0, chunk_rows=CHUNK_ROWS,
+                           partition_rows=PARTITION_ROWS).write(output_file)
+
+
+def measure_cohort(num_students: int, tmp: Path) -> List[Tuple[str, float, float]]:
+    """Time each path for one cohort; returns (path, seconds, peak MiB) rows."""
+    df = generate_team_analysis_frame(num_students, num_questions=NUM_QUESTIONS)
+    sorted_file, shuffled_file = tmp / f"sorted_{num_students}.csv", tmp / f"shuffled_{num_students}.csv"
+    df.to_csv(sorted_file, index=False)
+    df.sample(frac=1, random_state=0).to_csv(shuffled_file, index=False)
+    del df
+    output_file = tmp / 'report.jsonl'
+    return [
+        ('in-memory', *measure(lambda: process_in_memory(sorted_file, output_file))),
+        ('streaming, sorted', *measure(lambda: process_streaming(sorted_file, output_file))),
+        ('streaming, shuffled', *measure(lambda: process_streaming(shuffled_file, output_file))),
+    ]
+
+
+def main() -> None:
+    """Print time and peak memory per path for each cohort size."""
+    print(f"chunks of {CHUNK_ROWS} rows, partitions of {PARTITION_ROWS} rows, {NUM_QUESTIONS} questions")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_students in COHORTS:
+            print(f"{num_students} students")
+            print(f"  {'path':<20} {'time (s)':>9} {'peak (MiB)':>11}")
+            for name, seconds, peak in measure_cohort(num_students, Path(tmp)):
+                print(f"  {name:<20} {seconds:>9.2f} {peak:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Load test for the web app's shared session pool.
+
+Simulates N concurrent sessions that each upload their own workbook and
+then edit scores. It drives the same SessionProcessorPool the Streamlit
+app uses, under a memory budget small enough to force eviction. It reports
+request latencies and eviction counts, and checks that every session's
+edits survive snapshot and rehydration.
+
+Run from the project root:
+    python -m benchmarks.load_sessions --sessions 16 --budget-mb 20
+"""
+from __future__ import annotations
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from quiz_processor import QuizProcessor
+from sheet_reader import read_quiz_sheet
+from web.session_store import SessionProcessorPool
+from benchmarks.synthetic import generate_team_analysis_frame
+
+
+SHEET_NAME = 'Team Analysis'
+
+
+def workbook_bytes(num_students: int, num_questions: int, seed: int) -> bytes:
+    """Build an uploaded workbook's content in memory."""
+    buffer = io.BytesIO()
+    generate_team_analysis_frame(num_students, num_questions=num_questions, seed=seed).to_excel(
+        buffer, sheet_name=SHEET_NAME, index=False)
+    return buffer.getvalue()
+
+
+def run_session(pool: SessionProcessorPool, session_id: str, upload: bytes, edits: int,
+                seed: int, latencies: List[float], lock: threading.Lock) -> Optional[str]:
+    """Upload, then edit one score per request; returns an error message on mismatch.
+
+    Each request pins the session for its duration, as the app's script run does.
+    """
+    rng = random.Random(seed)
+    input_path = pool.scratch_dir(session_id, 'inputdata') / 'quiz.xlsx'
+    input_path.write_bytes(upload)
+    with pool.pinned(session_id):
+        processor = QuizProcessor(input_path, SHEET_NAME, 10.0, 5.0,
+                                  data=read_quiz_sheet(io.BytesIO(upload), SHEET_NAME))
+        pool.put(session_id, processor)
+        teams, questions = processor.teams, processor.question_numbers
+    expected: Dict[Tuple[str, int], float] = {}
+    del processor
+
+    for _ in range(edits):
+        team, q_num, score = rng.choice(teams), rng.choice(questions), float(rng.randint(0, 5))
+        start = time.perf_counter()
+        with pool.pinned(session_id):
+            pool.get(session_id).set_team_score(team, q_num, score)
+        elapsed = time.perf_counter() - start
+        expected[(team, q_num)] = score
+        with lock:
+            latencies.append(elapsed)
+        time.sleep(rng.uniform(0, 0.01))
+
+    processor = pool.get(session_id)
+    for (team, q_num), score in expected.items():
+        if processor.get_team_score(team, q_num) != score:
+            return f"{session_id}: {team} Q{q_num} is {processor.get_team_score(team, q_num)}, expected {score}"
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the simulated sessions and print latency and pool statistics."""
+    parser = argparse.ArgumentParser(description="Simulate concurrent web sessions against the session pool.")
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--students', type=int, default=2_000)
+    parser.add_argument('--questions', type=int, default=50)
+    parser.add_argument('--edits', type=int, default=50, help="Score edits per session")
+    parser.add_argument('--budget-mb', type=float, default=20.0, help="Pool memory budget in MiB")
+    args = parser.parse_args(argv)
+
+    uploads = [workbook_bytes(args.students, args.questions, seed) for seed in range(args.sessions)]
+    latencies: List[float] = []
+    lock = threading.Lock()
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = SessionProcessorPool(args.budget_mb, Path(tmp))
+        peak = 0
+        done = threading.Event()
+
+        def sample_resident() -> None:
+            nonlocal peak
+            while not done.is_set():
+                peak = max(peak, pool.resident_bytes)
+                time.sleep(0.005)
+
+        sampler = threading.Thread(target=sample_resident)
+        sampler.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            errors = list(executor.map(
+                lambda i: run_session(pool, f"session{i:03d}", uploads[i], args.edits, i, latencies, lock),
+                range(args.sessions)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        sampler.join()
+        stats = pool.stats()
+
+    latencies.sort()
+    print(f"{args.sessions} sessions x {args.edits} edits, {args.students} students, "
+          f"{args.questions} questions, budget {args.budget_mb:.0f} MiB")
+    print(f"  wall time          {elapsed:.2f}s")
+    print(f"  edit latency p50   {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"  edit latency p95   {latencies[int(len(latencies) * 0.95)] * 1000:.2f} ms")
+    print(f"  edit latency max   {latencies[-1] * 1000:.2f} ms")
+    print(f"  peak resident      {peak / 2**20:.1f} MiB")
+    print(f"  evictions          {stats['evictions']}")
+    print(f"  rehydrations       {stats['rehydrations']}")
+    failures = [error for error in errors if error]
+    for failure in failures:
+        print(f"  MISMATCH {failure}")
+    print("  all edits preserved" if not failures else f"  {len(failures)} sessions lost edits")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
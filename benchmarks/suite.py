@@ -0,0 +1,244 @@
+"""End-to-end benchmark suite for loading, processing, editing and exporting quizzes.
+
+Each scenario generates a deterministic 'Team Analysis' workbook and times
+every stage separately, recording wall time and tracemalloc peak memory.
+Results can be written as JSON and compared against a previous run.
+
+Run from the project root:
+    python -m benchmarks.suite --scenario small --output bench.json
+    python -m benchmarks.suite --scenario small --baseline bench.json --threshold 0.25
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SHEET_NAME = 'Team Analysis'
+TOTAL_POINTS = 10.0
+RAW_SCORE_PER_QUESTION = 5.0
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this are too noisy to flag as regressions.
+MIN_COMPARABLE_SECONDS = 0.01
+
+
+@dataclass
+class Scenario:
+    """Size parameters of a synthetic benchmark workbook."""
+    name: str
+    students: int
+    team_size: int
+    questions: int
+    edit_fraction: float
+
+
+SCENARIOS = {
+    'small': Scenario('small', 1_000, 5, 20, 0.02),
+    'medium': Scenario('medium', 10_000, 5, 50, 0.01),
+    'large': Scenario('large', 50_000, 5, 100, 0.002),
+}
+
+
+def measure(func: Callable[[], Any], track_memory: bool = True) -> Tuple[Any, Dict[str, float]]:
+    """Run a stage once for wall time and, optionally, once more for peak memory."""
+    start = time.perf_counter()
+    result = func()
+    stats = {'seconds': time.perf_counter() - start}
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return result, stats
+
+
+@contextlib.contextmanager
+def bare_mode_logging_disabled():
+    """Silence the warnings Streamlit logs on every call outside a running app."""
+    logging.disable(logging.WARNING)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def run_scenario(scenario: Scenario, workdir: Path, track_memory: bool = True) -> Dict[str, Dict[str, float]]:
+    """Time every pipeline stage for one scenario."""
+    from benchmarks.synthetic import generate_score_edits, write_team_analysis_workbook
+    from quiz_processor import QuizProcessor
+    from sidecar_cache import SidecarCache
+    from ui.score_change import ScoreChange
+    from ui.score_editor import ScoreEditor
+    with bare_mode_logging_disabled():
+        from web import streamlit_app
+        import streamlit as st
+
+    workbook = write_team_analysis_workbook(
+        workdir / f"{scenario.name}.xlsx", scenario.students, scenario.team_size,
+        scenario.questions, RAW_SCORE_PER_QUESTION)
+    stages: Dict[str, Dict[str, float]] = {}
+
+    def load(use_sidecar: bool) -> QuizProcessor:
+        return QuizProcessor(workbook, SHEET_NAME, TOTAL_POINTS, RAW_SCORE_PER_QUESTION, use_sidecar=use_sidecar)
+
+    processor, stages['load_excel'] = measure(lambda: load(False), track_memory)
+    if SidecarCache.is_available():
+        load(True)
+        _, stages['load_sidecar'] = measure(lambda: load(True), track_memory)
+
+    edits = generate_score_edits(processor.teams, processor.question_numbers, scenario.edit_fraction,
+                                 RAW_SCORE_PER_QUESTION)
+    changes = [ScoreChange(team, q_num, processor.get_team_score(team, q_num), score)
+               for team, q_num, score in edits]
+
+    def edit_cli() -> None:
+        editor = ScoreEditor(processor)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for change in changes:
+                editor.update_team_score(change)
+
+    def edit_web() -> None:
+        # Mirror each edited score so repeated runs always change the value.
+        with bare_mode_logging_disabled():
+            st.session_state.score_changes = []
+            st.session_state.journal = None
+            for team, q_num, _ in edits:
+                new_score = RAW_SCORE_PER_QUESTION - processor.get_team_score(team, q_num)
+                streamlit_app.handle_score_update(processor, team, q_num, new_score)
+
+    _, stages['edit_cli'] = measure(edit_cli, track_memory)
+    _, stages['edit_web'] = measure(edit_web, track_memory)
+    processor.record_score_changes(changes)
+
+    result, stages['process'] = measure(processor.score, track_memory)
+    _, stages['output_frame'] = measure(lambda: processor._create_output_dataframe(result), track_memory)
+    _, stages['save_streaming'] = measure(
+        lambda: processor.save_to_excel(result, workdir / 'out_streaming.xlsx'), track_memory)
+    _, stages['save_openpyxl'] = measure(
+        lambda: processor.save_to_excel(result, workdir / 'out_openpyxl.xlsx', engine='openpyxl'),
+        track_memory)
+
+    stages['edit_cli']['edits'] = stages['edit_web']['edits'] = len(edits)
+    return stages
+
+
+def environment_info() -> Dict[str, str]:
+    """Describe the code and interpreter the results were produced with."""
+    import numpy
+    import openpyxl
+    import pandas
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown'
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'openpyxl': openpyxl.__version__,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """List stages whose time or peak memory grew by more than the threshold."""
+    regressions = []
+    baseline_runs = {run['scenario']['name']: run for run in baseline['runs']}
+    for run in current['runs']:
+        name = run['scenario']['name']
+        if name not in baseline_runs:
+            continue
+        for stage, stats in run['stages'].items():
+            before = baseline_runs[name]['stages'].get(stage)
+            if before is None:
+                continue
+            for metric in ('seconds', 'peak_mb'):
+                if metric not in stats or metric not in before:
+                    continue
+                if metric == 'seconds' and before[metric] < MIN_COMPARABLE_SECONDS:
+                    continue
+                if stats[metric] > before[metric] * (1 + threshold):
+                    regressions.append(f"{name}/{stage} {metric}: {before[metric]:.4g} -> {stats[metric]:.4g} "
+                                       f"(+{stats[metric] / before[metric] - 1:.0%})")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    """Print a table of stage timings and peak memory per scenario."""
+    for run in report['runs']:
+        scenario = run['scenario']
+        print(f"\n{scenario['name']}: {scenario['students']} students, team size {scenario['team_size']}, "
+              f"{scenario['questions']} questions, {scenario['edit_fraction']:.1%} edits")
+        print(f"  {'stage':<16} {'seconds':>10} {'peak MB':>10}")
+        for stage, stats in run['stages'].items():
+            peak = f"{stats['peak_mb']:>10.1f}" if 'peak_mb' in stats else f"{'-':>10}"
+            print(f"  {stage:<16} {stats['seconds']:>10.4f} {peak}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser for the suite."""
+    parser = argparse.ArgumentParser(description="Run the quiz processing benchmark suite.")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run; repeat for several (default: small and medium)")
+    parser.add_argument('--students', type=int, help="Run a custom scenario with this many students")
+    parser.add_argument('--team-size', type=int, default=5)
+    parser.add_argument('--questions', type=int, default=50)
+    parser.add_argument('--edit-fraction', type=float, default=0.01)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', type=Path, help="Write results as JSON to this file")
+    parser.add_argument('--baseline', type=Path, help="Compare against a previous JSON result")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative growth before a stage counts as a regression (default: 0.25)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; returns non-zero when a regression against the baseline is found."""
+    args = build_parser().parse_args(argv)
+    if args.students:
+        scenarios = [Scenario('custom', args.students, args.team_size, args.questions, args.edit_fraction)]
+    else:
+        scenarios = [SCENARIOS[name] for name in (args.scenario or ['small', 'medium'])]
+
+    report = {'environment': environment_info(), 'runs': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in scenarios:
+            stages = run_scenario(scenario, Path(tmp), track_memory=not args.no_memory)
+            report['runs'].append({'scenario': asdict(scenario), 'stages': stages})
+    print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\nRegressions above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
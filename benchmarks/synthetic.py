@@ -0,0 +1,58 @@
+"""Deterministic synthetic 'Team Analysis' data for benchmarks."""
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+
+
+def generate_team_analysis_frame(num_students: int, team_size: int = 5, num_questions: int = 100,
+                                 raw_score_per_question: float = 5.0, seed: int = 0,
+                                 extra_columns: int = 0) -> pd.DataFrame:
+    """Generate a 'Team Analysis' frame where every team member shares the team's scores.
+
+    ``extra_columns`` appends unused answer-text columns, like those in LMS exports.
+    """
+    rng = np.random.default_rng(seed)
+    num_teams = max(1, -(-num_students // team_size))
+    team_scores = rng.integers(0, int(raw_score_per_question) + 1,
+                               size=(num_teams, num_questions)).astype(np.float64)
+    team_of_student = np.arange(num_students) // team_size
+
+    frame = pd.DataFrame({
+        'Team': [f"Team {t:05d}" for t in team_of_student],
+        'Student Name': [f"Student {s}" for s in range(num_students)],
+        'Student ID': np.arange(100000, 100000 + num_students),
+        'Email Address': [f"student{s}@example.edu" for s in range(num_students)],
+    })
+    scores = pd.DataFrame(team_scores[team_of_student],
+                          columns=[f"{q}_Score" for q in range(1, num_questions + 1)])
+    answers = pd.DataFrame({
+        f"{c}_Answer": [f"answer {s % 7} for item {c}" for s in range(num_students)]
+        for c in range(1, extra_columns + 1)
+    }, index=frame.index)
+    return pd.concat([frame, scores, answers], axis=1)
+
+
+def write_team_analysis_workbook(path: Path, num_students: int, team_size: int = 5, num_questions: int = 100,
+                                 raw_score_per_question: float = 5.0, seed: int = 0,
+                                 sheet_name: str = 'Team Analysis', extra_columns: int = 0) -> Path:
+    """Write a synthetic 'Team Analysis' workbook and return its path."""
+    frame = generate_team_analysis_frame(num_students, team_size, num_questions, raw_score_per_question, seed,
+                                         extra_columns)
+    frame.to_excel(path, sheet_name=sheet_name, index=False)
+    return path
+
+
+def generate_score_edits(teams: List[str], question_numbers: List[int], fraction: float,
+                         raw_score_per_question: float = 5.0, seed: int = 0) -> List[Tuple[str, int, float]]:
+    """Pick a deterministic fraction of (team, question) cells and give each a new score."""
+    rng = np.random.default_rng(seed)
+    num_cells = len(teams) * len(question_numbers)
+    num_edits = min(num_cells, int(round(num_cells * fraction)))
+    cells = rng.choice(num_cells, size=num_edits, replace=False)
+    scores = rng.integers(0, int(raw_score_per_question) + 1, size=num_edits)
+    return [
+        (teams[cell // len(question_numbers)], question_numbers[cell % len(question_numbers)], float(score))
+        for cell, score in zip(cells.tolist(), scores.tolist())
+    ]
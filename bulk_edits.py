@@ -0,0 +1,247 @@
+"""Bulk score edits from a file of (team, question, new score) rows, rules or an edited score grid.
+
+All rows are validated together, against the processor's teams, questions
+and ``raw_score_per_question``, before anything is changed. Accepted rows
+are applied to the score matrix in one assignment. The result lists the
+matching :class:`ScoreChange` records for highlighting and a diff frame.
+pandas and numpy are imported on first use.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, List, Optional, Union
+from ui.score_change import ScoreChange
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from quiz_processor import QuizProcessor
+
+
+EDIT_COLUMNS = ['Team', 'Question', 'New Score']
+CHANGES_SHEET = 'Score Changes'
+RULE_ACTIONS = ('full', 'set', 'add')
+# Problems listed in an error message before the rest are summarized.
+MAX_REPORTED_PROBLEMS = 10
+
+
+class BulkEditError(ValueError):
+    """Raised when bulk edit rows fail validation; ``problems`` lists every failure."""
+
+    def __init__(self, problems: List[str]):
+        """Build a message from the first problems."""
+        self.problems = problems
+        shown = problems[:MAX_REPORTED_PROBLEMS]
+        more = len(problems) - len(shown)
+        super().__init__('\n'.join(shown + ([f"... and {more} more"] if more else [])))
+
+
+def read_edit_file(source: Union[Path, IO[bytes]], file_name: Optional[str] = None) -> pd.DataFrame:
+    """Read edit rows from a CSV or Excel file.
+
+    Excel files saved by the web app are read from their 'Score Changes'
+    sheet; other workbooks from their first sheet. Question values may be
+    written as ``7`` or ``Q7``.
+    """
+    import pandas as pd
+
+    name = file_name or str(source)
+    if name.lower().endswith('.csv'):
+        edits = pd.read_csv(source)
+    else:
+        sheets = pd.read_excel(source, sheet_name=None)
+        edits = sheets.get(CHANGES_SHEET, next(iter(sheets.values())))
+
+    missing = set(EDIT_COLUMNS) - set(edits.columns)
+    if missing:
+        raise BulkEditError([f"Edit file is missing columns: {', '.join(sorted(missing))}"])
+    return edits[EDIT_COLUMNS]
+
+
+@dataclass
+class ScoreRule:
+    """A score edit applied to every team, or to the listed teams, on some questions.
+
+    ``full`` gives full marks, ``set`` sets ``value`` and ``add`` adds
+    ``value`` points, clipped to the valid score range. ``add`` skips
+    missing scores rather than treating them as 0, so a blank cell stays
+    blank and does not block the rest of the rule.
+    """
+    action: str
+    questions: List[int]
+    value: float = 0.0
+    teams: Optional[List[Any]] = None
+
+    @classmethod
+    def parse(cls, text: str) -> ScoreRule:
+        """Parse ``full:Q7``, ``set:Q3,Q4:2.5`` or ``add:5:-1`` (action:questions[:value])."""
+        parts = text.split(':')
+        if len(parts) not in (2, 3) or parts[0] not in RULE_ACTIONS:
+            raise BulkEditError([f"Invalid rule '{text}'; expected full:Q7, set:Q3:2.5 or add:Q4:1"])
+        try:
+            questions = [int(q.strip().lstrip('Qq')) for q in parts[1].split(',')]
+            value = float(parts[2]) if len(parts) == 3 else 0.0
+        except ValueError:
+            raise BulkEditError([f"Invalid rule '{text}'; questions and value must be numbers"]) from None
+        if parts[0] != 'full' and len(parts) != 3:
+            raise BulkEditError([f"Rule '{text}' needs a value"])
+        return cls(parts[0], questions, value)
+
+    def to_frame(self, processor: QuizProcessor) -> pd.DataFrame:
+        """Expand the rule into edit rows for every selected team and question."""
+        import numpy as np
+        import pandas as pd
+
+        teams = processor.teams if self.teams is None else list(self.teams)
+        unknown = [q for q in self.questions if q not in processor.question_numbers]
+        if unknown:
+            raise BulkEditError([f"Unknown question {q}" for q in unknown])
+        team_pos, question_pos = processor.store.positions(
+            np.repeat(np.asarray(teams, dtype=object), len(self.questions)),
+            np.tile(self.questions, len(teams)))
+        max_score = processor.raw_score_per_question
+        if self.action == 'set' and not 0 <= self.value <= max_score:
+            raise BulkEditError([f"Rule score {self.value} is outside 0-{max_score}"])
+        if self.action == 'full':
+            new_scores = np.full(len(team_pos), max_score)
+        elif self.action == 'set':
+            new_scores = np.full(len(team_pos), self.value)
+        else:
+            new_scores = np.clip(processor.store.scores[team_pos, question_pos] + self.value, 0, max_score)
+            scored = ~np.isnan(new_scores)
+            team_pos, question_pos, new_scores = team_pos[scored], question_pos[scored], new_scores[scored]
+        return pd.DataFrame({
+            'Team': np.asarray(processor.teams, dtype=object)[team_pos],
+            'Question': np.asarray(processor.question_numbers)[question_pos],
+            'New Score': new_scores
+        })
+
+
+@dataclass
+class BulkEdit:
+    """Validated score edits, holding only rows that change a score."""
+    team_names: np.ndarray
+    question_numbers: np.ndarray
+    old_scores: np.ndarray
+    new_scores: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of scores the edit changes."""
+        return len(self.new_scores)
+
+    def changes(self) -> List[ScoreChange]:
+        """Get the edit as ScoreChange records."""
+        return [ScoreChange(team, q_num, old, new) for team, q_num, old, new in zip(
+            self.team_names.tolist(), self.question_numbers.tolist(),
+            self.old_scores.tolist(), self.new_scores.tolist())]
+
+    def diff_frame(self) -> pd.DataFrame:
+        """Get one row per changed score with old and new values."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            'Team': self.team_names,
+            'Question': [f"Q{q}" for q in self.question_numbers.tolist()],
+            'Old Score': self.old_scores,
+            'New Score': self.new_scores,
+            'Difference': self.new_scores - self.old_scores
+        })
+
+
+def plan_bulk_edit(processor: QuizProcessor, edits: pd.DataFrame) -> BulkEdit:
+    """Validate edit rows against a processor and compute their old scores.
+
+    Raises :class:`BulkEditError` listing every invalid row (numbered as
+    file lines, with the header on line 1). When a score appears more than
+    once the last row wins. Rows that would not change a score are dropped.
+    """
+    import numpy as np
+    import pandas as pd
+
+    store = processor.store
+    lines = np.arange(len(edits)) + 2
+    questions = pd.to_numeric(edits['Question'].astype(str).str.strip().str.lstrip('Qq'), errors='coerce')
+    new_scores = pd.to_numeric(edits['New Score'], errors='coerce').to_numpy(dtype=np.float64)
+    team_pos = pd.Index(store.teams).get_indexer(pd.Index(edits['Team'], dtype=object))
+    # Fractional question numbers such as 'Q3.9' are invalid, not truncated to Q3.
+    questions = questions.where(questions == questions.round(), -1)
+    question_pos = pd.Index(store.question_numbers).get_indexer(questions.fillna(-1).astype(np.int64))
+
+    max_score = processor.raw_score_per_question
+    problems = []
+    for line, team in zip(lines[team_pos < 0], edits['Team'].to_numpy()[team_pos < 0]):
+        problems.append((line, f"Row {line}: unknown team '{team}'"))
+    for line, q_num in zip(lines[question_pos < 0], edits['Question'].to_numpy()[question_pos < 0]):
+        problems.append((line, f"Row {line}: unknown question {q_num}"))
+    out_of_range = ~((new_scores >= 0) & (new_scores <= max_score))
+    for line, score in zip(lines[out_of_range], edits['New Score'].to_numpy()[out_of_range]):
+        problems.append((line, f"Row {line}: score {score} is outside 0-{max_score}"))
+    if problems:
+        raise BulkEditError([message for _, message in sorted(problems, key=lambda p: p[0])])
+
+    cells = team_pos * len(store.question_numbers) + question_pos
+    _, last_from_end = np.unique(cells[::-1], return_index=True)
+    keep = np.sort(len(cells) - 1 - last_from_end)
+    team_pos, question_pos, new_scores = team_pos[keep], question_pos[keep], new_scores[keep]
+    old_scores = store.scores[team_pos, question_pos]
+    changed = old_scores != new_scores
+    return BulkEdit(
+        team_names=np.asarray(store.teams, dtype=object)[team_pos[changed]],
+        question_numbers=np.asarray(store.question_numbers)[question_pos[changed]],
+        old_scores=old_scores[changed],
+        new_scores=new_scores[changed]
+    )
+
+
+def grid_column(question_number: int) -> str:
+    """Get the score grid column of a question."""
+    return f"Q{question_number}"
+
+
+def score_grid(processor: QuizProcessor, team_names: List[Any]) -> pd.DataFrame:
+    """Get the current raw scores of some teams as a Team column plus one column per question."""
+    import pandas as pd
+
+    store = processor.store
+    team_pos = [store.team_positions[team] for team in team_names]
+    grid = pd.DataFrame(store.scores[team_pos], columns=[grid_column(q) for q in store.question_numbers])
+    grid.insert(0, 'Team', team_names)
+    return grid
+
+
+def grid_edits(processor: QuizProcessor, grid: pd.DataFrame) -> pd.DataFrame:
+    """Get edit rows for the cells of an edited score grid that differ from the current scores.
+
+    Raises :class:`BulkEditError` naming every changed cell that is empty
+    or outside the valid score range.
+    """
+    import numpy as np
+    import pandas as pd
+
+    question_numbers = [q for q in processor.question_numbers if grid_column(q) in grid.columns]
+    columns = [grid_column(q) for q in question_numbers]
+    new_scores = grid[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    old_scores = score_grid(processor, grid['Team'].tolist())[columns].to_numpy()
+    changed = ~((new_scores == old_scores) | (np.isnan(new_scores) & np.isnan(old_scores)))
+    rows, cols = np.nonzero(changed)
+    edits = pd.DataFrame({
+        'Team': grid['Team'].to_numpy()[rows],
+        'Question': np.asarray(question_numbers, dtype=np.int64)[cols],
+        'New Score': new_scores[rows, cols]
+    })
+
+    max_score = processor.raw_score_per_question
+    invalid = ~((edits['New Score'] >= 0) & (edits['New Score'] <= max_score))
+    if invalid.any():
+        raise BulkEditError([f"{team}, Q{q_num}: " + ("score is empty" if np.isnan(score)
+                                                        else f"score {score} is outside 0-{max_score}")
+                             for team, q_num, score in edits[invalid].itertuples(index=False)])
+    return edits
+
+
+def apply_bulk_edit(processor: QuizProcessor, edit: BulkEdit) -> List[ScoreChange]:
+    """Apply a planned edit in one vectorized update and return its changes."""
+    if len(edit):
+        processor.set_team_scores(edit.team_names, edit.question_numbers, edit.new_scores)
+    return edit.changes()
+
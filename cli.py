@@ -0,0 +1,288 @@
+"""Headless command line interface for quiz processing.
+
+Usage:
+    python -m cli process IN.xlsx --total-points 10 --raw-per-question 5 -o OUT.xlsx
+    python -m cli process IN.csv --total-points 10 --raw-per-question 5 --stream -o OUT.csv
+    python -m cli delta NEW.xlsx --previous OLD.xlsx --total-points 10 --raw-per-question 5 --journal J.jsonl
+    python -m cli workbook IN.xlsx --total-points 10 --raw-per-question 5 -o OUT.xlsx
+    python -m cli batch inputdata --total-points 10 --raw-per-question 5
+    python -m cli web
+
+Heavy dependencies are imported inside the command handlers, so parsing
+arguments and ``--help`` never load pandas, openpyxl or Streamlit.
+"""
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+DEFAULT_SHEET = 'Team Analysis'
+
+
+def apply_edit_sources(processor, changes_file: Optional[Path], rules: Optional[List[str]]) -> list:
+    """Apply a changes file and rules to a processor as one validated bulk edit.
+
+    Rules are applied after the file rows, so they win where both edit a score.
+    """
+    import pandas as pd
+    from bulk_edits import ScoreRule, apply_bulk_edit, plan_bulk_edit, read_edit_file
+
+    frames = [read_edit_file(changes_file)] if changes_file else []
+    frames += [ScoreRule.parse(rule).to_frame(processor) for rule in rules or []]
+    return apply_bulk_edit(processor, plan_bulk_edit(processor, pd.concat(frames, ignore_index=True)))
+
+
+def default_output_file(input_file: Path, fmt: Optional[str]) -> Path:
+    """Get the default report path in the output folder for an input file."""
+    from ui.file_handler import FileHandler
+    return FileHandler.get_output_file(input_file.stem).with_suffix(f".{fmt or 'xlsx'}")
+
+
+def run_stream(args: argparse.Namespace) -> int:
+    """Process a CSV or Parquet quiz table in chunks and stream the report."""
+    from streaming_processor import StreamingQuizProcessor
+
+    if args.changes or args.rule or args.journal:
+        raise ValueError("--changes, --rule and --journal cannot be combined with --stream")
+    start = time.perf_counter()
+    processor = StreamingQuizProcessor(args.input_file, args.total_points, args.raw_per_question,
+                                       chunk_rows=args.chunk_rows, partition_rows=args.partition_rows)
+    output_file = args.output or default_output_file(args.input_file, args.format)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    summary = processor.write(output_file, fmt=args.format)
+    print(f"{summary.describe()} in {time.perf_counter() - start:.2f}s")
+    print(f"Output saved to {output_file}")
+    return 0
+
+
+def run_process(args: argparse.Namespace) -> int:
+    """Process one quiz sheet and write the report."""
+    from instrumentation import Instrumentation
+    from quiz_processor import QuizProcessor
+
+    if args.stream:
+        return run_stream(args)
+    start = time.perf_counter()
+    instrumentation = Instrumentation() if args.profile else None
+    processor = QuizProcessor(args.input_file, args.sheet, args.total_points, args.raw_per_question,
+                              use_sidecar=not args.no_cache, instrumentation=instrumentation,
+                              reader_engine=args.reader)
+    changes = []
+    if args.journal:
+        from score_journal import ScoreJournal
+        changes = ScoreJournal(args.journal).replay(processor)
+    if args.changes or args.rule:
+        changes += apply_edit_sources(processor, args.changes, args.rule)
+    processor.record_score_changes(changes)
+
+    output_file = args.output or default_output_file(args.input_file, args.format)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    processor.save_report(processor.score(), output_file, fmt=args.format, engine=args.engine)
+
+    print(f"Processed {len(processor.teams)} teams and {len(processor.question_numbers)} questions "
+          f"with {len(changes)} score changes in {time.perf_counter() - start:.2f}s")
+    print(f"Output saved to {output_file}")
+    if instrumentation is not None:
+        print(f"\n{instrumentation.format_report()}")
+    return 0
+
+
+def run_delta(args: argparse.Namespace) -> int:
+    """Reprocess a new export of a quiz, carrying edits forward from the previous export."""
+    from delta_processor import carry_forward, diff_exports
+    from quiz_processor import QuizProcessor
+
+    start = time.perf_counter()
+    previous = QuizProcessor(args.previous, args.sheet, args.total_points, args.raw_per_question,
+                             use_sidecar=not args.no_cache, reader_engine=args.reader)
+    current = QuizProcessor(args.input_file, args.sheet, args.total_points, args.raw_per_question,
+                            use_sidecar=not args.no_cache, reader_engine=args.reader)
+    diff = diff_exports(previous, current)
+
+    prior = []
+    if args.journal:
+        from score_journal import ScoreJournal
+        prior = ScoreJournal(args.journal).replay(previous)
+    if args.changes:
+        prior += apply_edit_sources(previous, args.changes, None)
+    carried = carry_forward(prior, current, on_conflict=args.on_conflict)
+    changes = list(carried.applied)
+    if args.rule:
+        changes += apply_edit_sources(current, None, args.rule)
+    current.record_score_changes(changes)
+
+    output_file = args.output or default_output_file(
+        args.input_file, args.previous_report.suffix.lstrip('.') if args.previous_report else None)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    result = current.score()
+    if args.previous_report and diff.questions_changed:
+        print("Question set changed; writing the full report")
+    if args.previous_report and not diff.questions_changed:
+        from report_formats import patch_report
+
+        rewrite = diff.affected_teams | {c.team_name for c in prior + changes}
+        try:
+            rows = patch_report(args.previous_report, output_file, result, current.changed_scores, rewrite)
+            print(f"Patched {args.previous_report}: regenerated {rows} of {result.num_students} rows")
+        except ValueError as exc:
+            print(f"Cannot patch the previous report ({exc}); writing the full report")
+            current.save_report(result, output_file)
+    else:
+        current.save_report(result, output_file)
+
+    print(f"Export diff: {diff.summary()}")
+    print(f"Score edits: {carried.summary()}")
+    conflicts = carried.conflicts_frame()
+    if len(conflicts):
+        print(conflicts.to_string(index=False))
+        if args.conflicts_file:
+            conflicts.to_csv(args.conflicts_file, index=False)
+            print(f"Conflicts saved to {args.conflicts_file}")
+    print(f"Processed in {time.perf_counter() - start:.2f}s")
+    print(f"Output saved to {output_file}")
+    return 0
+
+
+def run_workbook(args: argparse.Namespace) -> int:
+    """Process several quiz sheets of one workbook into a combined report."""
+    from workbook_processor import WorkbookProcessor
+
+    start = time.perf_counter()
+    processor = WorkbookProcessor(args.input_file, args.total_points, args.raw_per_question,
+                                  sheet_names=args.sheets, sheet_pattern=args.sheet_pattern,
+                                  reader_engine=args.reader, workers=args.threads)
+    output_file = args.output
+    if output_file is None:
+        from ui.file_handler import FileHandler
+        output_file = FileHandler.get_output_file(f"{args.input_file.stem} - combined")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    results = processor.save_combined_report(output_file)
+
+    for name, result in results.items():
+        print(f"{name}: {result.num_teams} teams, {result.num_students} students, "
+              f"{len(result.question_numbers)} questions")
+    print(f"Processed {len(results)} sheets in {time.perf_counter() - start:.2f}s")
+    print(f"Output saved to {output_file}")
+    return 0
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Process every quiz workbook in a directory."""
+    import batch_processor
+    return batch_processor.main(args.batch_args)
+
+
+def run_web(args: argparse.Namespace) -> int:
+    """Start the Streamlit web interface."""
+    import streamlit.web.bootstrap as bootstrap
+
+    web_app = Path(__file__).parent / "web" / "streamlit_app.py"
+    bootstrap.run(str(web_app), False, [], {})
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(prog='quiz', description="Quiz score processing tool.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    process = commands.add_parser('process', help="Process one quiz workbook sheet or CSV/Parquet table")
+    process.add_argument('input_file', type=Path, help="Input Excel workbook, or CSV or Parquet table")
+    process.add_argument('--sheet', default=DEFAULT_SHEET, help="Sheet to process (default: 'Team Analysis')")
+    process.add_argument('--total-points', type=float, required=True, help="Total points for the quiz")
+    process.add_argument('--raw-per-question', type=float, required=True,
+                         help="Raw score possible per question")
+    process.add_argument('-o', '--output', type=Path, default=None,
+                         help="Output workbook (default: outputdata/<input name>.xlsx)")
+    process.add_argument('--changes', type=Path, default=None,
+                         help="CSV or Excel file of score changes with Team, Question and New Score columns")
+    process.add_argument('--journal', type=Path, default=None,
+                         help="Replay a score-change journal (.jsonl) before applying --changes")
+    process.add_argument('--rule', action='append', default=None,
+                         help="Score rule applied to every team, e.g. 'full:Q7', 'set:Q3,Q4:2.5' or "
+                              "'add:Q5:-1' (repeatable)")
+    process.add_argument('--format', choices=('xlsx', 'csv', 'parquet', 'jsonl'), default=None,
+                         help="Output format (default: from the output file suffix, else xlsx)")
+    process.add_argument('--engine', choices=('streaming', 'openpyxl'), default='streaming',
+                         help="Excel output engine (default: streaming)")
+    process.add_argument('--reader', choices=('auto', 'calamine', 'openpyxl'), default='auto',
+                         help="Excel reader engine; auto uses calamine when installed (default: auto)")
+    process.add_argument('--no-cache', action='store_true', help="Do not read or write the sidecar cache")
+    process.add_argument('--stream', action='store_true',
+                         help="Process a CSV or Parquet input in chunks without loading it whole; unsorted "
+                              "input is partitioned by team on disk first")
+    process.add_argument('--chunk-rows', type=int, default=50_000,
+                         help="Input rows read per chunk with --stream (default: 50000)")
+    process.add_argument('--partition-rows', type=int, default=200_000,
+                         help="Rows per on-disk partition for unsorted input with --stream (default: 200000)")
+    process.add_argument('--profile', action='store_true',
+                         help="Print per-stage timings and peak memory after processing")
+    process.set_defaults(handler=run_process)
+
+    delta = commands.add_parser('delta', help="Reprocess a new export of a quiz against the previous export")
+    delta.add_argument('input_file', type=Path, help="New export of the quiz")
+    delta.add_argument('--previous', type=Path, required=True, help="Previous export of the same quiz")
+    delta.add_argument('--sheet', default=DEFAULT_SHEET, help="Sheet to process (default: 'Team Analysis')")
+    delta.add_argument('--total-points', type=float, required=True, help="Total points for the quiz")
+    delta.add_argument('--raw-per-question', type=float, required=True,
+                       help="Raw score possible per question")
+    delta.add_argument('--journal', type=Path, default=None,
+                       help="Score-change journal (.jsonl) recorded against the previous export")
+    delta.add_argument('--changes', type=Path, default=None,
+                       help="Changes file applied to the previous export, after --journal")
+    delta.add_argument('--rule', action='append', default=None,
+                       help="Score rule applied to the new export after carrying edits forward (repeatable)")
+    delta.add_argument('--on-conflict', choices=('keep', 'export'), default='keep',
+                       help="When the new export changed an edited score, keep the edit or the export's "
+                            "score (default: keep)")
+    delta.add_argument('--conflicts-file', type=Path, default=None, help="Write the conflicts to this CSV file")
+    delta.add_argument('--previous-report', type=Path, default=None,
+                       help="CSV, Parquet or JSON Lines report of the previous export to patch instead of "
+                            "writing the whole report")
+    delta.add_argument('-o', '--output', type=Path, default=None,
+                       help="Output report (default: outputdata/<input name> with the previous report's suffix)")
+    delta.add_argument('--reader', choices=('auto', 'calamine', 'openpyxl'), default='auto',
+                       help="Excel reader engine (default: auto)")
+    delta.add_argument('--no-cache', action='store_true', help="Do not read or write the sidecar cache")
+    delta.set_defaults(handler=run_delta)
+
+    workbook = commands.add_parser('workbook', help="Process several quiz sheets of one workbook")
+    workbook.add_argument('input_file', type=Path, help="Input Excel workbook")
+    workbook.add_argument('--sheets', nargs='+', default=None, help="Sheets to process (default: all quiz sheets)")
+    workbook.add_argument('--sheet-pattern', default='*',
+                          help="Glob pattern of sheets to process when --sheets is not given (default: '*')")
+    workbook.add_argument('--total-points', type=float, required=True, help="Total points for each quiz")
+    workbook.add_argument('--raw-per-question', type=float, required=True,
+                          help="Raw score possible per question")
+    workbook.add_argument('-o', '--output', type=Path, default=None,
+                          help="Combined output workbook (default: outputdata/<input name> - combined.xlsx)")
+    workbook.add_argument('--reader', choices=('auto', 'calamine', 'openpyxl'), default='auto',
+                          help="Excel reader engine (default: auto)")
+    workbook.add_argument('--threads', type=int, default=1, help="Threads used to score the sheets (default: 1)")
+    workbook.set_defaults(handler=run_workbook)
+
+    batch = commands.add_parser('batch', add_help=False,
+                                help="Process every workbook in a directory (see 'batch --help')")
+    batch.add_argument('batch_args', nargs=argparse.REMAINDER)
+    batch.set_defaults(handler=run_batch)
+
+    web = commands.add_parser('web', help="Start the web interface")
+    web.set_defaults(handler=run_web)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
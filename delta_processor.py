@@ -0,0 +1,149 @@
+"""Reprocess a new export of a quiz against the previous export.
+
+The LMS re-exports the same quiz as late submissions arrive. Comparing the
+two exports, keyed by Team and Student ID, shows which teams were added,
+removed or changed. Manual score edits made on the previous export are
+carried forward. An edit becomes a conflict when the new export changed
+the score it was based on. Only the affected teams need their report rows
+regenerated; see :func:`report_formats.patch_report`.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Set
+from ui.score_change import ScoreChange
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from quiz_processor import QuizProcessor
+
+
+CONFLICT_POLICIES = ('keep', 'export')
+CONFLICT_COLUMNS = ['Team', 'Question', 'Previous Export', 'Edited To', 'New Export', 'Resolution']
+STUDENT_KEY_COLUMNS = ['Student ID', 'Student Name', 'Email Address']
+
+
+@dataclass
+class ExportDiff:
+    """Teams added, removed and changed between two exports of a quiz."""
+    added_teams: List[str]
+    removed_teams: List[str]
+    changed_teams: List[str]
+    unchanged_teams: int
+    questions_changed: bool = False
+
+    @property
+    def affected_teams(self) -> Set[str]:
+        """Teams whose report rows must be regenerated."""
+        return set(self.added_teams) | set(self.changed_teams)
+
+    def summary(self) -> str:
+        """Describe the diff in one line."""
+        text = (f"{len(self.added_teams)} teams added, {len(self.changed_teams)} changed, "
+                f"{len(self.removed_teams)} removed, {self.unchanged_teams} unchanged")
+        return text + (" (question set changed)" if self.questions_changed else "")
+
+
+def diff_exports(previous: QuizProcessor, current: QuizProcessor) -> ExportDiff:
+    """Compare two exports team by team.
+
+    A team changed when any of its scores differ, or when its students
+    differ by Student ID, name or email. When the question set differs,
+    every team in both exports counts as changed.
+    """
+    import numpy as np
+    import pandas as pd
+
+    previous_teams = pd.Index(previous.store.teams)
+    current_teams = pd.Index(current.store.teams)
+    common = current_teams.intersection(previous_teams)
+    added = current_teams.difference(previous_teams).tolist()
+    removed = previous_teams.difference(current_teams).tolist()
+    questions_changed = previous.question_numbers != current.question_numbers
+    if questions_changed:
+        return ExportDiff(added, removed, common.tolist(), 0, questions_changed=True)
+
+    previous_scores = previous.store.scores[previous_teams.get_indexer(common)]
+    current_scores = current.store.scores[current_teams.get_indexer(common)]
+    same_scores = ((previous_scores == current_scores)
+                   | (np.isnan(previous_scores) & np.isnan(current_scores))).all(axis=1)
+    changed = set(common[~same_scores])
+
+    def members(processor: QuizProcessor) -> pd.DataFrame:
+        store = processor.store
+        frame = store.students[STUDENT_KEY_COLUMNS].astype(str)
+        frame.insert(0, 'Team', store.team_names[store.student_team_index])
+        return frame
+
+    merged = members(previous).merge(members(current), how='outer', indicator=True)
+    moved = merged.loc[merged['_merge'] != 'both', 'Team']
+    changed |= set(moved[moved.isin(common)])
+    changed_teams = [team for team in common if team in changed]
+    return ExportDiff(added, removed, changed_teams, len(common) - len(changed_teams))
+
+
+@dataclass
+class CarryForward:
+    """Outcome of carrying edits forward onto a new export."""
+    applied: List[ScoreChange] = field(default_factory=list)
+    already_in_export: int = 0
+    conflicts: List[List] = field(default_factory=list)
+
+    def conflicts_frame(self) -> pd.DataFrame:
+        """Get one row per conflicting or dropped edit."""
+        import pandas as pd
+
+        return pd.DataFrame(self.conflicts, columns=CONFLICT_COLUMNS)
+
+    def summary(self) -> str:
+        """Describe the outcome in one line."""
+        return (f"{len(self.applied)} edits carried forward, {self.already_in_export} already in the export, "
+                f"{len(self.conflicts)} conflicts")
+
+
+def carry_forward(changes: Iterable[ScoreChange], processor: QuizProcessor,
+                  on_conflict: str = 'keep') -> CarryForward:
+    """Re-apply edits made on a previous export to the processor of a new one.
+
+    Each edit is first collapsed to its net change. An edit is carried when
+    the new export still has the score it replaced. It is skipped when the
+    new export already has the edited score. When the new export has a
+    third value, the edit is a conflict: ``on_conflict='keep'`` applies the
+    manual edit anyway and ``'export'`` keeps the new export's score. Edits
+    of teams or questions that are no longer in the export are reported as
+    conflicts. All carried edits are applied in one bulk update.
+    """
+    from score_journal import ScoreJournal
+
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy '{on_conflict}'. Choose from {CONFLICT_POLICIES}.")
+
+    outcome = CarryForward()
+    for change in ScoreJournal.net_changes(list(changes)):
+        team, q_num = change.team_name, change.question_number
+        if not processor.has_team(team) or q_num not in processor.question_numbers:
+            reason = 'team removed' if not processor.has_team(team) else 'question removed'
+            outcome.conflicts.append([team, f'Q{q_num}', change.old_score, change.new_score, None,
+                                      f'dropped ({reason})'])
+            continue
+        export_score = processor.get_team_score(team, q_num)
+        if _same_score(export_score, change.new_score):
+            outcome.already_in_export += 1
+            continue
+        if not _same_score(export_score, change.old_score):
+            keep = on_conflict == 'keep'
+            outcome.conflicts.append([team, f'Q{q_num}', change.old_score, change.new_score, export_score,
+                                      'kept edit' if keep else 'kept export'])
+            if not keep:
+                continue
+        outcome.applied.append(ScoreChange(team, q_num, export_score, change.new_score))
+
+    if outcome.applied:
+        processor.set_team_scores([c.team_name for c in outcome.applied],
+                                  [c.question_number for c in outcome.applied],
+                                  [c.new_score for c in outcome.applied])
+    return outcome
+
+
+def _same_score(a: float, b: float) -> bool:
+    """Compare two scores, treating two missing scores as equal."""
+    return a == b or (a != a and b != b)
@@ -0,0 +1,160 @@
+"""Opt-in per-stage timing and memory instrumentation for quiz processing."""
+from __future__ import annotations
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    """Measurements of one run of a processing stage."""
+    name: str
+    depth: int
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: Optional[int] = None
+    peak_mb: Optional[float] = None
+
+
+StageHook = Callable[[StageRecord], None]
+
+# tracemalloc has one tracer per process. Runs that track memory register
+# here so only the last one stops tracing and none resets another's peak.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _acquire_tracing() -> None:
+    """Register a run that tracks memory, starting tracing if nothing traces yet."""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    """Unregister a run, stopping tracing when the last run started by this module ends."""
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _reset_peak() -> None:
+    """Reset the traced peak, unless another run is tracking memory at the same time."""
+    with _tracing_lock:
+        if _tracing_users == 1:
+            tracemalloc.reset_peak()
+
+
+class Instrumentation:
+    """Record wall time, CPU time, row counts and tracemalloc peak per stage.
+
+    Stages may nest (``save_to_excel`` contains ``_create_output_dataframe``);
+    each record's peak is the highest traced memory above the level at which
+    that stage started, including the peaks of its nested stages. Traced
+    memory is process-wide: while other runs track memory concurrently the
+    peak is not reset, so a record's peak may include their allocations.
+    """
+
+    def __init__(self, track_memory: bool = True, hooks: Optional[List[StageHook]] = None):
+        """Initialize an empty recorder, optionally with hooks called after each stage."""
+        self.track_memory = track_memory
+        self.hooks: List[StageHook] = list(hooks or [])
+        self.records: List[StageRecord] = []
+        self._depth = 0
+        self._peak_stack: List[int] = []
+
+    def add_hook(self, hook: StageHook) -> None:
+        """Register a callable that receives each finished stage record."""
+        self.hooks.append(hook)
+
+    def clear(self) -> None:
+        """Forget all recorded stages."""
+        self.records = []
+
+    def _start_memory(self) -> int:
+        """Start or continue tracing and return the current traced memory."""
+        if not self._peak_stack:
+            _acquire_tracing()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peak_stack:
+            self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+        _reset_peak()
+        self._peak_stack.append(current)
+        return current
+
+    def _stop_memory(self, start_current: int) -> float:
+        """Return the stage's peak above its starting level in MiB."""
+        peak = max(self._peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+        if self._peak_stack:
+            self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+        else:
+            _release_tracing()
+        return (peak - start_current) / 2**20
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[StageRecord]:
+        """Measure the enclosed block as one stage; the yielded record's rows may be set inside."""
+        record = StageRecord(name=name, depth=self._depth, rows=rows)
+        self.records.append(record)
+        self._depth += 1
+        start_current = self._start_memory() if self.track_memory else 0
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.thread_time() - cpu_start
+            if self.track_memory:
+                record.peak_mb = self._stop_memory(start_current)
+            for hook in self.hooks:
+                hook(record)
+
+    def report(self) -> Dict[str, Any]:
+        """Build a structured report of all recorded stages in start order."""
+        return {
+            'stages': [asdict(record) for record in self.records],
+            'total_wall_seconds': sum(r.wall_seconds for r in self.records if r.depth == 0),
+            'total_cpu_seconds': sum(r.cpu_seconds for r in self.records if r.depth == 0)
+        }
+
+    def format_report(self) -> str:
+        """Format the recorded stages as a text table."""
+        lines = [f"{'stage':<28} {'wall (s)':>9} {'cpu (s)':>9} {'rows':>9} {'peak MB':>9}"]
+        for record in self.records:
+            name = '  ' * record.depth + record.name
+            rows = '-' if record.rows is None else str(record.rows)
+            peak = '-' if record.peak_mb is None else f"{record.peak_mb:.1f}"
+            lines.append(f"{name:<28} {record.wall_seconds:>9.4f} {record.cpu_seconds:>9.4f} "
+                         f"{rows:>9} {peak:>9}")
+        return '\n'.join(lines)
+
+
+def instrumented(stage_name: str) -> Callable:
+    """Decorate a QuizProcessor method so it is recorded when instrumentation is enabled.
+
+    The row count is the number of loaded sheet rows after the call.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = getattr(self, 'instrumentation', None)
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            with instrumentation.stage(stage_name) as record:
+                result = method(self, *args, **kwargs)
+                record.rows = len(self.df) if self.df is not None else None
+            return result
+        return wrapper
+    return decorator
@@ -1,13 +1,16 @@
 """Main entry point for the quiz processing application."""
-import streamlit.web as stw
-from pathlib import Path
+import sys
+from cli import main as cli_main
 
 
-def main():
-    """Main entry point for the application."""
-    web_app = Path(__file__).parent / "web" / "streamlit_app.py"
-    stw.bootstrap.run(web_app, "", [], [])
+def main() -> int:
+    """Main entry point for the application.
+
+    Without arguments the web interface is started; otherwise the arguments
+    are handled by the headless command line interface.
+    """
+    return cli_main(sys.argv[1:] or ['web'])
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
@@ -1,43 +1,166 @@
-"""Module for processing quiz data from Excel files."""
+"""Module for processing quiz data from Excel files.
+
+pandas, numpy and openpyxl are imported on first use, so importing this
+module stays cheap for callers that never load a workbook.
+"""
 from __future__ import annotations
-import pandas as pd
-import re
 from pathlib import Path
-from openpyxl.styles import PatternFill
-from typing import List, Dict, Set, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Sequence, Set, Tuple, Union
+from instrumentation import Instrumentation, instrumented
+from sheet_reader import COLUMN_SELECTION, apply_load_schema, read_quiz_sheet, score_question_number
+from sidecar_cache import SidecarCache
 from ui.score_change import ScoreChange
 
+if TYPE_CHECKING:
+    import pandas as pd
+    from scoring_engine import QuestionStatistics, ScoreAggregates, ScoringResult
+    from team_store import TeamScoreStore
+
 
 class QuizProcessor:
-    """Class for processing quiz data from Excel files."""
+    """Class for processing quiz data from Excel files.
+
+    ``df`` holds the sheet as loaded. Team scores, including edits, live in
+    ``store`` and are read and written through the team score methods.
+    """
     
-    HIGHLIGHT_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    OUTPUT_ENGINES = ('streaming', 'openpyxl')
     
-    def __init__(self, input_file: Path, sheet_name: str, total_points: float, raw_score_per_question: float):
-        """Initialize the quiz processor with quiz parameters."""
+    def __init__(self, input_file: Path, sheet_name: str, total_points: float, raw_score_per_question: float,
+                 data: Optional[pd.DataFrame] = None, use_sidecar: bool = True,
+                 instrumentation: Optional[Instrumentation] = None, reader_engine: str = 'auto',
+                 compact_dtypes: bool = True):
+        """Initialize the quiz processor with quiz parameters.
+
+        When ``data`` is given it is used as the already-parsed sheet instead of
+        reading ``input_file``. Otherwise the sheet is loaded from its columnar
+        sidecar when one is up to date, and a sidecar is written after parsing.
+        Only the team, student and score columns are read; ``reader_engine``
+        selects calamine or openpyxl (see :mod:`sheet_reader`). Pass an ``Instrumentation`` to record per-stage timings and memory.
+        With ``compact_dtypes`` the loaded frame is stored with the typed load
+        schema of :func:`sheet_reader.apply_load_schema`.
+        """
         self.input_file = input_file
         self.sheet_name = sheet_name
         self.total_points = total_points
         self.raw_score_per_question = raw_score_per_question
         self.df = None
         self.question_numbers = []
+        self.score_columns: Dict[int, str] = {}
+        self.store: Optional[TeamScoreStore] = None
+        self.aggregates: Optional[ScoreAggregates] = None
+        self.question_stats: Optional[QuestionStatistics] = None
         self.max_possible_raw_total = 0
         self.changed_scores: Dict[str, Set[int]] = {}
-        self._load_data()
+        self.sidecar = SidecarCache() if use_sidecar else None
+        self.reader_engine = reader_engine
+        self.compact_dtypes = compact_dtypes
+        self.instrumentation = instrumentation
+        self._load_data(data)
     
-    def _load_data(self) -> None:
+    @instrumented('_load_data')
+    def _load_data(self, data: Optional[pd.DataFrame] = None) -> None:
         """Load data from Excel file and extract question numbers."""
-        self.df = pd.read_excel(self.input_file, sheet_name=self.sheet_name)
-        self.question_numbers = self._extract_question_numbers()
+        from team_store import TeamScoreStore
+
+        df = self._read_sheet() if data is None else data
+        self.df = apply_load_schema(df, self.raw_score_per_question) if self.compact_dtypes else df
+        self.score_columns = self._extract_score_columns()
+        self.question_numbers = sorted(self.score_columns)
+        self.store = TeamScoreStore(self.df, self.score_columns)
         self.max_possible_raw_total = len(self.question_numbers) * self.raw_score_per_question
+        self._derive_aggregates()
+
+    def _derive_aggregates(self) -> None:
+        """Build the team totals and per-question statistics from the whole score matrix."""
+        from scoring_engine import QuestionStatistics, ScoreAggregates
+
+        self.aggregates = ScoreAggregates(self.store.scores, self.total_points, self.raw_score_per_question)
+        self.question_stats = QuestionStatistics(self.store.scores, self.raw_score_per_question)
+
+    def set_parameters(self, total_points: float, raw_score_per_question: float) -> None:
+        """Change the quiz parameters and re-derive totals without reloading the data."""
+        self.total_points = total_points
+        self.raw_score_per_question = raw_score_per_question
+        self.max_possible_raw_total = len(self.question_numbers) * raw_score_per_question
+        self._derive_aggregates()
     
-    def _extract_question_numbers(self) -> List[int]:
-        """Extract unique question numbers from column names."""
-        return sorted([
-            int(match.group(1))
+    def _read_sheet(self) -> pd.DataFrame:
+        """Read the quiz sheet, going through the sidecar cache when enabled."""
+        if self.sidecar is not None:
+            cached = self.sidecar.load(Path(self.input_file), self.sheet_name, COLUMN_SELECTION)
+            if cached is not None:
+                return cached
+
+        df = read_quiz_sheet(self.input_file, self.sheet_name, self.reader_engine)
+        if self.sidecar is not None:
+            self.sidecar.store(Path(self.input_file), self.sheet_name, df, COLUMN_SELECTION)
+        return df
+
+    def _extract_score_columns(self) -> Dict[int, str]:
+        """Map each question number to its score column name."""
+        return {
+            q_num: col
             for col in self.df.columns
-            if (match := re.match(r'(\d+)_score', col.lower()))
-        ])
+            if (q_num := score_question_number(col)) is not None
+        }
+
+    @property
+    def teams(self) -> List[str]:
+        """Get the sorted team names."""
+        return self.store.teams
+
+    def has_team(self, team_name: str) -> bool:
+        """Check whether a team exists."""
+        return team_name in self.store
+
+    def get_team_scores(self, team_name: str) -> Dict[int, float]:
+        """Get a team's raw scores keyed by question number."""
+        return self.store.get_scores(team_name)
+
+    def get_team_score(self, team_name: str, question_number: int) -> float:
+        """Get a team's raw score for one question."""
+        return self.store.get_score(team_name, question_number)
+
+    def set_team_score(self, team_name: str, question_number: int, value: float) -> None:
+        """Set a team's raw score for one question and update that team's totals and the question statistics."""
+        team_pos, question_pos, old_score = self.store.set_score(team_name, question_number, value)
+        self.aggregates.update(self.store.scores, team_pos, question_pos, old_score)
+        self.question_stats.update(self.store.scores, team_pos, question_pos, old_score)
+
+    def set_team_scores(self, team_names: Sequence[str], question_numbers: Sequence[int],
+                        values: Sequence[float]) -> None:
+        """Set many raw scores at once and re-derive every team's totals in one pass.
+
+        Later entries win when the same score appears more than once. Raises
+        KeyError for an unknown team or question before anything is changed.
+        """
+        self.store.set_scores(team_names, question_numbers, values)
+        self._derive_aggregates()
+
+    def get_team_totals(self, team_name: str) -> Tuple[float, float]:
+        """Get a team's current raw and adjusted totals."""
+        team_pos = self.store.team_positions[team_name]
+        return (float(self.aggregates.team_raw_totals[team_pos]),
+                float(self.aggregates.team_adjusted_totals[team_pos]))
+
+    def team_totals_frame(self) -> pd.DataFrame:
+        """Get the current raw and adjusted totals of every team."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            'Team': self.store.teams,
+            'Raw Total': self.aggregates.team_raw_totals,
+            'Adjusted Total': self.aggregates.team_adjusted_totals
+        })
+
+    def question_stats_frame(self) -> pd.DataFrame:
+        """Get the current item analysis of every question."""
+        return self.question_stats.to_frame(self.question_numbers)
+
+    def question_distribution_frame(self) -> pd.DataFrame:
+        """Get the number of teams per score bin for every question."""
+        return self.question_stats.distribution_frame(self.question_numbers)
 
     def record_score_changes(self, changes: List[ScoreChange]) -> None:
         """Record which scores were changed for highlighting."""
@@ -47,68 +170,36 @@ class QuizProcessor:
                 self.changed_scores[change.team_name] = set()
             self.changed_scores[change.team_name].add(change.question_number)
     
-    def _get_team_scores(self, team_data: pd.DataFrame) -> Tuple[List[float], float, float]:
-        """Calculate team scores from the first student's data."""
-        first_student = team_data.iloc[0]
-        earned_raw_scores = [
-            float(first_student[f"{q_num}_Score"])
-            for q_num in self.question_numbers
-            if f"{q_num}_Score" in self.df.columns
-        ]
-        
-        team_raw_total = sum(earned_raw_scores)
-        team_adjusted_total = (team_raw_total * self.total_points) / self.max_possible_raw_total
-        
-        return earned_raw_scores, team_raw_total, team_adjusted_total
-    
-    def _calculate_adjusted_scores(self, earned_raw_scores: List[float]) -> List[float]:
-        """Calculate adjusted scores for individual questions."""
-        points_per_question = self.total_points / len(self.question_numbers)
-        return [
-            (earned_score * points_per_question) / self.raw_score_per_question 
-            for earned_score in earned_raw_scores
-        ]
-    
+    @instrumented('score')
+    def score(self, dtype: Optional[str] = None) -> ScoringResult:
+        """Score all teams and return a compact team-level result.
+
+        Totals and adjusted scores come from the incrementally maintained
+        aggregates, so this only copies the current arrays. Pass
+        ``dtype='float32'`` to halve the size of the score arrays.
+        """
+        store = self.store
+        return self.aggregates.to_result(self.question_numbers, store.team_names, store.scores,
+                                         store.students, store.student_team_index, dtype)
+
+    @instrumented('process_data')
     def process_data(self) -> Tuple[List[Dict], List[int], float]:
-        """Process quiz data and calculate scores."""
-        results = []
-        
-        for team_name, team_data in self.df.groupby('Team'):
-            earned_raw_scores, team_raw_total, team_adjusted_total = self._get_team_scores(team_data)
-            adjusted_scores = self._calculate_adjusted_scores(earned_raw_scores)
-            
-            for _, student in team_data.iterrows():
-                results.append({
-                    'Team Name': team_name,
-                    'Student ID': student['Student ID'],
-                    'Student Name': student['Student Name'],
-                    'Email Address': student['Email Address'],
-                    'Raw Scores': earned_raw_scores,
-                    'Student Raw Total': team_raw_total,
-                    'Team Raw Total': team_raw_total,
-                    'Team Adjusted Total': team_adjusted_total,
-                    'Adjusted Scores': adjusted_scores,
-                    'Student Adjusted Total': team_adjusted_total
-                })
-        
-        return results, self.question_numbers, self.max_possible_raw_total
-
-    def _get_score_column_indices(self, df: pd.DataFrame) -> Tuple[Dict[int, int], Dict[int, int]]:
-        """Get column indices for raw and adjusted score columns."""
-        raw_score_cols = {
-            q: next(i for i, col in enumerate(df.columns, 1) 
-                   if col == f'Q{q} Raw Score')
-            for q in self.question_numbers
-        }
-        adjusted_score_cols = {
-            q: next(i for i, col in enumerate(df.columns, 1) 
-                   if col == f'Q{q} Adjusted Score')
-            for q in self.question_numbers
-        }
-        return raw_score_cols, adjusted_score_cols
-    
-    def _create_output_dataframe(self, results: List[Dict]) -> pd.DataFrame:
+        """Process quiz data and calculate scores.
+
+        Returns the list-of-dicts compatibility view of :meth:`score`, with
+        one dict per student. Prefer :meth:`score` for large cohorts.
+        """
+        return self.score().to_records(), self.question_numbers, self.max_possible_raw_total
+
+    @instrumented('_create_output_dataframe')
+    def _create_output_dataframe(self, results: Union[List[Dict], ScoringResult]) -> pd.DataFrame:
         """Create DataFrame for output."""
+        if not isinstance(results, list):
+            from report_writer import report_frame
+            return report_frame(results)
+
+        import pandas as pd
+
         output_data = []
         current_team = None
         
@@ -126,33 +217,58 @@ class QuizProcessor:
             }
             current_team = result['Team Name']
             
-            for i, (raw, adjusted) in enumerate(zip(result['Raw Scores'], result['Adjusted Scores']), 1):
-                row[f'Q{i} Raw Score'] = raw
-                row[f'Q{i} Adjusted Score'] = adjusted
+            for q_num, raw, adjusted in zip(self.question_numbers, result['Raw Scores'], result['Adjusted Scores']):
+                row[f'Q{q_num} Raw Score'] = raw
+                row[f'Q{q_num} Adjusted Score'] = adjusted
             
             output_data.append(row)
         
         return pd.DataFrame(output_data)
     
+    @instrumented('_highlight_changed_scores')
     def _highlight_changed_scores(self, worksheet, df: pd.DataFrame) -> None:
-        """Apply highlighting to changed scores in worksheet."""
+        """Apply highlighting to changed scores in worksheet.
+
+        Only the row ranges of changed teams are touched, so the cost is
+        proportional to the number of highlighted cells.
+        """
         if not self.changed_scores:
             return
             
-        raw_score_cols, adjusted_score_cols = self._get_score_column_indices(df)
-        current_team = None
+        from report_writer import HIGHLIGHT_FILL, ReportSchema, team_row_ranges
+
+        highlight_columns = ReportSchema(self.question_numbers).highlight_columns(self.changed_scores)
+        team_rows = team_row_ranges(df['Team Name'])
         
-        for row_idx, row in enumerate(df.to_dict('records'), 2):
-            if row['Team Name']:
-                current_team = row['Team Name']
-            
-            if current_team in self.changed_scores:
-                for q_num in self.changed_scores[current_team]:
-                    for col_idx in [raw_score_cols[q_num], adjusted_score_cols[q_num]]:
-                        worksheet.cell(row=row_idx, column=col_idx).fill = self.HIGHLIGHT_FILL
+        for team_name, columns in highlight_columns.items():
+            if team_name not in team_rows:
+                continue
+            start, stop = team_rows[team_name]
+            for col_idx in columns:
+                for row_idx in range(start + 2, stop + 2):
+                    worksheet.cell(row=row_idx, column=col_idx + 1).fill = HIGHLIGHT_FILL
+
+    @instrumented('save_to_excel')
+    def save_to_excel(self, results: Union[List[Dict], ScoringResult], output_file: Path,
+                      engine: str = 'streaming') -> None:
+        """Save processed data to Excel file with highlighting.
+
+        The ``streaming`` engine writes rows in openpyxl write-only mode and
+        highlights changed scores inline; ``openpyxl`` builds the full output
+        DataFrame and workbook in memory first.
+        """
+        if engine not in self.OUTPUT_ENGINES:
+            raise ValueError(f"Unknown output engine '{engine}'. Choose from {self.OUTPUT_ENGINES}.")
+
+        if engine == 'streaming':
+            from report_writer import StreamingExcelWriter, iter_record_rows, iter_result_rows
+
+            rows = iter_record_rows(results) if isinstance(results, list) else iter_result_rows(results)
+            StreamingExcelWriter(self.question_numbers, self.changed_scores).write(rows, output_file)
+            return
+
+        import pandas as pd
 
-    def save_to_excel(self, results: List[Dict], output_file: Path) -> None:
-        """Save processed data to Excel file with highlighting."""
         df_output = self._create_output_dataframe(results)
         
         with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
@@ -160,11 +276,32 @@ class QuizProcessor:
             worksheet = writer.sheets['Sheet1']
             self._highlight_changed_scores(worksheet, df_output)
 
+    def save_report(self, result: ScoringResult, output_file: Path, fmt: Optional[str] = None,
+                    engine: str = 'streaming') -> None:
+        """Save a scoring result as xlsx, csv, parquet or jsonl.
+
+        The format defaults to the output file's suffix. Excel output goes
+        through :meth:`save_to_excel` with ``engine``; the other formats are
+        streamed in chunks by :mod:`report_formats`.
+        """
+        from report_formats import format_for_path, write_report
+
+        fmt = fmt or format_for_path(output_file)
+        if fmt == 'xlsx':
+            self.save_to_excel(result, output_file, engine=engine)
+        else:
+            write_report(result, self.changed_scores, output_file, fmt)
+
     @classmethod
-    def create_output_excel(cls, results: List[Dict], question_numbers: List[int], 
-                          output_file: Path, processor: QuizProcessor | None = None) -> None:
+    def create_output_excel(cls, results: Union[List[Dict], ScoringResult], question_numbers: List[int], 
+                          output_file: Path, processor: QuizProcessor | None = None,
+                          engine: str = 'streaming') -> None:
         """Create the output Excel file with the processed data."""
         if processor:
-            processor.save_to_excel(results, output_file)
+            processor.save_to_excel(results, output_file, engine)
+        elif not isinstance(results, list):
+            from report_writer import report_frame
+            report_frame(results).to_excel(output_file, index=False)
         else:
-            pd.DataFrame(results).to_excel(output_file, index=False)
\ No newline at end of file
+            import pandas as pd
+            pd.DataFrame(results).to_excel(output_file, index=False)
@@ -0,0 +1,399 @@
+"""Streaming CSV, Parquet and JSON Lines report writers.
+
+These formats are written for gradebook imports rather than for reading
+by people. Each row describes one student and carries its team columns,
+so rows can be read on their own. The 'Changed Questions' column lists the
+questions edited for the student's team, standing in for the Excel
+report's highlighting. Rows are built from the scoring result in chunks
+of ``chunk_rows`` students and written as they are built, so the full
+output frame is never held in memory. An existing report can be patched
+so that only some teams' rows are regenerated (:func:`patch_report`); a
+small manifest written next to each report file records the quiz
+parameters, so a report written with other parameters is never patched.
+"""
+from __future__ import annotations
+import csv
+import io
+import itertools
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Union
+import numpy as np
+import pandas as pd
+from scoring_engine import ScoringResult
+
+
+REPORT_FORMATS = ('xlsx', 'csv', 'parquet', 'jsonl')
+CHANGED_COLUMN = 'Changed Questions'
+DEFAULT_CHUNK_ROWS = 2_000
+MIME_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'jsonl': 'application/jsonl'
+}
+
+REPORT_MANIFEST_SUFFIX = '.manifest.json'
+JSONL_TEAM_PREFIX = '{"Team Name":'
+JSON_DECODER = json.JSONDecoder()
+
+Output = Union[Path, IO[bytes]]
+
+
+def parquet_available() -> bool:
+    """Check whether pyarrow is importable for Parquet output."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def format_for_path(output_file: Path) -> str:
+    """Get the report format from a file suffix, defaulting to xlsx."""
+    suffix = output_file.suffix.lower().lstrip('.')
+    return suffix if suffix in REPORT_FORMATS else 'xlsx'
+
+
+def changed_markers(result: ScoringResult, changed_scores: Dict[str, Set[int]]) -> np.ndarray:
+    """Get each team's changed questions as text such as 'Q3;Q7', empty when unchanged."""
+    questions = set(result.question_numbers)
+    return np.array([';'.join(f'Q{q}' for q in sorted(changed_scores.get(team, set()) & questions))
+                     for team in result.team_names.tolist()], dtype=object)
+
+
+def iter_report_chunks(result: ScoringResult, changed_scores: Dict[str, Set[int]],
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       student_rows: Optional[np.ndarray] = None) -> Iterator[pd.DataFrame]:
+    """Yield the report as frames of at most ``chunk_rows`` students each.
+
+    ``student_rows`` limits the report to those student positions. Scores
+    are gathered into one interleaved raw/adjusted block per chunk, which
+    the frame uses without copying.
+    """
+    markers = changed_markers(result, changed_scores)
+    students = {col: result.students[col].to_numpy()
+                for col in ('Student ID', 'Student Name', 'Email Address')}
+    score_columns = [f'Q{q_num} {kind} Score' for q_num in result.question_numbers
+                     for kind in ('Raw', 'Adjusted')]
+    positions = np.arange(result.num_students) if student_rows is None else student_rows
+    for start in range(0, len(positions), chunk_rows):
+        rows = positions[start:start + chunk_rows]
+        idx = result.student_team_index[rows]
+        scores = np.empty((len(idx), len(score_columns)))
+        scores[:, 0::2] = result.raw_scores[idx]
+        scores[:, 1::2] = result.adjusted_scores[idx]
+        chunk = pd.DataFrame(scores, columns=score_columns, copy=False)
+        leading = {
+            'Team Name': result.team_names[idx],
+            'Team Raw Total': result.team_raw_totals[idx],
+            'Team Adjusted Total': result.team_adjusted_totals[idx],
+            **{col: values[rows] for col, values in students.items()},
+            'Student Raw Total': result.team_raw_totals[idx],
+            'Student Adjusted Total': result.team_adjusted_totals[idx]
+        }
+        for position, (col, values) in enumerate(leading.items()):
+            chunk.insert(position, col, values)
+        chunk[CHANGED_COLUMN] = markers[idx]
+        yield chunk
+
+
+def report_columns(result: ScoringResult) -> List[str]:
+    """Get the column names of the chunked report formats."""
+    columns = ['Team Name', 'Team Raw Total', 'Team Adjusted Total', 'Student ID', 'Student Name',
+               'Email Address', 'Student Raw Total', 'Student Adjusted Total']
+    for q_num in result.question_numbers:
+        columns += [f'Q{q_num} Raw Score', f'Q{q_num} Adjusted Score']
+    return columns + [CHANGED_COLUMN]
+
+
+class ChunkedReportWriter(ABC):
+    """Base class of writers that stream report chunks to one file or buffer."""
+
+    @abstractmethod
+    def write(self, chunks: Iterator[pd.DataFrame], output_file: Output) -> int:
+        """Write every chunk to the output; returns the number of rows written."""
+
+    @staticmethod
+    @contextmanager
+    def _open_text(output_file: Output) -> Iterator[TextIO]:
+        """Open a path, or wrap a binary buffer without closing it, for UTF-8 text writing."""
+        if isinstance(output_file, (str, Path)):
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+                yield f
+            return
+        wrapper = io.TextIOWrapper(output_file, encoding='utf-8', newline='')
+        try:
+            yield wrapper
+        finally:
+            wrapper.flush()
+            wrapper.detach()
+
+
+class CsvReportWriter(ChunkedReportWriter):
+    """Write the report as UTF-8 CSV with one header row."""
+
+    def write(self, chunks: Iterator[pd.DataFrame], output_file: Output) -> int:
+        """Append each chunk's rows as CSV."""
+        rows = 0
+        with self._open_text(output_file) as f:
+            for chunk in chunks:
+                chunk.to_csv(f, header=rows == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+
+class JsonLinesReportWriter(ChunkedReportWriter):
+    """Write the report as one JSON object per line."""
+
+    def write(self, chunks: Iterator[pd.DataFrame], output_file: Output) -> int:
+        """Append each chunk's rows as JSON lines; missing values become null."""
+        rows = 0
+        with self._open_text(output_file) as f:
+            for chunk in chunks:
+                if len(chunk):
+                    chunk.to_json(f, orient='records', lines=True)
+                rows += len(chunk)
+        return rows
+
+
+class ParquetReportWriter(ChunkedReportWriter):
+    """Write the report as a Parquet file with one row group per chunk."""
+
+    def write(self, chunks: Iterator[pd.DataFrame], output_file: Output) -> int:
+        """Write each chunk as a row group; the first chunk fixes the schema."""
+        if not parquet_available():
+            raise ValueError("Parquet output requires pyarrow (pip install pyarrow)")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = 0
+        writer: Optional[pq.ParquetWriter] = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                             schema=writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_file, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+
+CHUNKED_WRITERS = {
+    'csv': CsvReportWriter,
+    'parquet': ParquetReportWriter,
+    'jsonl': JsonLinesReportWriter
+}
+
+
+def write_report(result: ScoringResult, changed_scores: Dict[str, Set[int]], output_file: Output,
+                 fmt: str = 'xlsx', chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """Write a scoring result in the given format.
+
+    ``xlsx`` uses the streaming Excel writer with highlighted changes; the
+    other formats stream chunks with a 'Changed Questions' column.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'. Choose from {REPORT_FORMATS}.")
+    if fmt == 'xlsx':
+        from report_writer import StreamingExcelWriter, iter_result_rows
+        StreamingExcelWriter(result.question_numbers, changed_scores).write(iter_result_rows(result), output_file)
+        return
+    CHUNKED_WRITERS[fmt]().write(iter_report_chunks(result, changed_scores, chunk_rows), output_file)
+    write_report_manifest(output_file, result.total_points, result.raw_score_per_question)
+
+
+def report_manifest_path(report_file: Union[Path, str]) -> Path:
+    """Get the path of the manifest kept next to a CSV, JSON Lines or Parquet report."""
+    report_file = Path(report_file)
+    return report_file.with_name(report_file.name + REPORT_MANIFEST_SUFFIX)
+
+
+def write_report_manifest(report_file: Output, total_points: Optional[float],
+                          raw_score_per_question: Optional[float]) -> None:
+    """Record the quiz parameters a report file was written with; buffers get no manifest."""
+    if not isinstance(report_file, (str, Path)):
+        return
+    manifest = {'total_points': total_points, 'raw_score_per_question': raw_score_per_question}
+    report_manifest_path(report_file).write_text(json.dumps(manifest), encoding='utf-8')
+
+
+def read_report_manifest(report_file: Union[Path, str]) -> Optional[Dict[str, Any]]:
+    """Read the quiz parameters recorded for a report, or None without a readable manifest."""
+    try:
+        return json.loads(report_manifest_path(report_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def team_student_rows(result: ScoringResult, teams: Set[str]) -> np.ndarray:
+    """Get the student positions of the given teams, in report order."""
+    team_pos = np.flatnonzero(np.isin(result.team_names.astype(str), list(teams)))
+    return np.flatnonzero(np.isin(result.student_team_index, team_pos))
+
+
+def _csv_records(lines: Iterable[str]) -> Iterator[str]:
+    """Join physical lines into CSV records, keeping a quoted field's newlines inside its record.
+
+    A record is complete once it holds an even number of quote characters;
+    escaped quotes ("") count twice and so keep the parity.
+    """
+    parts: List[str] = []
+    quotes = 0
+    for line in lines:
+        parts.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield ''.join(parts)
+            parts, quotes = [], 0
+    if parts:
+        yield ''.join(parts)
+
+
+def _jsonl_records(lines: Iterable[str]) -> Iterable[str]:
+    """Get JSON Lines records, one per line; JSON escapes newlines inside strings."""
+    return lines
+
+
+def _records_by_team(records: Iterable[str], team_names: pd.Series) -> Dict[str, List[str]]:
+    """Group rendered row records by their team."""
+    grouped: Dict[str, List[str]] = {}
+    for team, record in zip(team_names.astype(str).tolist(), records):
+        grouped.setdefault(team, []).append(record)
+    return grouped
+
+
+def _patch_records(previous_file: Path, output_file: Path, fresh: Dict[str, List[str]], rewrite: Set[str],
+                   current: Set[str], records_of: Callable[[Iterable[str]], Iterable[str]],
+                   columns_of: Callable[[str], List[str]], columns: List[str],
+                   team_of: Callable[[str], str], has_header: bool) -> None:
+    """Copy a record-per-row report, swapping in fresh records for rewritten teams.
+
+    ``records_of`` groups the file's lines into row records. ``columns_of``
+    reads the column names from the first record, which is a header row
+    when ``has_header`` is set. A rewritten team's records go where its
+    first old record was; teams that are new to the report are appended,
+    and teams no longer present are dropped.
+    """
+    with open(previous_file, encoding='utf-8', newline='') as src, \
+            open(output_file, 'w', encoding='utf-8', newline='') as out:
+        records = iter(records_of(src))
+        first = next(records, '')
+        if first and columns_of(first) != columns:
+            raise ValueError(f"{previous_file} has different report columns; regenerate the report instead")
+        if has_header:
+            out.write(first)
+        else:
+            records = itertools.chain([first] if first else [], records)
+        for record in records:
+            team = team_of(record)
+            if team in fresh:
+                out.writelines(fresh.pop(team))
+            elif team in current and team not in rewrite:
+                out.write(record)
+        for team_records in fresh.values():
+            out.writelines(team_records)
+
+
+def _csv_columns(header: str) -> List[str]:
+    """Get the column names from a CSV header line."""
+    return next(csv.reader([header]), [])
+
+
+def _jsonl_columns(line: str) -> List[str]:
+    """Get the column names from the keys of a JSON Lines row."""
+    return list(json.loads(line))
+
+
+def _csv_team(record: str) -> str:
+    """Get the Team Name (first field) of a CSV report record."""
+    if record.startswith('"'):
+        return next(csv.reader([record]))[0]
+    return record.split(',', 1)[0].rstrip('\r\n')
+
+
+def _jsonl_team(line: str) -> str:
+    """Get the Team Name (first key) of a JSON Lines report line."""
+    if line.startswith(JSONL_TEAM_PREFIX):
+        return str(JSON_DECODER.raw_decode(line, len(JSONL_TEAM_PREFIX))[0])
+    return str(json.loads(line)['Team Name'])
+
+
+def _patch_parquet(previous_file: Path, output_file: Path, fresh: pd.DataFrame, current: Set[str],
+                   rewrite: Set[str], columns: List[str]) -> None:
+    """Rewrite a Parquet report from its kept rows plus fresh rows, in the previous team order."""
+    if not parquet_available():
+        raise ValueError("Parquet output requires pyarrow (pip install pyarrow)")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(previous_file)
+    if table.schema.names != columns:
+        raise ValueError(f"{previous_file} has different report columns; regenerate the report instead")
+    previous_teams = pd.Series(table.column('Team Name').to_pandas().astype(str).to_numpy())
+    keep = previous_teams.isin(current - rewrite).to_numpy()
+    try:
+        combined = pa.concat_tables([table.filter(pa.array(keep)),
+                                     pa.Table.from_pandas(fresh, schema=table.schema, preserve_index=False)])
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+        raise ValueError(f"{previous_file} cannot be patched ({exc}); regenerate the report instead") from None
+    first_row = pd.Series(np.arange(len(previous_teams))).groupby(previous_teams.to_numpy()).min()
+    combined_teams = pd.concat([previous_teams[keep], fresh['Team Name'].astype(str)], ignore_index=True)
+    rank = combined_teams.map(first_row).fillna(len(previous_teams)).to_numpy()
+    pq.write_table(combined.take(np.argsort(rank, kind='stable')), output_file)
+
+
+def patch_report(previous_file: Path, output_file: Path, result: ScoringResult,
+                 changed_scores: Dict[str, Set[int]], teams: Set[str]) -> int:
+    """Write a CSV, JSON Lines or Parquet report by patching the previous one.
+
+    Only the rows of ``teams``, which must include teams added since the
+    previous report, are regenerated from ``result``. Other rows are copied
+    as they are, and rows of teams no longer in the result are dropped. The
+    output may be the previous file itself. Raises ValueError for xlsx, when
+    the formats differ, when the previous report's columns do not match, or
+    when its manifest is missing or records other quiz parameters, since
+    its kept rows would carry stale adjusted scores. Returns the number of
+    regenerated rows.
+    """
+    fmt = format_for_path(output_file)
+    if fmt == 'xlsx' or format_for_path(previous_file) != fmt:
+        raise ValueError("Only CSV, JSON Lines and Parquet reports of the same format can be patched")
+    manifest = read_report_manifest(previous_file)
+    if manifest is None:
+        raise ValueError(f"{previous_file} has no readable manifest; regenerate the report instead")
+    parameters = {'total_points': result.total_points, 'raw_score_per_question': result.raw_score_per_question}
+    if any(manifest.get(key) != value for key, value in parameters.items()):
+        raise ValueError(f"{previous_file} was written with other quiz parameters; regenerate the report instead")
+    columns = report_columns(result)
+    current = set(result.team_names.astype(str).tolist())
+    rewrite = {str(team) for team in teams} & current
+    fresh = pd.concat(list(iter_report_chunks(result, changed_scores,
+                                              student_rows=team_student_rows(result, rewrite)))
+                      or [pd.DataFrame(columns=columns)], ignore_index=True)
+
+    tmp_path = output_file.with_name(output_file.name + '.tmp')
+    try:
+        if fmt == 'parquet':
+            _patch_parquet(previous_file, tmp_path, fresh, current, rewrite, columns)
+        elif fmt == 'csv':
+            text = io.StringIO(fresh.to_csv(index=False, header=False), newline='')
+            _patch_records(previous_file, tmp_path, _records_by_team(_csv_records(text), fresh['Team Name']),
+                           rewrite, current, _csv_records, _csv_columns, columns, _csv_team, has_header=True)
+        else:
+            text = io.StringIO(fresh.to_json(orient='records', lines=True) if len(fresh) else '', newline='')
+            _patch_records(previous_file, tmp_path, _records_by_team(text, fresh['Team Name']),
+                           rewrite, current, _jsonl_records, _jsonl_columns, columns, _jsonl_team,
+                           has_header=False)
+        os.replace(tmp_path, output_file)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    write_report_manifest(output_file, result.total_points, result.raw_score_per_question)
+    return len(fresh)
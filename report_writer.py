@@ -0,0 +1,211 @@
+"""Streaming writer for processed quiz reports."""
+from __future__ import annotations
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+from scoring_engine import ScoringResult
+
+
+HIGHLIGHT_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+SHEET_NAME = 'Sheet1'
+
+TEAM_COLUMNS = ['Team Name', 'Team Raw Total', 'Team Adjusted Total']
+STUDENT_COLUMNS = ['Student ID', 'Student Name', 'Email Address',
+                   'Student Raw Total', 'Student Adjusted Total']
+
+ReportRow = Tuple[str, List[Any]]
+
+
+def report_header(question_numbers: List[int]) -> List[str]:
+    """Build the report column names in output order."""
+    header = TEAM_COLUMNS + STUDENT_COLUMNS
+    for q_num in question_numbers:
+        header += [f'Q{q_num} Raw Score', f'Q{q_num} Adjusted Score']
+    return header
+
+
+class ReportSchema:
+    """Report column layout with a precomputed name-to-position map."""
+
+    def __init__(self, question_numbers: List[int]):
+        """Build the header and column index for the given questions."""
+        self.question_numbers = list(question_numbers)
+        self.header = report_header(self.question_numbers)
+        self.column_index = {name: i for i, name in enumerate(self.header)}
+
+    def score_columns(self, question_number: int) -> Tuple[int, int]:
+        """Get the 0-based raw and adjusted score column positions of a question."""
+        return (self.column_index[f'Q{question_number} Raw Score'],
+                self.column_index[f'Q{question_number} Adjusted Score'])
+
+    def highlight_columns(self, changed_scores: Dict[str, Set[int]]) -> Dict[str, List[int]]:
+        """Map each changed team to the 0-based columns that must be highlighted."""
+        return {
+            team: sorted(
+                col
+                for q_num in questions if f'Q{q_num} Raw Score' in self.column_index
+                for col in self.score_columns(q_num)
+            )
+            for team, questions in changed_scores.items()
+        }
+
+
+def team_row_ranges(team_column: Sequence[Any]) -> Dict[Any, Tuple[int, int]]:
+    """Map each team to its half-open (start, stop) row range in a report.
+
+    The team name appears only on the first row of each team's block, so block
+    starts are the non-empty entries of the 'Team Name' column.
+    """
+    names = np.asarray(team_column, dtype=object)
+    starts = np.flatnonzero(names != '')
+    stops = np.append(starts[1:], len(names))
+    return {names[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+
+def _blank_nan(value: Any) -> Any:
+    """Replace NaN with None so it is written as an empty cell."""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _question_block(raw_scores: List[float], adjusted_scores: List[float]) -> List[Any]:
+    """Interleave raw and adjusted scores as they appear in the report."""
+    block = []
+    for raw, adjusted in zip(raw_scores, adjusted_scores):
+        block += [_blank_nan(raw), _blank_nan(adjusted)]
+    return block
+
+
+def iter_result_rows(result: ScoringResult) -> Iterator[ReportRow]:
+    """Yield (team name, row values) for each student of a scoring result."""
+    raw_lists = result.raw_scores.tolist()
+    adjusted_lists = result.adjusted_scores.tolist()
+    raw_totals = result.team_raw_totals.tolist()
+    adjusted_totals = result.team_adjusted_totals.tolist()
+    students = result.students
+    student_ids = students['Student ID'].tolist()
+    student_names = students['Student Name'].tolist()
+    emails = students['Email Address'].tolist()
+
+    current_team = None
+    block: List[Any] = []
+    for pos, team_idx in enumerate(result.student_team_index.tolist()):
+        is_first_in_team = team_idx != current_team
+        if is_first_in_team:
+            block = _question_block(raw_lists[team_idx], adjusted_lists[team_idx])
+            current_team = team_idx
+        raw_total = _blank_nan(raw_totals[team_idx])
+        adjusted_total = _blank_nan(adjusted_totals[team_idx])
+        team_name = result.team_names[team_idx]
+        row = [
+            team_name if is_first_in_team else '',
+            raw_total if is_first_in_team else '',
+            adjusted_total if is_first_in_team else '',
+            _blank_nan(student_ids[pos]),
+            _blank_nan(student_names[pos]),
+            _blank_nan(emails[pos]),
+            raw_total,
+            adjusted_total
+        ]
+        yield team_name, row + block
+
+
+def report_frame(result: ScoringResult) -> pd.DataFrame:
+    """Expand a scoring result into the per-student report frame.
+
+    Team columns are filled only on each team's first row, matching the
+    layout of the written report.
+    """
+    idx = result.student_team_index
+    first_in_team = np.ones(len(idx), dtype=bool)
+    first_in_team[1:] = idx[1:] != idx[:-1]
+
+    def first_rows_only(values: np.ndarray) -> np.ndarray:
+        column = values[idx].astype(object)
+        column[~first_in_team] = ''
+        return column
+
+    columns: Dict[str, Any] = {
+        'Team Name': first_rows_only(result.team_names),
+        'Team Raw Total': first_rows_only(result.team_raw_totals),
+        'Team Adjusted Total': first_rows_only(result.team_adjusted_totals),
+        'Student ID': result.students['Student ID'].to_numpy(),
+        'Student Name': result.students['Student Name'].to_numpy(),
+        'Email Address': result.students['Email Address'].to_numpy(),
+        'Student Raw Total': result.team_raw_totals[idx],
+        'Student Adjusted Total': result.team_adjusted_totals[idx]
+    }
+    for j, q_num in enumerate(result.question_numbers):
+        columns[f'Q{q_num} Raw Score'] = result.raw_scores[idx, j]
+        columns[f'Q{q_num} Adjusted Score'] = result.adjusted_scores[idx, j]
+    return pd.DataFrame(columns)
+
+
+def iter_record_rows(results: List[Dict]) -> Iterator[ReportRow]:
+    """Yield (team name, row values) from the list-of-dicts result view."""
+    current_team = None
+    for result in results:
+        team_name = result['Team Name']
+        is_first_in_team = team_name != current_team
+        current_team = team_name
+        row = [
+            team_name if is_first_in_team else '',
+            _blank_nan(result['Team Raw Total']) if is_first_in_team else '',
+            _blank_nan(result['Team Adjusted Total']) if is_first_in_team else '',
+            _blank_nan(result['Student ID']),
+            _blank_nan(result['Student Name']),
+            _blank_nan(result['Email Address']),
+            _blank_nan(result['Student Raw Total']),
+            _blank_nan(result['Student Adjusted Total'])
+        ]
+        yield team_name, row + _question_block(result['Raw Scores'], result['Adjusted Scores'])
+
+
+class StreamingExcelWriter:
+    """Write a report row by row with openpyxl's write-only workbook.
+
+    Changed-score highlighting is applied to each row as it is written, so
+    memory use does not grow with the number of students.
+    """
+
+    def __init__(self, question_numbers: List[int], changed_scores: Dict[str, Set[int]]):
+        """Initialize the writer with the report questions and changed scores."""
+        schema = ReportSchema(question_numbers)
+        self.header = schema.header
+        self._highlight_columns = schema.highlight_columns(changed_scores)
+
+    def _highlight_row(self, worksheet, row: List[Any], columns: List[int]) -> List[Any]:
+        """Wrap the changed score values of a row in highlighted cells."""
+        row = list(row)
+        for col in columns:
+            cell = WriteOnlyCell(worksheet, value=row[col])
+            cell.fill = HIGHLIGHT_FILL
+            row[col] = cell
+        return row
+
+    def append_sheet(self, workbook: Workbook, rows: Iterator[ReportRow], sheet_name: str = SHEET_NAME) -> None:
+        """Stream the header and rows into a new sheet of a write-only workbook."""
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append(self.header)
+
+        for team_name, row in rows:
+            columns = self._highlight_columns.get(team_name)
+            worksheet.append(self._highlight_row(worksheet, row, columns) if columns else row)
+
+    def write(self, rows: Iterator[ReportRow], output_file: Path) -> None:
+        """Stream the header and rows to the output file."""
+        workbook = Workbook(write_only=True)
+        self.append_sheet(workbook, rows)
+        workbook.save(output_file)
+
+
+def append_frame_sheet(workbook: Workbook, sheet_name: str, frame: pd.DataFrame) -> None:
+    """Write a frame as a plain sheet of a write-only workbook."""
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append([str(col) for col in frame.columns])
+    for row in frame.itertuples(index=False):
+        worksheet.append([_blank_nan(value) for value in row])
@@ -0,0 +1,131 @@
+"""Append-only JSON Lines journal of score changes.
+
+Every edit is appended as one line, so autosaving costs the same however
+many teams or edits there are. Replaying reads the whole journal, keeps the
+last value of each edited score and applies them to a processor in one
+vectorized assignment. Every ``compact_every`` appends, the journal is
+rewritten as one net change per edited score.
+"""
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from ui.score_change import ScoreChange
+
+if TYPE_CHECKING:
+    from quiz_processor import QuizProcessor
+
+
+DEFAULT_COMPACT_EVERY = 1000
+
+
+class ScoreJournal:
+    """A score-change journal file for one quiz sheet."""
+
+    def __init__(self, path: Path, compact_every: int = DEFAULT_COMPACT_EVERY, fsync: bool = False):
+        """Open (or start) a journal; ``fsync`` forces each append to disk."""
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._appends_since_compaction = 0
+        self._tail_checked = False
+
+    def exists(self) -> bool:
+        """Check whether the journal holds any entries."""
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def append(self, change: ScoreChange) -> None:
+        """Append one change, compacting the journal every ``compact_every`` appends."""
+        self.extend([change])
+
+    def extend(self, changes: List[ScoreChange]) -> None:
+        """Append several changes, such as a bulk edit, in one write."""
+        if not changes:
+            return
+        now = time.time()
+        lines = ''.join(json.dumps({'team': change.team_name, 'question': change.question_number,
+                                    'old': change.old_score, 'new': change.new_score,
+                                    'time': now}) + '\n' for change in changes)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if not self._tail_checked:
+                # Terminate a line left unfinished by a crash so it cannot swallow this entry.
+                if self._ends_mid_line():
+                    f.write('\n')
+                self._tail_checked = True
+            f.write(lines)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._appends_since_compaction += len(changes)
+        if self.compact_every and self._appends_since_compaction >= self.compact_every:
+            self.compact()
+
+    def _ends_mid_line(self) -> bool:
+        """Check whether the file's last line lacks its newline."""
+        if not self.exists():
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+
+    def read(self) -> List[ScoreChange]:
+        """Read every change in order; lines cut short by a crash are skipped."""
+        if not self.path.exists():
+            return []
+        changes = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                changes.append(ScoreChange(entry['team'], entry['question'], entry['old'], entry['new']))
+        return changes
+
+    @staticmethod
+    def net_changes(changes: List[ScoreChange]) -> List[ScoreChange]:
+        """Collapse changes to one per score: the first old value and the last new value.
+
+        Scores edited back to their original value are dropped.
+        """
+        net: Dict[Tuple[str, int], ScoreChange] = {}
+        for change in changes:
+            key = (change.team_name, change.question_number)
+            first = net.get(key)
+            old_score = change.old_score if first is None else first.old_score
+            net[key] = ScoreChange(change.team_name, change.question_number, old_score, change.new_score)
+        return [change for change in net.values() if change.new_score != change.old_score]
+
+    def replay(self, processor: QuizProcessor, changes: Optional[List[ScoreChange]] = None) -> List[ScoreChange]:
+        """Apply the journal's net changes to a processor in one bulk update.
+
+        Changes for teams or questions the processor does not have are
+        skipped. Returns the net changes that were applied.
+        """
+        changes = self.net_changes(self.read() if changes is None else changes)
+        applied = [c for c in changes
+                   if processor.has_team(c.team_name) and c.question_number in processor.question_numbers]
+        if applied:
+            processor.set_team_scores([c.team_name for c in applied], [c.question_number for c in applied],
+                                      [c.new_score for c in applied])
+        return applied
+
+    def compact(self) -> None:
+        """Rewrite the journal as its net changes, atomically replacing the file."""
+        changes = self.net_changes(self.read())
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for change in changes:
+                f.write(json.dumps({'team': change.team_name, 'question': change.question_number,
+                                    'old': change.old_score, 'new': change.new_score,
+                                    'time': time.time()}) + '\n')
+        os.replace(tmp_path, self.path)
+        self._appends_since_compaction = 0
+
+    def clear(self) -> None:
+        """Delete the journal."""
+        self.path.unlink(missing_ok=True)
+        self._appends_since_compaction = 0
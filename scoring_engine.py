@@ -0,0 +1,270 @@
+"""Vectorized scoring engine for team quiz data."""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+
+STUDENT_COLUMNS = ['Student ID', 'Student Name', 'Email Address']
+DISTRIBUTION_BINS = 10
+# Item-analysis flag thresholds.
+HARD_MEAN_PERCENT = 20.0
+EASY_FULL_MARKS_PERCENT = 95.0
+LOW_DISCRIMINATION = 0.1
+
+
+@dataclass
+class ScoringResult:
+    """Columnar scoring result: one row per team plus a student table keyed by team.
+
+    Scores and totals are stored once per team; ``student_team_index`` maps
+    each student row to its team. Per-student rows are only materialized
+    when a report is exported. The quiz parameters the totals were derived
+    with are kept so a written report can record them.
+    """
+    question_numbers: List[int]
+    team_names: np.ndarray
+    raw_scores: np.ndarray
+    team_raw_totals: np.ndarray
+    team_adjusted_totals: np.ndarray
+    adjusted_scores: np.ndarray
+    students: pd.DataFrame
+    student_team_index: np.ndarray
+    total_points: Optional[float] = None
+    raw_score_per_question: Optional[float] = None
+
+    @property
+    def num_teams(self) -> int:
+        """Number of teams in the result."""
+        return len(self.team_names)
+
+    @property
+    def num_students(self) -> int:
+        """Number of students in the result."""
+        return len(self.students)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the result, including the student table."""
+        arrays = (self.team_names, self.raw_scores, self.team_raw_totals, self.team_adjusted_totals,
+                  self.adjusted_scores, self.student_team_index)
+        return sum(a.nbytes for a in arrays) + int(self.students.memory_usage(deep=True).sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Expand the result into one row per student with list-free columns."""
+        idx = self.student_team_index
+        frame = pd.DataFrame({
+            'Team Name': self.team_names[idx],
+            'Student ID': self.students['Student ID'].to_numpy(),
+            'Student Name': self.students['Student Name'].to_numpy(),
+            'Email Address': self.students['Email Address'].to_numpy(),
+            'Team Raw Total': self.team_raw_totals[idx],
+            'Team Adjusted Total': self.team_adjusted_totals[idx],
+        })
+        for j, q_num in enumerate(self.question_numbers):
+            frame[f'Q{q_num} Raw Score'] = self.raw_scores[idx, j]
+            frame[f'Q{q_num} Adjusted Score'] = self.adjusted_scores[idx, j]
+        return frame
+
+    def to_records(self) -> List[Dict]:
+        """Build the legacy list-of-dicts view used by QuizProcessor.process_data."""
+        raw_lists = self.raw_scores.tolist()
+        adjusted_lists = self.adjusted_scores.tolist()
+        raw_totals = self.team_raw_totals.tolist()
+        adjusted_totals = self.team_adjusted_totals.tolist()
+        student_ids = self.students['Student ID'].tolist()
+        student_names = self.students['Student Name'].tolist()
+        emails = self.students['Email Address'].tolist()
+
+        records = []
+        for pos, team_idx in enumerate(self.student_team_index.tolist()):
+            records.append({
+                'Team Name': self.team_names[team_idx],
+                'Student ID': student_ids[pos],
+                'Student Name': student_names[pos],
+                'Email Address': emails[pos],
+                'Raw Scores': raw_lists[team_idx],
+                'Student Raw Total': raw_totals[team_idx],
+                'Team Raw Total': raw_totals[team_idx],
+                'Team Adjusted Total': adjusted_totals[team_idx],
+                'Adjusted Scores': adjusted_lists[team_idx],
+                'Student Adjusted Total': adjusted_totals[team_idx]
+            })
+        return records
+
+
+class ScoreAggregates:
+    """Team totals and adjusted scores derived from a raw score matrix.
+
+    The arrays are built once with whole-array operations and then kept
+    current by :meth:`update`, which touches only the edited team.
+    """
+
+    def __init__(self, raw_scores: np.ndarray, total_points: float, raw_score_per_question: float):
+        """Derive totals and adjusted scores for every team."""
+        num_questions = raw_scores.shape[1]
+        self.total_points = total_points
+        self.raw_score_per_question = raw_score_per_question
+        max_possible_raw_total = num_questions * raw_score_per_question
+        self.total_factor = total_points / max_possible_raw_total if max_possible_raw_total else float('nan')
+        self.question_factor = total_points / num_questions / raw_score_per_question if num_questions else float('nan')
+        self.team_raw_totals = raw_scores.sum(axis=1)
+        self.team_adjusted_totals = self.team_raw_totals * self.total_factor
+        self.adjusted_scores = raw_scores * self.question_factor
+
+    def update(self, raw_scores: np.ndarray, team_pos: int, question_pos: int, old_score: float) -> None:
+        """Refresh one team's aggregates after ``raw_scores[team_pos, question_pos]`` changed."""
+        new_score = raw_scores[team_pos, question_pos]
+        if np.isnan(old_score) or np.isnan(new_score):
+            # A delta cannot move a total into or out of NaN; re-add the team's row instead.
+            self.team_raw_totals[team_pos] = raw_scores[team_pos].sum()
+        else:
+            self.team_raw_totals[team_pos] += new_score - old_score
+        self.team_adjusted_totals[team_pos] = self.team_raw_totals[team_pos] * self.total_factor
+        self.adjusted_scores[team_pos, question_pos] = new_score * self.question_factor
+
+    def to_result(self, question_numbers: List[int], team_names: np.ndarray, raw_scores: np.ndarray,
+                  students: pd.DataFrame, student_team_index: np.ndarray,
+                  dtype: Optional[np.dtype] = None) -> ScoringResult:
+        """Snapshot the current aggregates into a scoring result.
+
+        ``dtype`` (e.g. ``np.float32``) sets the precision of the copied score
+        and total arrays; by default they keep the aggregates' float64.
+        """
+        dtype = np.float64 if dtype is None else dtype
+        return ScoringResult(
+            question_numbers=list(question_numbers),
+            team_names=team_names,
+            raw_scores=raw_scores.astype(dtype),
+            team_raw_totals=self.team_raw_totals.astype(dtype),
+            team_adjusted_totals=self.team_adjusted_totals.astype(dtype),
+            adjusted_scores=self.adjusted_scores.astype(dtype),
+            students=students,
+            student_team_index=student_team_index,
+            total_points=self.total_points,
+            raw_score_per_question=self.raw_score_per_question
+        )
+
+
+class QuestionStatistics:
+    """Per-question item analysis across teams, kept current edit by edit.
+
+    Holds running sums per question (count, sum, sum of squares, full and
+    zero marks, a score histogram and the sums needed to correlate each
+    question with the team raw total) plus each team's total. Building it
+    is one pass over the score matrix; :meth:`update` removes and re-adds
+    only the edited team's row. Missing (NaN) scores are left out.
+    """
+
+    def __init__(self, raw_scores: np.ndarray, raw_score_per_question: float,
+                 num_bins: int = DISTRIBUTION_BINS):
+        """Accumulate the statistics of every question over all teams."""
+        self.max_score = raw_score_per_question
+        self.num_bins = num_bins
+        present = ~np.isnan(raw_scores)
+        scores = np.where(present, raw_scores, 0.0)
+        self.team_totals = scores.sum(axis=1)
+        totals = self.team_totals[:, None] * present
+        self.count = present.sum(axis=0)
+        self.sum = scores.sum(axis=0)
+        self.sum_sq = (scores * scores).sum(axis=0)
+        self.full_marks = (raw_scores >= raw_score_per_question).sum(axis=0)
+        self.zeros = (present & (scores <= 0)).sum(axis=0)
+        self.total_sum = totals.sum(axis=0)
+        self.total_sum_sq = (totals * totals).sum(axis=0)
+        self.cross_sum = (scores * totals).sum(axis=0)
+
+        num_questions = raw_scores.shape[1]
+        width = num_bins + 1
+        flat_bins = (self._bins(scores) + np.arange(num_questions) * width)[present]
+        self.histogram = np.bincount(flat_bins, minlength=num_questions * width).reshape(num_questions, width)
+
+    def _bins(self, scores: np.ndarray) -> np.ndarray:
+        """Map scores to ``num_bins`` equal-width bins over [0, max) plus a last bin for full marks."""
+        if self.max_score <= 0:
+            return np.full(scores.shape, self.num_bins, dtype=np.int64)
+        return np.clip((scores / self.max_score * self.num_bins).astype(np.int64), 0, self.num_bins)
+
+    def _add_team_row(self, row: np.ndarray, total: float, sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) one team's scores from the sums."""
+        present = ~np.isnan(row)
+        scores = np.where(present, row, 0.0)
+        totals = total * present
+        self.count += sign * present
+        self.sum += sign * scores
+        self.sum_sq += sign * scores * scores
+        self.full_marks += sign * (row >= self.max_score)
+        self.zeros += sign * (present & (scores <= 0))
+        self.total_sum += sign * totals
+        self.total_sum_sq += sign * totals * totals
+        self.cross_sum += sign * scores * totals
+        questions = np.flatnonzero(present)
+        self.histogram[questions, self._bins(scores[questions])] += sign
+
+    def update(self, raw_scores: np.ndarray, team_pos: int, question_pos: int, old_score: float) -> None:
+        """Refresh the statistics after ``raw_scores[team_pos, question_pos]`` changed."""
+        old_row = raw_scores[team_pos].copy()
+        old_row[question_pos] = old_score
+        self._add_team_row(old_row, self.team_totals[team_pos], -1)
+        self.team_totals[team_pos] = np.nansum(raw_scores[team_pos])
+        self._add_team_row(raw_scores[team_pos], self.team_totals[team_pos], 1)
+
+    def mean(self) -> np.ndarray:
+        """Mean score of each question; NaN when no team has a score."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sum / self.count
+
+    def std(self) -> np.ndarray:
+        """Population standard deviation of each question's scores."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = self.sum_sq / self.count - self.mean() ** 2
+        return np.sqrt(np.clip(variance, 0, None))
+
+    def discrimination(self) -> np.ndarray:
+        """Correlation of each question's score with the team raw total.
+
+        Low or negative values mark questions that strong and weak teams
+        answer alike. NaN when either side has no spread.
+        """
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = n * self.cross_sum - self.sum * self.total_sum
+            spread = (n * self.sum_sq - self.sum ** 2) * (n * self.total_sum_sq - self.total_sum ** 2)
+            return np.where(spread > 0, covariance / np.sqrt(np.clip(spread, 0, None)), np.nan)
+
+    def to_frame(self, question_numbers: List[int]) -> pd.DataFrame:
+        """Summarize each question in one row, with flags for likely problem questions."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_percent = self.mean() / self.max_score * 100 if self.max_score else np.full(len(self.count), np.nan)
+            full_percent = self.full_marks / self.count * 100
+            zero_percent = self.zeros / self.count * 100
+        discrimination = self.discrimination()
+        flags = [
+            ', '.join(flag for flag, hit in (
+                ('Too hard', mean < HARD_MEAN_PERCENT),
+                ('Too easy', full >= EASY_FULL_MARKS_PERCENT),
+                ('Low discrimination', disc < LOW_DISCRIMINATION)) if hit)
+            for mean, full, disc in zip(mean_percent.tolist(), full_percent.tolist(), discrimination.tolist())
+        ]
+        return pd.DataFrame({
+            'Question': [f'Q{q_num}' for q_num in question_numbers],
+            'Teams': self.count,
+            'Mean': self.mean(),
+            'Std Dev': self.std(),
+            'Mean %': mean_percent,
+            'Full Marks %': full_percent,
+            'Zero %': zero_percent,
+            'Discrimination': discrimination,
+            'Flags': flags
+        })
+
+    def distribution_frame(self, question_numbers: List[int]) -> pd.DataFrame:
+        """Team counts per score bin, one row per question and one column per bin.
+
+        Bins are half-open, so '4.5-5' holds scores from 4.5 up to but not
+        including 5; full marks have their own last column.
+        """
+        edges = np.linspace(0, self.max_score, self.num_bins + 1)
+        labels = [f'{low:g}-{high:g}' for low, high in zip(edges[:-1], edges[1:])] + [f'Full ({self.max_score:g})']
+        return pd.DataFrame(self.histogram, index=[f'Q{q_num}' for q_num in question_numbers], columns=labels)
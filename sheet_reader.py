@@ -0,0 +1,299 @@
+"""Column-selective reader for quiz workbook sheets.
+
+Only the team, student and ``N_Score`` columns are kept; the header row is
+scanned first so score columns can be built with an explicit float dtype.
+python-calamine is used through pandas when installed. Otherwise rows are
+taken straight from openpyxl's read-only iterator, skipping pandas' per-cell
+conversion of columns that are thrown away. CSV and Parquet quiz tables
+are read with the same column selection, whole or in chunks.
+:func:`apply_load_schema` then gives the loaded frame compact dtypes. pandas
+and openpyxl are imported on first use.
+"""
+from __future__ import annotations
+import fnmatch
+import re
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Iterator, List, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+READER_ENGINES = ('auto', 'calamine', 'openpyxl')
+TABLE_SUFFIXES = ('.csv', '.parquet')
+ID_COLUMNS = ['Team', 'Student ID', 'Student Name', 'Email Address']
+SCORE_COLUMN_PATTERN = re.compile(r'(\d+)_score', re.IGNORECASE)
+TEXT_COLUMNS = ['Student ID', 'Student Name', 'Email Address']
+# Tried in order; a score dtype is used only when every score survives the round trip.
+COMPACT_SCORE_DTYPES = ('float32',)
+# Recorded in sidecar manifests; change it whenever the selection rules change.
+COLUMN_SELECTION = 'team-student-score/v1'
+
+ExcelSource = Union[Path, str, IO[bytes]]
+
+
+def calamine_available() -> bool:
+    """Check whether python-calamine is importable."""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_engine(engine: str = 'auto') -> str:
+    """Get the pandas engine to use for a requested reader engine.
+
+    ``auto`` and ``calamine`` both fall back to openpyxl when python-calamine
+    is not installed.
+    """
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Unknown reader engine '{engine}'. Choose from {READER_ENGINES}.")
+    if engine in ('auto', 'calamine') and calamine_available():
+        return 'calamine'
+    return 'openpyxl'
+
+
+def score_question_number(column: object) -> int | None:
+    """Get the question number of a score column name, or None for other columns."""
+    match = SCORE_COLUMN_PATTERN.match(str(column))
+    return int(match.group(1)) if match else None
+
+
+def select_columns(header: List[object]) -> List[object]:
+    """Pick the columns processing needs from a sheet header, in sheet order."""
+    return [col for col in header if col in ID_COLUMNS or score_question_number(col) is not None]
+
+
+def _column_dtypes(columns: List[object]) -> Dict[object, str]:
+    """Get the explicit dtypes of the selected columns."""
+    return {col: 'float64' for col in columns if score_question_number(col) is not None}
+
+
+def is_table_file(source: ExcelSource) -> bool:
+    """Check whether a source is a CSV or Parquet quiz table rather than a workbook."""
+    return isinstance(source, (str, Path)) and Path(source).suffix.lower() in TABLE_SUFFIXES
+
+
+def _require_pyarrow() -> None:
+    """Raise ValueError when pyarrow, needed for Parquet input, is missing."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ValueError("Parquet input requires pyarrow (pip install pyarrow)") from None
+
+
+def table_columns(source: Union[Path, str]) -> List[object]:
+    """Get the columns of a CSV or Parquet quiz table that processing needs."""
+    if Path(source).suffix.lower() == '.parquet':
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return select_columns(pq.read_schema(source).names)
+
+    import pandas as pd
+    return select_columns(list(pd.read_csv(source, nrows=0).columns))
+
+
+def iter_quiz_table(source: Union[Path, str], chunk_rows: int,
+                    columns: Union[List[object], None] = None) -> Iterator[pd.DataFrame]:
+    """Yield a CSV or Parquet quiz table in chunks of at most ``chunk_rows`` rows.
+
+    Only ``columns`` (by default the required columns) are read. Scores are
+    read as float64 and CSV team names as strings.
+    """
+    columns = table_columns(source) if columns is None else columns
+    if Path(source).suffix.lower() == '.parquet':
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        dtypes = _column_dtypes(columns)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas().astype(dtypes)
+        return
+
+    import pandas as pd
+
+    dtypes = {**_column_dtypes(columns), 'Team': str}
+    with pd.read_csv(source, usecols=columns, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk if list(chunk.columns) == columns else chunk[columns]
+
+
+def read_quiz_table(source: Union[Path, str]) -> pd.DataFrame:
+    """Read the required columns of a whole CSV or Parquet quiz table."""
+    import pandas as pd
+
+    columns = table_columns(source)
+    if Path(source).suffix.lower() == '.parquet':
+        return pd.read_parquet(source, columns=columns).astype(_column_dtypes(columns))
+    return pd.read_csv(source, usecols=columns, dtype={**_column_dtypes(columns), 'Team': str})[columns]
+
+
+def _worksheet_frame(worksheet) -> pd.DataFrame:
+    """Build a frame of the selected columns from an openpyxl read-only worksheet."""
+    import numpy as np
+    import pandas as pd
+
+    rows = worksheet.iter_rows(values_only=True)
+    header = list(next(rows, ()))
+    columns = list(dict.fromkeys(select_columns(header)))
+    positions = [header.index(col) for col in columns]
+    values: List[List[object]] = [[] for _ in columns]
+    for row in rows:
+        cells = [row[i] if i < len(row) else None for i in positions]
+        if all(cell is None for cell in cells):
+            continue
+        for column_values, cell in zip(values, cells):
+            column_values.append(cell)
+
+    dtypes = _column_dtypes(columns)
+    return pd.DataFrame({
+        col: np.array(column_values, dtype=dtypes[col]) if col in dtypes else column_values
+        for col, column_values in zip(columns, values)
+    })
+
+
+def _match_sheets(names: List[str], pattern: str) -> List[str]:
+    """Get the sheet names that match a glob pattern, in workbook order."""
+    return [name for name in names if fnmatch.fnmatchcase(name, pattern)]
+
+
+def _read_with_openpyxl(source: ExcelSource, sheet_names: Union[List[str], None],
+                        pattern: str = '*') -> Dict[str, pd.DataFrame]:
+    """Read the selected columns of several sheets from one openpyxl read-only workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet_names is None:
+            sheet_names = _match_sheets(workbook.sheetnames, pattern)
+        missing = [name for name in sheet_names if name not in workbook.sheetnames]
+        if missing:
+            raise ValueError(f"Worksheet named '{missing[0]}' not found")
+        return {name: _worksheet_frame(workbook[name]) for name in sheet_names}
+    finally:
+        workbook.close()
+
+
+def list_sheets(source: ExcelSource, pattern: str = '*') -> List[str]:
+    """Get the workbook's sheet names that match a glob pattern, in workbook order."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True)
+    try:
+        return _match_sheets(workbook.sheetnames, pattern)
+    finally:
+        workbook.close()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+
+
+def read_quiz_sheets(source: ExcelSource, sheet_names: Union[List[str], None],
+                     engine: str = 'auto', pattern: str = '*') -> Dict[str, pd.DataFrame]:
+    """Read several quiz sheets with the workbook opened and parsed once.
+
+    Each frame keeps only the required columns, as in :func:`read_quiz_sheet`.
+    With ``sheet_names`` None, every sheet matching ``pattern`` is read; the
+    names are listed from the same open workbook.
+    """
+    import pandas as pd
+
+    if resolve_engine(engine) == 'openpyxl':
+        return _read_with_openpyxl(source, sheet_names, pattern)
+    try:
+        with pd.ExcelFile(source, engine='calamine') as workbook:
+            names = _match_sheets(workbook.sheet_names, pattern) if sheet_names is None else sheet_names
+            frames = {}
+            for name in names:
+                columns = select_columns(list(workbook.parse(name, nrows=0).columns))
+                frames[name] = workbook.parse(name, usecols=columns, dtype=_column_dtypes(columns))
+            return frames
+    except Exception:
+        # openpyxl reads some files calamine rejects; its errors are the ones reported.
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return _read_with_openpyxl(source, sheet_names, pattern)
+
+
+def read_quiz_sheet(source: ExcelSource, sheet_name: str, engine: str = 'auto',
+                    all_columns: bool = False) -> pd.DataFrame:
+    """Read a quiz sheet, keeping only the required columns.
+
+    Pass ``all_columns=True`` to read every column with pandas as before.
+    A calamine failure is retried with openpyxl. CSV and Parquet sources
+    have no sheets; ``sheet_name`` is ignored for them.
+    """
+    import pandas as pd
+
+    if is_table_file(source) and not all_columns:
+        return read_quiz_table(source)
+    if all_columns:
+        return pd.read_excel(source, sheet_name=sheet_name, engine=resolve_engine(engine))
+    return read_quiz_sheets(source, [sheet_name], engine)[sheet_name]
+
+
+def arrow_string_dtype():
+    """Get the Arrow-backed string dtype with NaN missing values, or None without pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    import numpy as np
+    import pandas as pd
+
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # pandas before 2.3 names the NaN-semantics Arrow storage separately.
+        return pd.StringDtype('pyarrow_numpy')
+
+
+def compact_score_dtype(scores, raw_score_per_question: float) -> str:
+    """Get the smallest float dtype that holds every score and the per-question maximum exactly."""
+    import numpy as np
+
+    values = np.asarray(scores, dtype=np.float64)
+    for dtype in COMPACT_SCORE_DTYPES:
+        if float(np.asarray(raw_score_per_question, dtype=dtype)) != raw_score_per_question:
+            continue
+        with np.errstate(over='ignore'):
+            differs = values.astype(dtype) != values
+        if not differs.any() or np.isnan(values[differs]).all():
+            return dtype
+    return 'float64'
+
+
+def apply_load_schema(df: pd.DataFrame, raw_score_per_question: float) -> pd.DataFrame:
+    """Give a loaded quiz sheet compact dtypes without changing any value.
+
+    ``Team`` becomes categorical and the score columns share the smallest
+    float dtype that keeps every score and ``raw_score_per_question`` exact
+    (float64 otherwise). Student names, emails and non-numeric Student IDs
+    become Arrow-backed strings when pyarrow is installed. Raises ValueError
+    for a score column with non-numeric values.
+    """
+    import pandas as pd
+    from pandas.api.types import is_numeric_dtype
+
+    columns = {}
+    score_columns = [col for col in df.columns if score_question_number(col) is not None]
+    if score_columns:
+        scores = df[score_columns]
+        if not all(is_numeric_dtype(dtype) for dtype in scores.dtypes):
+            scores = scores.apply(pd.to_numeric)
+        scores = scores.astype(compact_score_dtype(scores.to_numpy(dtype='float64'), raw_score_per_question))
+        columns.update(scores.items())
+    if 'Team' in df.columns and not isinstance(df['Team'].dtype, pd.CategoricalDtype):
+        columns['Team'] = df['Team'].astype('category')
+    string_dtype = arrow_string_dtype()
+    if string_dtype is not None:
+        for col in TEXT_COLUMNS:
+            if col in df.columns and not is_numeric_dtype(df[col]) and df[col].dtype != string_dtype:
+                columns[col] = df[col].astype(string_dtype)
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for col, values in columns.items():
+        df[col] = values
+    return df
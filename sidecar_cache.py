@@ -0,0 +1,128 @@
+"""Columnar sidecar cache for parsed quiz workbook sheets."""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+CACHE_DIR_NAME = '.quiz_cache'
+FORMAT_VERSION = 2
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash a file's content in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SidecarCache:
+    """Feather (Arrow IPC) copies of parsed sheets, validated against the source file.
+
+    Each cached sheet has a ``.feather`` file and a ``.json`` manifest recording
+    the source size, mtime and SHA-256. A size or mtime mismatch triggers a hash
+    check, so touching a file without changing it does not invalidate the cache.
+    The manifest also records which column selection the frame was read with,
+    so a frame holding a column subset is never served to a reader expecting
+    a different one.
+    The cache is disabled when pyarrow is not installed.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """Initialize the cache; defaults to a directory next to each source file."""
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether pyarrow is importable."""
+        try:
+            import pyarrow.feather  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _paths(self, source: Path, sheet_name: str) -> tuple[Path, Path]:
+        """Get the data and manifest paths for a source sheet."""
+        cache_dir = self.cache_dir or source.parent / CACHE_DIR_NAME
+        stem = f"{source.name}.{sheet_name}"
+        return cache_dir / f"{stem}.feather", cache_dir / f"{stem}.json"
+
+    @staticmethod
+    def _source_stat(source: Path) -> Dict[str, int]:
+        """Get the size and mtime used for quick validation."""
+        stat = source.stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def load(self, source: Path, sheet_name: str, selection: str = 'all') -> Optional[pd.DataFrame]:
+        """Return the cached sheet, or None when missing or stale."""
+        if not self.is_available():
+            return None
+        data_path, manifest_path = self._paths(source, sheet_name)
+        if not data_path.exists() or not manifest_path.exists():
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if (manifest.get('version') != FORMAT_VERSION or manifest.get('sheet') != sheet_name
+                or manifest.get('selection') != selection):
+            return None
+
+        stat = self._source_stat(source)
+        if stat != manifest.get('source'):
+            if file_sha256(source) != manifest.get('sha256'):
+                return None
+            manifest['source'] = stat
+            try:
+                manifest_path.write_text(json.dumps(manifest, indent=2))
+            except OSError:
+                # The cache is best-effort: on a read-only folder the hash is checked again next time.
+                pass
+
+        from pyarrow import feather
+        try:
+            table = feather.read_table(data_path, memory_map=True)
+        except (OSError, ValueError):
+            return None
+        return table.to_pandas()
+
+    def store(self, source: Path, sheet_name: str, df: pd.DataFrame, selection: str = 'all') -> bool:
+        """Write a sidecar for the sheet; returns False when the frame cannot be stored."""
+        if not self.is_available():
+            return False
+        from pyarrow import feather
+        data_path, manifest_path = self._paths(source, sheet_name)
+        manifest = {
+            'version': FORMAT_VERSION,
+            'sheet': sheet_name,
+            'selection': selection,
+            'source': self._source_stat(source),
+            'sha256': file_sha256(source),
+            'rows': len(df),
+            'columns': [str(col) for col in df.columns]
+        }
+        tmp_path = data_path.with_suffix('.feather.tmp')
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+            os.replace(tmp_path, data_path)
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+        except Exception:
+            # Mixed-type or non-string-named columns cannot be stored as Arrow;
+            # the workbook is simply parsed again next time.
+            tmp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def invalidate(self, source: Path, sheet_name: str) -> None:
+        """Remove the sidecar for a source sheet."""
+        for path in self._paths(source, sheet_name):
+            path.unlink(missing_ok=True)
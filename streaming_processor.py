@@ -0,0 +1,226 @@
+"""Out-of-core processing of CSV and Parquet quiz tables, team by team.
+
+The table is read in chunks and never held whole. A first pass reads only
+the Team column to count each team's rows and to check whether the rows
+are sorted by team. Sorted input is scored as its teams complete: the rows
+of the last team in a chunk are carried into the next chunk. Unsorted
+input is first partitioned to disk by ranges of team names, so each
+partition holds whole teams and partitions come out in team order. Each
+block of complete teams is scored with the same store and aggregates as
+:class:`quiz_processor.QuizProcessor` and streamed to the report writer,
+so peak memory follows the chunk and partition sizes, not the file size.
+"""
+from __future__ import annotations
+import itertools
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional
+from sheet_reader import TABLE_SUFFIXES, iter_quiz_table, score_question_number, table_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from scoring_engine import ScoringResult
+
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_PARTITION_ROWS = 200_000
+
+
+@dataclass
+class TeamScan:
+    """Row count per team, in team order, and whether the rows are sorted by team."""
+    team_rows: pd.Series
+    sorted_by_team: bool
+
+    @property
+    def num_students(self) -> int:
+        """Number of rows with a team."""
+        return int(self.team_rows.sum())
+
+
+@dataclass
+class StreamingSummary:
+    """What a streaming run processed and how."""
+    question_numbers: List[int] = field(default_factory=list)
+    num_teams: int = 0
+    num_students: int = 0
+    sorted_by_team: bool = True
+    partitions: int = 0
+
+    def describe(self) -> str:
+        """Describe the run in one line."""
+        parts = f"{self.partitions} partition{'' if self.partitions == 1 else 's'}"
+        mode = "sorted input, streamed" if self.sorted_by_team else f"unsorted input, {parts} spilled to disk"
+        return (f"Processed {self.num_teams} teams, {self.num_students} students and "
+                f"{len(self.question_numbers)} questions ({mode})")
+
+
+class StreamingQuizProcessor:
+    """Score a CSV or Parquet quiz table in chunks and stream the report.
+
+    Score edits are not supported; load the table with QuizProcessor to
+    edit scores.
+    """
+
+    def __init__(self, input_file: Path, total_points: float, raw_score_per_question: float,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS, partition_rows: int = DEFAULT_PARTITION_ROWS,
+                 spill_dir: Optional[Path] = None):
+        """Read the table's header; raises ValueError for other inputs or a table without a Team column."""
+        if Path(input_file).suffix.lower() not in TABLE_SUFFIXES:
+            raise ValueError(f"Streaming needs a CSV or Parquet input, not '{Path(input_file).name}'")
+        self.input_file = Path(input_file)
+        self.total_points = total_points
+        self.raw_score_per_question = raw_score_per_question
+        self.chunk_rows = chunk_rows
+        self.partition_rows = partition_rows
+        self.spill_dir = spill_dir
+        self.columns = table_columns(self.input_file)
+        if 'Team' not in self.columns:
+            raise ValueError(f"{self.input_file.name} has no 'Team' column")
+        self.score_columns = {score_question_number(col): col for col in self.columns
+                              if score_question_number(col) is not None}
+        self.question_numbers = sorted(self.score_columns)
+
+    def _chunks(self, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yield the table in chunks, dropping rows without a team."""
+        for chunk in iter_quiz_table(self.input_file, self.chunk_rows, columns or self.columns):
+            has_team = chunk['Team'].notna()
+            yield chunk if has_team.all() else chunk[has_team]
+
+    def scan(self) -> TeamScan:
+        """Count each team's rows and check the row order, reading only the Team column."""
+        import pandas as pd
+
+        team_rows = pd.Series(dtype='int64')
+        sorted_by_team = True
+        last_team = None
+        for chunk in self._chunks(['Team']):
+            teams = chunk['Team']
+            if not len(teams):
+                continue
+            if sorted_by_team:
+                sorted_by_team = teams.is_monotonic_increasing and (last_team is None or teams.iloc[0] >= last_team)
+                last_team = teams.iloc[-1]
+            team_rows = team_rows.add(teams.value_counts(), fill_value=0)
+        return TeamScan(team_rows.sort_index().astype('int64'), sorted_by_team)
+
+    def _sorted_blocks(self) -> Iterator[pd.DataFrame]:
+        """Yield blocks of complete teams from input sorted by team.
+
+        The rows of a chunk's last team are carried, as a copy, into the
+        next chunk; the rest of each chunk is yielded without copying it.
+        """
+        import numpy as np
+        import pandas as pd
+
+        carry = None
+        for chunk in self._chunks():
+            if not len(chunk):
+                continue
+            teams = chunk['Team'].to_numpy()
+            team_starts = np.flatnonzero(teams[1:] != teams[:-1]) + 1
+            first_end = int(team_starts[0]) if len(team_starts) else len(teams)
+            last_start = int(team_starts[-1]) if len(team_starts) else 0
+            start = 0
+            if carry is not None and teams[0] == carry['Team'].iloc[0]:
+                carry = pd.concat([carry, chunk.iloc[:first_end]], ignore_index=True)
+                if first_end == len(teams):
+                    continue
+                start = first_end
+            if carry is not None:
+                yield carry
+            if last_start > start:
+                yield chunk.iloc[start:last_start]
+            carry = chunk.iloc[max(start, last_start):].copy()
+        if carry is not None:
+            yield carry
+
+    def _partition_of_team(self, scan: TeamScan) -> pd.Series:
+        """Assign consecutive ranges of teams to partitions of about ``partition_rows`` rows."""
+        import numpy as np
+        import pandas as pd
+
+        rows_before = scan.team_rows.cumsum().to_numpy() - scan.team_rows.to_numpy()
+        _, partitions = np.unique(rows_before // max(1, self.partition_rows), return_inverse=True)
+        return pd.Series(partitions, index=scan.team_rows.index)
+
+    def _partitioned_blocks(self, scan: TeamScan, summary: StreamingSummary) -> Iterator[pd.DataFrame]:
+        """Spill rows to one file per team range, then yield each partition in team order."""
+        import pandas as pd
+
+        partition_of_team = self._partition_of_team(scan)
+        summary.partitions = int(partition_of_team.max()) + 1 if len(partition_of_team) else 0
+        with tempfile.TemporaryDirectory(prefix='quiz-spill-', dir=self.spill_dir) as spill_dir:
+            paths = [Path(spill_dir) / f"partition_{i:05d}.pkl" for i in range(summary.partitions)]
+            files = {}
+            try:
+                for chunk in self._chunks():
+                    for partition, rows in chunk.groupby(chunk['Team'].map(partition_of_team).to_numpy()):
+                        if partition not in files:
+                            files[partition] = open(paths[partition], 'wb')
+                        pickle.dump(rows, files[partition], protocol=pickle.HIGHEST_PROTOCOL)
+            finally:
+                for f in files.values():
+                    f.close()
+
+            for path in paths:
+                if not path.exists():
+                    continue
+                parts = []
+                with open(path, 'rb') as f:
+                    while True:
+                        try:
+                            parts.append(pickle.load(f))
+                        except EOFError:
+                            break
+                path.unlink()
+                yield pd.concat(parts, ignore_index=True)
+
+    def _score_block(self, block: pd.DataFrame) -> ScoringResult:
+        """Score a block of complete teams."""
+        from scoring_engine import ScoreAggregates
+        from team_store import TeamScoreStore
+
+        store = TeamScoreStore(block, self.score_columns)
+        aggregates = ScoreAggregates(store.scores, self.total_points, self.raw_score_per_question)
+        return aggregates.to_result(self.question_numbers, store.team_names, store.scores,
+                                    store.students, store.student_team_index)
+
+    def iter_results(self, summary: Optional[StreamingSummary] = None) -> Iterator[ScoringResult]:
+        """Yield a scoring result per block of complete teams, in team order.
+
+        ``summary``, when given, is filled in as the blocks are scored.
+        """
+        summary = summary if summary is not None else StreamingSummary()
+        summary.question_numbers = self.question_numbers
+        scan = self.scan()
+        summary.sorted_by_team = scan.sorted_by_team
+        blocks = self._sorted_blocks() if scan.sorted_by_team else self._partitioned_blocks(scan, summary)
+        for block in blocks:
+            result = self._score_block(block)
+            summary.num_teams += result.num_teams
+            summary.num_students += result.num_students
+            yield result
+
+    def write(self, output_file: Path, fmt: Optional[str] = None) -> StreamingSummary:
+        """Score the table and stream the report to ``output_file`` as xlsx, csv, parquet or jsonl."""
+        from report_formats import (CHUNKED_WRITERS, REPORT_FORMATS, format_for_path, iter_report_chunks,
+                                    write_report_manifest)
+
+        fmt = fmt or format_for_path(output_file)
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}'. Choose from {REPORT_FORMATS}.")
+        summary = StreamingSummary()
+        results = self.iter_results(summary)
+        if fmt == 'xlsx':
+            from report_writer import StreamingExcelWriter, iter_result_rows
+
+            rows = itertools.chain.from_iterable(iter_result_rows(result) for result in results)
+            StreamingExcelWriter(self.question_numbers, {}).write(rows, output_file)
+        else:
+            chunks = itertools.chain.from_iterable(iter_report_chunks(result, {}) for result in results)
+            CHUNKED_WRITERS[fmt]().write(chunks, output_file)
+            write_report_manifest(output_file, self.total_points, self.raw_score_per_question)
+        return summary
@@ -0,0 +1,96 @@
+"""Indexed store of team scores for quiz data."""
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from scoring_engine import STUDENT_COLUMNS
+
+
+class TeamScoreStore:
+    """Team index plus a team-by-question score matrix.
+
+    Teams are sorted by name and each team's scores are taken from its first
+    student row, as in the original sheet. The matrix is the source of truth
+    for scores once the store is built; edits do not touch the loaded frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, score_columns: Dict[int, str]):
+        """Build the team index and score matrix from a loaded sheet."""
+        self.question_numbers: List[int] = sorted(score_columns)
+        self.question_positions = {q_num: j for j, q_num in enumerate(self.question_numbers)}
+
+        teams = df['Team']
+        valid = teams.notna().to_numpy()
+        codes, team_names = pd.factorize(teams[valid], sort=True)
+        order = np.argsort(codes, kind='stable')
+
+        self.team_names = np.asarray(team_names, dtype=object)
+        self.teams: List[Any] = self.team_names.tolist()
+        self.team_positions = {team: i for i, team in enumerate(self.teams)}
+        self.student_rows = np.flatnonzero(valid)[order]
+        self.student_team_index = codes[order]
+
+        bounds = np.searchsorted(self.student_team_index, np.arange(len(self.teams) + 1))
+        self._team_bounds = bounds
+        self.students = df[STUDENT_COLUMNS].iloc[self.student_rows].reset_index(drop=True)
+
+        columns = [score_columns[q_num] for q_num in self.question_numbers]
+        first_rows = self.student_rows[bounds[:-1]]
+        self.scores = df[columns].iloc[first_rows].to_numpy(dtype=np.float64, copy=True)
+
+    def __contains__(self, team_name: Any) -> bool:
+        """Check whether a team exists in the store."""
+        return team_name in self.team_positions
+
+    def team_rows(self, team_name: Any) -> np.ndarray:
+        """Get the positional row indices of a team's students in the loaded frame."""
+        i = self.team_positions[team_name]
+        return self.student_rows[self._team_bounds[i]:self._team_bounds[i + 1]]
+
+    def get_scores(self, team_name: Any) -> Dict[int, float]:
+        """Get a team's scores keyed by question number."""
+        return dict(zip(self.question_numbers, self.scores[self.team_positions[team_name]].tolist()))
+
+    def get_score(self, team_name: Any, question_number: int) -> float:
+        """Get a team's score for one question."""
+        return float(self.scores[self.team_positions[team_name], self.question_positions[question_number]])
+
+    def set_score(self, team_name: Any, question_number: int, value: float) -> Tuple[int, int, float]:
+        """Set a team's score for one question.
+
+        Returns the team and question positions and the previous score.
+        """
+        team_pos = self.team_positions[team_name]
+        question_pos = self.question_positions[question_number]
+        old_score = float(self.scores[team_pos, question_pos])
+        self.scores[team_pos, question_pos] = value
+        return team_pos, question_pos, old_score
+
+    def positions(self, team_names: Sequence[Any], question_numbers: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Map team names and question numbers to matrix positions.
+
+        Raises KeyError naming the first unknown team or question.
+        """
+        team_pos = pd.Index(self.teams).get_indexer(pd.Index(team_names, dtype=object))
+        question_pos = pd.Index(self.question_numbers).get_indexer(np.asarray(question_numbers, dtype=np.int64))
+        if (team_pos < 0).any():
+            raise KeyError(f"Unknown team '{team_names[int(np.flatnonzero(team_pos < 0)[0])]}'")
+        if (question_pos < 0).any():
+            raise KeyError(f"Unknown question {question_numbers[int(np.flatnonzero(question_pos < 0)[0])]}")
+        return team_pos, question_pos
+
+    def set_scores(self, team_names: Sequence[Any], question_numbers: Sequence[int],
+                   values: Sequence[float]) -> None:
+        """Set many scores in one assignment; later entries win for repeated cells."""
+        team_pos, question_pos = self.positions(team_names, question_numbers)
+        values = np.asarray(values, dtype=np.float64)
+        cells = team_pos * len(self.question_numbers) + question_pos
+        _, last_from_end = np.unique(cells[::-1], return_index=True)
+        keep = len(cells) - 1 - last_from_end
+        self.scores[team_pos[keep], question_pos[keep]] = values[keep]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the score matrix as a frame with one row per team."""
+        frame = pd.DataFrame(self.scores, columns=[f"Q{q_num}" for q_num in self.question_numbers])
+        frame.insert(0, 'Team', self.teams)
+        return frame
@@ -0,0 +1,5 @@
+"""Shared pytest setup: make the project modules importable from the tests."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
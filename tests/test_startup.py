@@ -0,0 +1,25 @@
+"""Startup checks: the CLI must start quickly and without Streamlit, and modules import within budget."""
+import sys
+import pytest
+from benchmarks.bench_startup import (CLI_HELP_BUDGET_SECONDS, IMPORT_BUDGETS_MS, LIGHT_MODULES, best_wall_time,
+                                      heavy_modules_loaded, import_time_ms, streamlit_imported_by_cli)
+
+
+def test_ShouldPrintHelpWithinBudgetGivenCliHelpCommand() -> None:
+    elapsed = best_wall_time([sys.executable, '-m', 'cli', '--help'])
+    assert elapsed <= CLI_HELP_BUDGET_SECONDS, f"cli --help took {elapsed:.3f}s"
+
+
+def test_ShouldNotImportStreamlitGivenCliParserBuilt() -> None:
+    assert not streamlit_imported_by_cli()
+
+
+@pytest.mark.parametrize('module', list(IMPORT_BUDGETS_MS))
+def test_ShouldImportWithinBudgetGivenPublicModule(module: str) -> None:
+    elapsed = import_time_ms(module)
+    assert elapsed <= IMPORT_BUDGETS_MS[module], f"importing {module} took {elapsed:.1f}ms"
+
+
+@pytest.mark.parametrize('module', LIGHT_MODULES)
+def test_ShouldNotLoadHeavyDependenciesGivenLightModule(module: str) -> None:
+    assert heavy_modules_loaded(module) == []
@@ -0,0 +1,33 @@
+"""Checks of the combined multi-sheet report."""
+from pathlib import Path
+import pandas as pd
+from workbook_processor import WorkbookProcessor
+
+
+def quiz_sheet(student_ids: list) -> pd.DataFrame:
+    """Build a two-student quiz sheet with the given Student IDs."""
+    return pd.DataFrame({
+        'Team': ['A', 'B'],
+        'Student ID': student_ids,
+        'Student Name': ['Ann', 'Ben'],
+        'Email Address': ['ann@example.com', 'ben@example.com'],
+        '1_Score': [5, 3],
+        '2_Score': [1, 2]
+    })
+
+
+def test_ShouldMatchStudentsAcrossSheetsGivenNumericAndTextStudentIds(tmp_path: Path) -> None:
+    workbook = tmp_path / 'quizzes.xlsx'
+    with pd.ExcelWriter(workbook) as writer:
+        quiz_sheet([101, 102]).to_excel(writer, sheet_name='Quiz 1', index=False)
+        quiz_sheet([101, 'S102']).to_excel(writer, sheet_name='Quiz 2', index=False)
+
+    processor = WorkbookProcessor(workbook, 10.0, 5.0)
+    summary = processor.summary_frame().set_index('Student ID')
+
+    assert sorted(summary.index) == ['101', '102', 'S102']
+    assert summary.loc['101', 'Total Adjusted'] == summary.loc['101', 'Quiz 1 Adjusted Total'] * 2
+    assert pd.isna(summary.loc['S102', 'Quiz 1 Adjusted Total'])
+
+    processor.save_combined_report(tmp_path / 'combined.xlsx')
+    assert (tmp_path / 'combined.xlsx').exists()
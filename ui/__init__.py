@@ -1,10 +1,20 @@
-"""User interface package for quiz processing."""
-from .file_handler import FileHandler
-from .menu_handler import MenuHandler
-from .quiz_input_handler import QuizInputHandler
-from .score_editor import ScoreEditor
-from .score_change import ScoreChange
-from .input_validator import get_validated_input, validate_positive_float
+"""User interface package for quiz processing.
+
+Submodules are imported on first attribute access, so ``from ui import
+ScoreChange`` only loads the module that defines it.
+"""
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    'FileHandler': '.file_handler',
+    'MenuHandler': '.menu_handler',
+    'QuizInputHandler': '.quiz_input_handler',
+    'ScoreEditor': '.score_editor',
+    'ScoreChange': '.score_change',
+    'get_validated_input': '.input_validator',
+    'validate_positive_float': '.input_validator'
+}
 
 __all__ = [
     'FileHandler',
@@ -14,4 +24,18 @@ __all__ = [
     'ScoreChange',
     'get_validated_input',
     'validate_positive_float'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List the package's public names."""
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
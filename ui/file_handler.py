@@ -1,6 +1,6 @@
 """Module for handling file operations."""
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 
 class FileHandler:
@@ -22,6 +22,14 @@ class FileHandler:
         
         return max(input_files, key=lambda x: x.stat().st_mtime)
 
+    @staticmethod
+    def get_input_files(input_dir: Path = Path('inputdata')) -> List[Path]:
+        """Get every Excel file under a directory, skipping Office lock files."""
+        return sorted(
+            path for path in input_dir.rglob('*.xlsx')
+            if not path.name.startswith('~$')
+        )
+
     @staticmethod
     def get_output_file(quiz_name: str) -> Path:
         """Generate output file path and ensure output directory exists."""
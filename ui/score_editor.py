@@ -1,6 +1,5 @@
 """Module for handling score editing operations."""
 from typing import List, Tuple, Optional
-import pandas as pd
 from .input_validator import get_validated_input
 from .menu_handler import MenuHandler
 from .score_change import ScoreChange
@@ -9,10 +8,11 @@ from .score_change import ScoreChange
 class ScoreEditor:
     """Class for handling score editing operations."""
 
-    def __init__(self, processor):
-        """Initialize score editor with quiz processor."""
+    def __init__(self, processor, journal=None):
+        """Initialize score editor with quiz processor and an optional ScoreJournal for autosave."""
         self.processor = processor
-        self.teams = sorted(processor.df['Team'].unique())
+        self.journal = journal
+        self.teams = processor.teams
         self.score_changes = []
 
     def get_question_number(self) -> Optional[int]:
@@ -64,8 +64,9 @@ class ScoreEditor:
 
     def update_team_score(self, change: ScoreChange) -> None:
         """Update a team's score and record the change."""
-        score_col = f"{change.question_number}_Score"
-        self.processor.df.loc[self.processor.df['Team'] == change.team_name, score_col] = change.new_score
+        self.processor.set_team_score(change.team_name, change.question_number, change.new_score)
+        if self.journal is not None:
+            self.journal.append(change)
         print(f"\nUpdated score for team '{change.team_name}', question {change.question_number} "
               f"from {change.old_score:.1f} to {change.new_score:.1f}")
 
@@ -79,8 +80,7 @@ class ScoreEditor:
         if q_num is None:
             return False
             
-        score_col = f"{q_num}_Score"
-        old_score = float(self.processor.df.loc[self.processor.df['Team'] == team_name, score_col].iloc[0])
+        old_score = self.processor.get_team_score(team_name, q_num)
         new_score = self.get_new_score(self.processor.raw_score_per_question, old_score)
         
         if new_score is not None:
@@ -92,17 +92,14 @@ class ScoreEditor:
 
     def display_team_scores(self, team_name: str) -> None:
         """Display all scores for a specific team."""
-        team_data = self.processor.df[self.processor.df['Team'] == team_name]
-        if team_data.empty:
+        if not self.processor.has_team(team_name):
             print(f"\nNo data found for team {team_name}")
             return
             
         print(f"\nScores for team {team_name}:")
         print("-" * 40)
         
-        for q_num in self.processor.question_numbers:
-            score_col = f"{q_num}_Score"
-            score = float(team_data[score_col].iloc[0])
+        for q_num, score in self.processor.get_team_scores(team_name).items():
             print(f"Question {q_num}: {score:.1f}/{self.processor.raw_score_per_question:.1f}")
         print("-" * 40)
 
@@ -0,0 +1,129 @@
+"""Bounded background executor for report exports in the web app.
+
+Jobs run on a thread pool shared by every session, so one long export does
+not block the script thread and concurrent users do not queue behind each
+other's reruns. The module does not import Streamlit; the app polls each
+job's status and progress.
+"""
+from __future__ import annotations
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 8
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many jobs are already queued or running."""
+
+
+@dataclass
+class ExportJob:
+    """One submitted export and its progress."""
+    job_id: int
+    label: str
+    file_name: str
+    total_rows: int
+    rows_done: int = 0
+    submitted: float = field(default_factory=time.perf_counter)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    future: Optional[Future] = None
+
+    @property
+    def status(self) -> str:
+        """Get 'queued', 'running', 'done' or 'failed'."""
+        if self.future is None or self.started is None:
+            return 'queued'
+        if not self.future.done():
+            return 'running'
+        return 'failed' if self.future.exception() is not None else 'done'
+
+    @property
+    def progress(self) -> float:
+        """Get the fraction of rows written, between 0 and 1."""
+        if self.finished is not None:
+            return 1.0
+        return min(1.0, self.rows_done / self.total_rows) if self.total_rows else 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Get the seconds spent running, so far or in total."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def error(self) -> Optional[str]:
+        """Get the failure message of a failed job."""
+        if self.status != 'failed':
+            return None
+        exc = self.future.exception()
+        return f"{type(exc).__name__}: {exc}"
+
+    def result(self) -> bytes:
+        """Get the finished export's content."""
+        return self.future.result()
+
+    def track(self, rows: Iterable[T]) -> Iterator[T]:
+        """Pass rows through while counting them for :attr:`progress`."""
+        for self.rows_done, row in enumerate(rows, 1):
+            yield row
+
+    def track_chunks(self, chunks: Iterable[T]) -> Iterator[T]:
+        """Pass row chunks (anything with a length) through while counting their rows."""
+        for chunk in chunks:
+            yield chunk
+            self.rows_done += len(chunk)
+
+
+class BackgroundJobs:
+    """Thread pool with a cap on queued plus running jobs."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        """Create the pool; at most ``max_pending`` jobs may be unfinished at once."""
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export')
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        return self._pending
+
+    def submit(self, label: str, file_name: str, total_rows: int,
+               work: Callable[[ExportJob], bytes]) -> ExportJob:
+        """Queue ``work(job)``, which returns the export's bytes.
+
+        Raises :class:`JobQueueFull` when ``max_pending`` jobs are unfinished.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"{self._pending} exports are already in progress; try again shortly")
+            self._pending += 1
+        job = ExportJob(next(self._ids), label, file_name, total_rows)
+
+        def run() -> bytes:
+            job.started = time.perf_counter()
+            try:
+                return work(job)
+            finally:
+                job.finished = time.perf_counter()
+                with self._lock:
+                    self._pending -= 1
+
+        job.future = self._executor.submit(run)
+        return job
+
+    def shutdown(self) -> None:
+        """Wait for running jobs and stop the pool."""
+        self._executor.shutdown(wait=True)
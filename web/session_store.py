@@ -0,0 +1,231 @@
+"""Per-session scratch storage and a memory-bounded pool of session processors.
+
+One app instance serves many graders, so each browser session gets its own
+scratch directory for uploads and saved changes. Autosave journals are kept
+under a separate id that a reloaded page can find again. Processors live in a pool
+shared by all sessions rather than in ``st.session_state``. When their
+estimated size exceeds the budget, the least recently used sessions are
+written to a compact snapshot on disk and dropped from memory. The next
+request from such a session rebuilds its processor from the snapshot. The
+module does not import Streamlit.
+"""
+from __future__ import annotations
+import json
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from quiz_processor import QuizProcessor
+
+
+DEFAULT_SCRATCH_ROOT = Path('sessions')
+SNAPSHOT_DIR_NAME = 'snapshot'
+JOURNAL_DIR_NAME = 'journals'
+
+
+def estimate_processor_bytes(processor: QuizProcessor) -> int:
+    """Estimate the memory held by a processor's frame, score matrix, aggregates and statistics."""
+    store, aggregates = processor.store, processor.aggregates
+    arrays = (store.scores, store.student_rows, store.student_team_index, store.team_names,
+              aggregates.team_raw_totals, aggregates.team_adjusted_totals, aggregates.adjusted_scores,
+              processor.question_stats.team_totals, processor.question_stats.histogram)
+    return (int(processor.df.memory_usage(deep=True).sum())
+            + int(store.students.memory_usage(deep=True).sum())
+            + sum(a.nbytes for a in arrays))
+
+
+def write_snapshot(processor: QuizProcessor, snapshot_dir: Path) -> None:
+    """Save what is needed to rebuild a processor: its frame, score matrix and settings."""
+    import numpy as np
+
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    processor.df.to_pickle(snapshot_dir / 'frame.pkl')
+    np.save(snapshot_dir / 'scores.npy', processor.store.scores)
+    state = {
+        'input_file': str(processor.input_file),
+        'sheet_name': processor.sheet_name,
+        'total_points': processor.total_points,
+        'raw_score_per_question': processor.raw_score_per_question,
+        'changed_scores': {team: sorted(qs) for team, qs in processor.changed_scores.items()}
+    }
+    (snapshot_dir / 'state.json').write_text(json.dumps(state))
+
+
+def read_snapshot(snapshot_dir: Path) -> QuizProcessor:
+    """Rebuild a processor, including its edited scores, from a snapshot."""
+    import numpy as np
+    import pandas as pd
+
+    state = json.loads((snapshot_dir / 'state.json').read_text())
+    processor = QuizProcessor(Path(state['input_file']), state['sheet_name'], state['total_points'],
+                              state['raw_score_per_question'], data=pd.read_pickle(snapshot_dir / 'frame.pkl'))
+    processor.store.scores[:] = np.load(snapshot_dir / 'scores.npy')
+    processor.set_parameters(processor.total_points, processor.raw_score_per_question)
+    processor.changed_scores = {team: set(qs) for team, qs in state['changed_scores'].items()}
+    return processor
+
+
+@dataclass
+class SessionEntry:
+    """A session's processor, or the snapshot it was evicted to."""
+    processor: Optional[QuizProcessor]
+    nbytes: int
+    last_used: float
+    snapshot_dir: Optional[Path] = None
+    pins: int = 0
+    evicting: bool = False
+
+
+class SessionProcessorPool:
+    """Processors of all sessions, kept under a shared memory budget with LRU eviction."""
+
+    def __init__(self, memory_budget_mb: float, scratch_root: Path = DEFAULT_SCRATCH_ROOT):
+        """Create an empty pool whose resident processors should stay under the budget."""
+        self.memory_budget = int(memory_budget_mb * 2**20)
+        self.scratch_root = scratch_root
+        self._entries: OrderedDict[str, SessionEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.rehydrations = 0
+
+    def scratch_dir(self, session_id: str, *parts: str) -> Path:
+        """Get (and create) a directory inside the session's scratch space."""
+        path = self.scratch_root.joinpath(session_id, *parts)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def journal_dir(self, journal_id: str) -> Path:
+        """Get (and create) the autosave journal directory for an id that outlives sessions.
+
+        Journals are kept apart from session scratch space, so they survive
+        discarded sessions and server restarts.
+        """
+        path = self.scratch_root / JOURNAL_DIR_NAME / journal_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated size of the processors currently in memory."""
+        return sum(e.nbytes for e in self._entries.values() if e.processor is not None)
+
+    def put(self, session_id: str, processor: QuizProcessor) -> None:
+        """Register a session's new processor, evicting others if over budget."""
+        with self._lock:
+            entry = self._entries.setdefault(session_id, SessionEntry(None, 0, time.time()))
+            entry.processor, entry.snapshot_dir = processor, None
+            entry.nbytes, entry.last_used = estimate_processor_bytes(processor), time.time()
+            self._entries.move_to_end(session_id)
+        self._evict(keep=session_id)
+
+    def get(self, session_id: str) -> Optional[QuizProcessor]:
+        """Get a session's processor, rebuilding it from its snapshot if it was evicted.
+
+        The snapshot is read without holding the pool lock, so other
+        sessions are not blocked on the disk.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.processor is None and entry.snapshot_dir is None:
+                return None
+            entry.last_used = time.time()
+            self._entries.move_to_end(session_id)
+            if entry.processor is not None:
+                return entry.processor
+            snapshot_dir = entry.snapshot_dir
+        processor = read_snapshot(snapshot_dir)
+        with self._lock:
+            if entry.processor is None:
+                entry.processor = processor
+                entry.last_used = time.time()
+                self.rehydrations += 1
+            processor = entry.processor
+        self._evict(keep=session_id)
+        return processor
+
+    @contextmanager
+    def pinned(self, session_id: str) -> Iterator[None]:
+        """Keep a session's processor in memory while a request is using it.
+
+        Eviction skips pinned sessions, so edits made through a processor
+        obtained inside the block cannot land on an already snapshotted copy.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                entry = self._entries[session_id] = SessionEntry(None, 0, time.time())
+            entry.pins += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                entry.pins -= 1
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session and delete its scratch directory of uploads and snapshots."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+        shutil.rmtree(self.scratch_root / session_id, ignore_errors=True)
+
+    def discard_idle(self, max_idle_seconds: float) -> int:
+        """Forget sessions unused for longer than the limit; returns how many were removed."""
+        cutoff = time.time() - max_idle_seconds
+        with self._lock:
+            idle = [sid for sid, entry in self._entries.items() if entry.last_used < cutoff and not entry.pins]
+        for session_id in idle:
+            self.discard(session_id)
+        return len(idle)
+
+    def _evict(self, keep: str) -> None:
+        """Snapshot and drop least recently used, unpinned processors until under budget.
+
+        Victims are chosen and marked under the lock, their snapshots are
+        written without it, and each processor is dropped under the lock
+        only if its session was not used or replaced in the meantime.
+        """
+        with self._lock:
+            excess = self.resident_bytes - self.memory_budget
+            excess -= sum(e.nbytes for e in self._entries.values() if e.evicting and e.processor is not None)
+            victims = []
+            for session_id, entry in self._entries.items():
+                if excess <= 0:
+                    break
+                if session_id == keep or entry.processor is None or entry.pins or entry.evicting:
+                    continue
+                entry.evicting = True
+                excess -= entry.nbytes
+                victims.append((session_id, entry, entry.processor, entry.last_used))
+
+        for session_id, entry, processor, last_used in victims:
+            snapshot_dir = self.scratch_dir(session_id, SNAPSHOT_DIR_NAME)
+            written = False
+            try:
+                write_snapshot(processor, snapshot_dir)
+                written = True
+            finally:
+                with self._lock:
+                    entry.evicting = False
+                    discarded = self._entries.get(session_id) is not entry
+                    if (written and not discarded and entry.processor is processor
+                            and entry.last_used == last_used and not entry.pins):
+                        entry.processor, entry.snapshot_dir = None, snapshot_dir
+                        self.evictions += 1
+            if discarded:
+                shutil.rmtree(self.scratch_root / session_id, ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Summarize pool occupancy and eviction counts."""
+        with self._lock:
+            resident = sum(e.processor is not None for e in self._entries.values())
+            return {
+                'sessions': len(self._entries),
+                'resident': resident,
+                'snapshotted': len(self._entries) - resident,
+                'resident_bytes': self.resident_bytes,
+                'evictions': self.evictions,
+                'rehydrations': self.rehydrations
+            }
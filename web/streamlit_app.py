@@ -1,4 +1,8 @@
 """Streamlit web interface for quiz processing."""
+import hashlib
+import io
+import re
+import uuid
 import streamlit as st
 from pathlib import Path
 import pandas as pd
@@ -8,8 +12,33 @@ import streamlit.components.v1 as components
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
+from bulk_edits import (BulkEdit, ScoreRule, apply_bulk_edit, grid_column, grid_edits, plan_bulk_edit,
+                        read_edit_file, score_grid)
+from delta_processor import CONFLICT_POLICIES, carry_forward
+from instrumentation import Instrumentation
 from quiz_processor import QuizProcessor
+from report_formats import (CHUNKED_WRITERS, MIME_TYPES, REPORT_FORMATS, format_for_path, iter_report_chunks,
+                            parquet_available)
+from report_writer import StreamingExcelWriter, iter_result_rows
+from score_journal import ScoreJournal
+from scoring_engine import ScoringResult
+from sheet_reader import read_quiz_sheet
 from ui.score_change import ScoreChange
+from web.background_jobs import BackgroundJobs, ExportJob, JobQueueFull
+from web.session_store import SessionProcessorPool
+
+SHEET_NAME = 'Team Analysis'
+MAX_CACHED_WORKBOOKS = 8
+EXPORT_WORKERS = 2
+MAX_PENDING_EXPORTS = 8
+GRID_PAGE_SIZES = [25, 50, 100, 200]
+EXPORT_POLL_SECONDS = 0.5
+# Estimated size of all sessions' processors kept in memory before idle ones are snapshotted to disk.
+MEMORY_BUDGET_MB = 1024
+SESSION_IDLE_SECONDS = 12 * 60 * 60
+# Explicitly saved changes are kept outside session scratch space, which is deleted when idle.
+SAVED_CHANGES_DIR = Path("saved_changes")
+SESSION_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
 
 
 def close_app():
@@ -25,12 +54,35 @@ def close_app():
     st.stop()
 
 
+def journal_id_from_url() -> str:
+    """Get the journal id kept in the page URL, creating one if missing.
+
+    Keeping it in the URL lets a reloaded page, even after a server restart,
+    find its autosave journal again. The URL can be copied into another
+    tab, so it only locates journals; the processor pool and scratch space
+    are keyed by the per-tab session id.
+    """
+    journal_id = st.query_params.get('session', '')
+    if not SESSION_ID_PATTERN.fullmatch(journal_id):
+        journal_id = uuid.uuid4().hex
+        st.query_params['session'] = journal_id
+    return journal_id
+
+
 def initialize_session_state() -> None:
     """Initialize Streamlit session state variables."""
+    if 'journal_id' not in st.session_state:
+        st.session_state.journal_id = journal_id_from_url()
     defaults = {
-        'processor': None,
+        'session_id': uuid.uuid4().hex,
+        'processor_key': None,
+        'journal': None,
+        'input_hash': None,
         'score_changes': [],
         'current_team': None,
+        'export_job': None,
+        'carry_conflicts': None,
+        'grid_version': 0,
         'should_close': False
     }
     for key, value in defaults.items():
@@ -44,8 +96,8 @@ def save_score_changes(processor: QuizProcessor) -> None:
         st.warning("No changes to save")
         return
         
-    save_dir = Path("saved_changes")
-    save_dir.mkdir(exist_ok=True)
+    save_dir = SAVED_CHANGES_DIR / st.session_state.session_id
+    save_dir.mkdir(parents=True, exist_ok=True)
     
     # Create changes summary
     changes_data = []
@@ -67,16 +119,8 @@ def save_score_changes(processor: QuizProcessor) -> None:
         changes_df.to_excel(writer, index=False, sheet_name='Score Changes')
         
         # Also save current scores
-        teams_data = []
-        for team_name in sorted(processor.df['Team'].unique()):
-            team_data = processor.df[processor.df['Team'] == team_name].iloc[0]
-            row = {"Team": team_name}
-            for q_num in processor.question_numbers:
-                score_col = f"{q_num}_Score"
-                row[f"Q{q_num}"] = float(team_data[score_col])
-            teams_data.append(row)
-            
-        pd.DataFrame(teams_data).to_excel(
+        current_scores = processor.store.to_frame()
+        current_scores.to_excel(
             writer, 
             index=False, 
             sheet_name='Current Scores'
@@ -85,27 +129,29 @@ def save_score_changes(processor: QuizProcessor) -> None:
     st.success(f"Changes saved to {save_path}")
 
 
-def create_score_table(processor: QuizProcessor, team_data: pd.DataFrame) -> pd.DataFrame:
+def create_score_table(processor: QuizProcessor, team_name: str) -> pd.DataFrame:
     """Create a table of scores for display."""
     return pd.DataFrame([
         {
             "Question": f"Question {q_num}",
-            "Current Score": f"{float(team_data[f'{q_num}_Score'].iloc[0]):.1f}",
+            "Current Score": f"{score:.1f}",
             "Maximum Score": f"{processor.raw_score_per_question:.1f}"
         }
-        for q_num in processor.question_numbers
+        for q_num, score in processor.get_team_scores(team_name).items()
     ])
 
 
 def display_team_scores(processor: QuizProcessor, team_name: str) -> None:
     """Display scores for a specific team."""
-    team_data = processor.df[processor.df['Team'] == team_name]
-    if team_data.empty:
+    if not processor.has_team(team_name):
         st.warning(f"No data found for team {team_name}")
         return
 
     st.subheader(f"Scores for {team_name}")
-    st.table(create_score_table(processor, team_data))
+    raw_total, adjusted_total = processor.get_team_totals(team_name)
+    st.write(f"Raw total: {raw_total:.1f} / {processor.max_possible_raw_total:.1f} "
+             f"— Adjusted total: {adjusted_total:.2f} / {processor.total_points:.2f}")
+    st.table(create_score_table(processor, team_name))
 
 
 def create_changes_table(changes: list[ScoreChange]) -> pd.DataFrame:
@@ -128,19 +174,20 @@ def create_changes_table(changes: list[ScoreChange]) -> pd.DataFrame:
 def handle_score_update(processor: QuizProcessor, team_name: str, 
                        question_number: int, new_score: float) -> None:
     """Handle updating a team's score."""
-    score_col = f"{question_number}_Score"
-    current_score = float(processor.df.loc[processor.df['Team'] == team_name, score_col].iloc[0])
+    current_score = processor.get_team_score(team_name, question_number)
     
     if new_score != current_score:
         change = ScoreChange(team_name, question_number, current_score, new_score)
-        processor.df.loc[processor.df['Team'] == team_name, score_col] = new_score
+        processor.set_team_score(team_name, question_number, new_score)
         st.session_state.score_changes.append(change)
+        if st.session_state.journal is not None:
+            st.session_state.journal.append(change)
         st.success(f"Updated score from {current_score:.1f} to {new_score:.1f}")
 
 
 def edit_team_scores(processor: QuizProcessor) -> None:
     """Edit team scores interface."""
-    teams = sorted(processor.df['Team'].unique())
+    teams = processor.teams
     
     col1, col2 = st.columns(2)
     
@@ -153,10 +200,7 @@ def edit_team_scores(processor: QuizProcessor) -> None:
         st.subheader("Edit Score")
         question_number = st.selectbox("Choose question number:", processor.question_numbers)
         
-        current_score = float(processor.df.loc[
-            processor.df['Team'] == team_name, 
-            f"{question_number}_Score"
-        ].iloc[0])
+        current_score = processor.get_team_score(team_name, question_number)
         
         new_score = st.number_input(
             "Enter new score:",
@@ -181,44 +225,258 @@ def edit_team_scores(processor: QuizProcessor) -> None:
         changes_table = create_changes_table(st.session_state.score_changes)
         if changes_table is not None:
             st.subheader("Score Changes Summary")
-            st.table(changes_table)
+            st.dataframe(changes_table, hide_index=True)
 
+        if st.session_state.carry_conflicts is not None:
+            with st.expander("Carried-Forward Conflicts"):
+                st.caption("Edits whose score changed in the new export, or whose team or question is gone")
+                st.dataframe(st.session_state.carry_conflicts, hide_index=True)
 
-def save_and_process_file(processor: QuizProcessor, quiz_name: str) -> Path:
-    """Save and process quiz data."""
-    results, question_numbers, max_raw_total = processor.process_data()
-    
+
+def apply_score_edits(processor: QuizProcessor, edit: BulkEdit, applied_key: str) -> None:
+    """Apply a planned bulk edit as one batch, journal its changes and rerun to show them."""
+    diff = edit.diff_frame()
+    changes = apply_bulk_edit(processor, edit)
+    st.session_state.score_changes.extend(changes)
+    if st.session_state.journal is not None:
+        st.session_state.journal.extend(changes)
+    st.session_state[applied_key] = diff
+    st.rerun()
+
+
+def show_applied_edits(applied_key: str) -> None:
+    """Show the changes applied by the previous run, if any."""
+    applied = st.session_state.pop(applied_key, None)
+    if applied is not None:
+        st.success(f"Applied {len(applied)} score changes")
+        st.dataframe(applied, hide_index=True)
+
+
+def grid_page_teams(processor: QuizProcessor) -> list:
+    """Pick the teams of the grid page selected by the filter and page controls."""
+    filter_col, size_col, page_col = st.columns([2, 1, 1])
+    with filter_col:
+        text = st.text_input("Filter teams:", key="grid_filter").strip().lower()
+    teams = [team for team in processor.teams if text in str(team).lower()] if text else processor.teams
+    with size_col:
+        page_size = st.selectbox("Teams per page:", GRID_PAGE_SIZES, key="grid_page_size")
+    num_pages = max(1, -(-len(teams) // page_size))
+    with page_col:
+        page = st.number_input(f"Page (of {num_pages}):", min_value=1, max_value=num_pages, value=1,
+                               key="grid_page")
+    return teams[(page - 1) * page_size:page * page_size]
+
+
+def edit_score_grid(processor: QuizProcessor) -> None:
+    """Edit whole teams in a paged team-by-question grid and apply all changed cells at once."""
+    show_applied_edits("grid_edit_applied")
+
+    with st.expander("Score Grid"):
+        teams = grid_page_teams(processor)
+        if not teams:
+            st.info("No teams match the filter")
+            return
+        column_config = {
+            grid_column(q_num): st.column_config.NumberColumn(
+                grid_column(q_num), min_value=0.0, max_value=processor.raw_score_per_question, step=0.5,
+                format="%.1f")
+            for q_num in processor.question_numbers
+        }
+        # Edits are kept per page and reset after each apply, so they never land on other teams.
+        key = (f"score_grid_{st.session_state.grid_version}_{st.session_state.grid_filter}_"
+               f"{st.session_state.grid_page_size}_{st.session_state.grid_page}")
+        with st.form("score_grid_form"):
+            edited = st.data_editor(score_grid(processor, teams), hide_index=True, disabled=['Team'],
+                                    column_config=column_config, key=key)
+            submitted = st.form_submit_button("Apply Grid Changes")
+        if not submitted:
+            return
+        try:
+            edit = plan_bulk_edit(processor, grid_edits(processor, edited))
+        except (ValueError, KeyError) as exc:
+            st.error(str(exc))
+            return
+        if not len(edit):
+            st.info("No scores were changed")
+            return
+        st.session_state.grid_version += 1
+        apply_score_edits(processor, edit, "grid_edit_applied")
+
+
+def bulk_edit_frame(processor: QuizProcessor) -> pd.DataFrame | None:
+    """Collect bulk edit rows from an uploaded changes file or a score rule."""
+    source = st.radio("Edit source:", ["Changes file", "Rule"], horizontal=True)
+    if source == "Changes file":
+        uploaded = st.file_uploader("Upload a CSV or Excel file with Team, Question and New Score columns",
+                                    type=["csv", "xlsx"], key="bulk_edit_file")
+        return None if uploaded is None else read_edit_file(uploaded, uploaded.name)
+
+    actions = {"Full marks": "full", "Set score": "set", "Add points": "add"}
+    action = st.selectbox("Rule:", list(actions))
+    questions = st.multiselect("Questions:", processor.question_numbers, format_func=lambda q: f"Q{q}")
+    value = 0.0
+    if action != "Full marks":
+        value = st.number_input("Points:" if action == "Add points" else "Score:",
+                                min_value=-processor.raw_score_per_question if action == "Add points" else 0.0,
+                                max_value=processor.raw_score_per_question, value=0.0, step=0.5)
+    if not questions:
+        return None
+    return ScoreRule(actions[action], questions, value).to_frame(processor)
+
+
+def bulk_edit_scores(processor: QuizProcessor) -> None:
+    """Preview and apply many score edits at once."""
+    show_applied_edits("bulk_edit_applied")
+
+    with st.expander("Bulk Edit"):
+        try:
+            edits = bulk_edit_frame(processor)
+            edit = None if edits is None else plan_bulk_edit(processor, edits)
+        except (ValueError, KeyError) as exc:
+            st.error(str(exc))
+            return
+        if edit is None:
+            return
+        if not len(edit):
+            st.info("These edits do not change any scores")
+            return
+
+        diff = edit.diff_frame()
+        st.write(f"{len(edit)} scores will change "
+                 f"(total difference {diff['Difference'].sum():+.1f} points)")
+        st.dataframe(diff, hide_index=True)
+        if st.button("Apply Bulk Edit"):
+            apply_score_edits(processor, edit, "bulk_edit_applied")
+
+
+@st.cache_resource
+def get_background_jobs() -> BackgroundJobs:
+    """Get the export executor shared by all sessions."""
+    return BackgroundJobs(max_workers=EXPORT_WORKERS, max_pending=MAX_PENDING_EXPORTS)
+
+
+def render_report(result: ScoringResult, changed_scores: dict, job: ExportJob, fmt: str = 'xlsx') -> bytes:
+    """Write the report for a scoring snapshot into memory; runs on the export pool."""
+    buffer = io.BytesIO()
+    if fmt == 'xlsx':
+        writer = StreamingExcelWriter(result.question_numbers, changed_scores)
+        writer.write(job.track(iter_result_rows(result)), buffer)
+    else:
+        CHUNKED_WRITERS[fmt]().write(job.track_chunks(iter_report_chunks(result, changed_scores)), buffer)
+    return buffer.getvalue()
+
+
+def export_formats() -> list[str]:
+    """Get the download formats available in this installation."""
+    return [fmt for fmt in REPORT_FORMATS if fmt != 'parquet' or parquet_available()]
+
+
+def start_export(processor: QuizProcessor, quiz_name: str, fmt: str = 'xlsx') -> None:
+    """Snapshot the current scores and queue the report export.
+
+    The snapshot is taken in the script thread, so edits made while the
+    export runs do not affect it.
+    """
+    if st.session_state.score_changes:
+        processor.record_score_changes(st.session_state.score_changes)
+    result = processor.score()
+    changed_scores = {team: set(questions) for team, questions in processor.changed_scores.items()}
+
+    try:
+        st.session_state.export_job = get_background_jobs().submit(
+            quiz_name, f"{quiz_name}.{fmt}", result.num_students,
+            lambda job: render_report(result, changed_scores, job, fmt)
+        )
+    except JobQueueFull as exc:
+        st.error(str(exc))
+
+
+def display_processing_results(processor: QuizProcessor) -> None:
+    """Show the parameters the report is computed with."""
     st.subheader("Processing Results")
-    st.write(f"Found {len(question_numbers)} questions")
+    st.write(f"Found {len(processor.question_numbers)} questions")
     st.write(f"Raw score possible per question: {processor.raw_score_per_question} points")
-    st.write(f"Maximum raw score possible: {max_raw_total} points")
+    st.write(f"Maximum raw score possible: {processor.max_possible_raw_total} points")
     st.write(f"Total adjusted points: {processor.total_points} points")
-    
-    # Generate output file
-    output_file = Path("outputdata") / f"{quiz_name}.xlsx"
-    output_file.parent.mkdir(exist_ok=True)
-    
-    if st.session_state.score_changes:
-        processor.record_score_changes(st.session_state.score_changes)
-    
-    QuizProcessor.create_output_excel(results, question_numbers, output_file, processor)
-    return output_file
 
 
-def process_quiz(processor: QuizProcessor, quiz_name: str) -> None:
-    """Process quiz and generate output."""
-    output_file = save_and_process_file(processor, quiz_name)
-    
-    # Provide download link
-    with open(output_file, "rb") as file:
+@st.fragment(run_every=EXPORT_POLL_SECONDS)
+def poll_export(job: ExportJob) -> None:
+    """Show a running export's progress, rerunning the app once it finishes."""
+    if job.status in ('queued', 'running'):
+        text = "Waiting for a free worker..." if job.status == 'queued' else f"Writing {job.label}..."
+        st.progress(job.progress, text=text)
+    else:
+        st.rerun()
+
+
+def display_export(job: ExportJob) -> None:
+    """Show the status of the session's export and its download once ready."""
+    if job.status in ('queued', 'running'):
+        poll_export(job)
+    elif job.status == 'failed':
+        st.error(f"Processing {job.label} failed: {job.error}")
+    else:
+        st.success(f"Processed {job.label} in {job.elapsed:.2f}s")
         st.download_button(
             label="Download Processed File",
-            data=file,
-            file_name=output_file.name,
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            data=job.result(),
+            file_name=job.file_name,
+            mime=MIME_TYPES[format_for_path(Path(job.file_name))]
         )
 
 
+def display_question_analysis(processor: QuizProcessor) -> None:
+    """Show per-question statistics and score distributions to spot problem questions."""
+    stats = processor.question_stats_frame()
+    distribution = processor.question_distribution_frame()
+    stats['Distribution'] = distribution.to_numpy().tolist()
+    flagged = stats[stats['Flags'] != '']
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Questions", len(stats))
+    col2.metric("Flagged questions", len(flagged))
+    col3.metric("Average score", f"{stats['Mean %'].mean():.0f}%")
+
+    shown = flagged if st.checkbox("Show only flagged questions") else stats
+    st.dataframe(shown, hide_index=True, column_config={
+        'Mean': st.column_config.NumberColumn(format="%.2f"),
+        'Std Dev': st.column_config.NumberColumn(format="%.2f"),
+        'Mean %': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+        'Full Marks %': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%"),
+        'Zero %': st.column_config.NumberColumn(format="%.0f%%"),
+        'Discrimination': st.column_config.NumberColumn(
+            format="%.2f", help="Correlation between the question score and the team raw total"),
+        'Distribution': st.column_config.BarChartColumn(
+            "Distribution", help="Teams per score bin, from 0 to full marks", y_min=0)
+    })
+    with st.expander("Score distribution counts"):
+        st.dataframe(distribution)
+
+
+def display_performance(processor: QuizProcessor) -> None:
+    """Show recorded per-stage timings in an expandable panel.
+
+    Memory is not tracked in the web app: tracemalloc traces the whole
+    server process, so it would slow every session and mix their peaks.
+    Use ``cli process --profile`` for peak memory.
+    """
+    if processor.instrumentation is None:
+        return
+
+    with st.expander("Performance"):
+        report = processor.instrumentation.report()
+        if not report['stages']:
+            st.write("No stages recorded yet.")
+            return
+        st.dataframe(pd.DataFrame(report['stages']).drop(columns='peak_mb'), hide_index=True)
+        st.write(f"Total: {report['total_wall_seconds']:.3f}s wall time, "
+                 f"{report['total_cpu_seconds']:.3f}s CPU time")
+        if st.button("Clear Measurements"):
+            processor.instrumentation.clear()
+            st.rerun()
+
+
 def setup_quiz_parameters() -> tuple[str, float, float]:
     """Set up quiz parameters through user input."""
     st.subheader("Quiz Parameters")
@@ -238,8 +496,88 @@ def setup_quiz_parameters() -> tuple[str, float, float]:
     return quiz_name, raw_score, total_points
 
 
-def handle_file_upload() -> tuple[Path, str]:
-    """Handle file upload and saving."""
+@st.cache_data(max_entries=MAX_CACHED_WORKBOOKS, show_spinner="Reading workbook...")
+def load_sheet(file_hash: str, sheet_name: str, _file_bytes: bytes) -> pd.DataFrame:
+    """Parse a workbook sheet once per content hash.
+
+    The bytes are excluded from Streamlit's argument hashing; ``file_hash``
+    identifies the content. Each call returns a fresh copy of the cached frame.
+    Only the columns needed for processing are parsed.
+    """
+    return read_quiz_sheet(io.BytesIO(_file_bytes), sheet_name)
+
+
+@st.cache_resource
+def get_session_pool() -> SessionProcessorPool:
+    """Get the processor pool shared by all sessions."""
+    return SessionProcessorPool(MEMORY_BUDGET_MB)
+
+
+def get_processor(input_path: Path, file_hash: str, file_bytes: bytes,
+                  total_points: float, raw_score: float, record_performance: bool = False,
+                  carry_policy: str | None = None) -> QuizProcessor:
+    """Return the session's processor, building it only when a new file is uploaded.
+
+    A new file starts from the edits autosaved in its journal, if any. With
+    ``carry_policy`` set and no journal, the previous file's edits are
+    carried forward instead (see :func:`delta_processor.carry_forward`). A
+    parameter change on the same file keeps the processor and its edits and
+    only re-derives the totals. The
+    processor is held by the shared session pool, which may have moved it
+    to disk while the session was idle.
+    """
+    pool = get_session_pool()
+    session_id = st.session_state.session_id
+    processor = pool.get(session_id)
+    key = (file_hash, SHEET_NAME, total_points, raw_score)
+    if processor is not None and st.session_state.processor_key == key:
+        if not record_performance:
+            processor.instrumentation = None
+        elif processor.instrumentation is None:
+            processor.instrumentation = Instrumentation(track_memory=False)
+        return processor
+
+    if st.session_state.input_hash == file_hash and processor is not None:
+        processor.set_parameters(total_points, raw_score)
+    else:
+        previous_changes = st.session_state.score_changes if carry_policy else []
+        st.session_state.score_changes = []
+        st.session_state.carry_conflicts = None
+        st.session_state.current_team = None
+        st.session_state.export_job = None
+        st.session_state.input_hash = file_hash
+        processor = QuizProcessor(
+            input_file=input_path,
+            sheet_name=SHEET_NAME,
+            total_points=total_points,
+            raw_score_per_question=raw_score,
+            data=load_sheet(file_hash, SHEET_NAME, file_bytes),
+            instrumentation=Instrumentation(track_memory=False) if record_performance else None
+        )
+        journal = ScoreJournal(pool.journal_dir(st.session_state.journal_id) / f"{file_hash[:16]}.jsonl")
+        if journal.exists():
+            st.session_state.score_changes = journal.replay(processor)
+            st.info(f"Restored {len(st.session_state.score_changes)} autosaved score changes")
+        elif previous_changes:
+            carried = carry_forward(previous_changes, processor, on_conflict=carry_policy)
+            st.session_state.score_changes = list(carried.applied)
+            journal.extend(carried.applied)
+            st.session_state.carry_conflicts = carried.conflicts_frame() if carried.conflicts else None
+            st.info(f"New export: {carried.summary()}")
+        st.session_state.journal = journal
+        pool.discard_idle(SESSION_IDLE_SECONDS)
+        pool.put(session_id, processor)
+
+    st.session_state.processor_key = key
+    return processor
+
+
+def handle_file_upload() -> tuple[Path, str, bytes]:
+    """Handle file upload and saving.
+
+    The upload is written to the session's own scratch directory, and only
+    when its content differs from the file already loaded in this session.
+    """
     st.subheader("Upload Quiz File")
     uploaded_file = st.file_uploader(
         "Choose Excel file",
@@ -248,15 +586,17 @@ def handle_file_upload() -> tuple[Path, str]:
     )
     
     if uploaded_file:
-        input_dir = Path("inputdata")
-        input_dir.mkdir(exist_ok=True)
+        file_bytes = uploaded_file.getvalue()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        input_dir = get_session_pool().scratch_dir(st.session_state.session_id, "inputdata")
         input_path = input_dir / uploaded_file.name
         
-        with open(input_path, "wb") as f:
-            f.write(uploaded_file.getvalue())
+        if st.session_state.input_hash != file_hash or not input_path.exists():
+            with open(input_path, "wb") as f:
+                f.write(file_bytes)
             
-        return input_path, uploaded_file.name
-    return None, None
+        return input_path, file_hash, file_bytes
+    return None, None, None
 
 
 def main() -> None:
@@ -283,32 +623,57 @@ def main() -> None:
     upload_col, params_col = st.columns(2)
     
     with upload_col:
-        input_path, _ = handle_file_upload()
+        input_path, file_hash, file_bytes = handle_file_upload()
     
     with params_col:
         quiz_name, raw_score, total_points = setup_quiz_parameters()
-    
-    # Process uploaded file
-    if input_path:
-        st.session_state.processor = QuizProcessor(
-            input_file=input_path,
-            sheet_name='Team Analysis',
-            total_points=total_points,
-            raw_score_per_question=raw_score
+        record_performance = st.checkbox(
+            "Record performance metrics",
+            help="Time each processing stage and show the results in a Performance panel"
         )
+        carry_policy = None
+        if st.checkbox("New export of the same quiz: carry score edits forward",
+                       help="When the next file is uploaded, re-apply this file's score edits to it"):
+            carry_policy = st.selectbox(
+                "When the new export changed an edited score:", CONFLICT_POLICIES,
+                format_func=lambda policy: {'keep': "Keep my edit", 'export': "Keep the export's score"}[policy]
+            )
+    
+    # Process uploaded file; the session's processor stays in memory for the whole run
+    with get_session_pool().pinned(st.session_state.session_id):
+        if input_path:
+            processor = get_processor(input_path, file_hash, file_bytes, total_points, raw_score,
+                                      record_performance, carry_policy)
         
-        # Create tabs for editing and processing
-        tab1, tab2 = st.tabs(["Edit Scores", "Process Quiz"])
+            # Create tabs for editing and processing
+            tab1, tab2, tab3 = st.tabs(["Edit Scores", "Process Quiz", "Question Analysis"])
         
-        with tab1:
-            edit_team_scores(st.session_state.processor)
+            with tab1:
+                edit_team_scores(processor)
+                edit_score_grid(processor)
+                bulk_edit_scores(processor)
+        
+            with tab2:
+                st.subheader("Current Team Totals")
+                st.dataframe(processor.team_totals_frame(), hide_index=True)
+                report_format = st.selectbox(
+                    "Download format:", export_formats(),
+                    help="Excel highlights changed scores; CSV, Parquet and JSON Lines list them "
+                         "in a 'Changed Questions' column"
+                )
+                if st.button("Process Quiz"):
+                    if not quiz_name:
+                        st.error("Please enter a quiz name")
+                    else:
+                        start_export(processor, quiz_name, report_format)
+                if st.session_state.export_job is not None:
+                    display_processing_results(processor)
+                    display_export(st.session_state.export_job)
+
+            with tab3:
+                display_question_analysis(processor)
         
-        with tab2:
-            if st.button("Process Quiz"):
-                if not quiz_name:
-                    st.error("Please enter a quiz name")
-                else:
-                    process_quiz(st.session_state.processor, quiz_name)
+            display_performance(processor)
 
 
 if __name__ == "__main__":
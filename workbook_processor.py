@@ -0,0 +1,137 @@
+"""Process every quiz sheet of a workbook from a single read.
+
+The workbook is opened and parsed once; each selected sheet then gets its
+own :class:`QuizProcessor` built from the parsed frame. Building the
+processors and scoring them can run in threads. The combined report holds one sheet per quiz
+plus a summary of each student's totals across quizzes.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from quiz_processor import QuizProcessor
+from sheet_reader import read_quiz_sheets
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from scoring_engine import ScoringResult
+
+
+SUMMARY_SHEET = 'Quiz Summary'
+SUMMARY_KEY_COLUMNS = ['Student ID', 'Student Name', 'Email Address']
+
+
+def student_id_keys(ids: pd.Series) -> pd.Series:
+    """Get Student IDs as text, so numeric and text IDs from different sheets match.
+
+    Whole-number float IDs (from a column with blanks) lose their '.0';
+    missing IDs stay missing.
+    """
+    from pandas.api.types import is_float_dtype
+
+    if is_float_dtype(ids) and (ids.dropna() % 1 == 0).all():
+        ids = ids.astype('Int64')
+    return ids.astype(str).where(ids.notna())
+
+
+class WorkbookProcessor:
+    """Score several quiz sheets of one workbook with shared quiz parameters."""
+
+    def __init__(self, input_file: Path, total_points: float, raw_score_per_question: float,
+                 sheet_names: Optional[List[str]] = None, sheet_pattern: str = '*',
+                 reader_engine: str = 'auto', workers: int = 1):
+        """Read the selected sheets in one pass and build a processor for each.
+
+        ``sheet_names`` picks sheets explicitly; otherwise every sheet matching
+        ``sheet_pattern`` that has a 'Team' column is processed. ``workers``
+        above 1 builds the processors in a thread pool.
+        """
+        self.input_file = input_file
+        self.total_points = total_points
+        self.raw_score_per_question = raw_score_per_question
+        self.workers = max(1, workers)
+
+        frames = read_quiz_sheets(input_file, sheet_names, reader_engine, sheet_pattern)
+        if sheet_names is None:
+            frames = {name: df for name, df in frames.items() if 'Team' in df.columns}
+        if not frames:
+            raise ValueError(f"No quiz sheets found in {input_file}")
+        self.sheet_names: List[str] = list(frames)
+
+        def build(name: str) -> QuizProcessor:
+            return QuizProcessor(input_file, name, total_points, raw_score_per_question, data=frames[name])
+
+        self.processors: Dict[str, QuizProcessor] = dict(zip(self.sheet_names, self._map(build, self.sheet_names)))
+
+    def _map(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Apply a function to each item, in threads when more than one worker is configured."""
+        if self.workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    def set_parameters(self, total_points: float, raw_score_per_question: float) -> None:
+        """Change the quiz parameters of every sheet without reloading."""
+        self.total_points = total_points
+        self.raw_score_per_question = raw_score_per_question
+        for processor in self.processors.values():
+            processor.set_parameters(total_points, raw_score_per_question)
+
+    def score(self) -> Dict[str, ScoringResult]:
+        """Score every sheet and return the results keyed by sheet name."""
+        results = self._map(lambda name: self.processors[name].score(), self.sheet_names)
+        return dict(zip(self.sheet_names, results))
+
+    def summary_frame(self, results: Optional[Dict[str, ScoringResult]] = None) -> pd.DataFrame:
+        """Build one row per student with their adjusted total for each quiz.
+
+        Students are matched across sheets by Student ID, compared as text;
+        the name and email come from the first sheet the student appears in.
+        'Total Adjusted' is the sum over the quizzes the student took.
+        """
+        results = results if results is not None else self.score()
+        summary: Optional[pd.DataFrame] = None
+        quiz_columns = []
+        for name, result in results.items():
+            column = f"{name} Adjusted Total"
+            quiz_columns.append(column)
+            frame = result.students[SUMMARY_KEY_COLUMNS].copy()
+            frame['Student ID'] = student_id_keys(frame['Student ID'])
+            frame[column] = result.team_adjusted_totals[result.student_team_index]
+            frame = frame.drop_duplicates('Student ID')
+            if summary is None:
+                summary = frame
+                continue
+            summary = summary.merge(frame, on='Student ID', how='outer', suffixes=('', ' (new)'), sort=False)
+            for key in SUMMARY_KEY_COLUMNS[1:]:
+                summary[key] = summary[key].fillna(summary.pop(f"{key} (new)"))
+
+        summary['Total Adjusted'] = summary[quiz_columns].sum(axis=1, min_count=1)
+        return summary.reset_index(drop=True)
+
+    def save_combined_report(self, output_file: Path) -> Dict[str, ScoringResult]:
+        """Write one report sheet per quiz plus the cross-quiz summary sheet.
+
+        Quiz sheets use the single-quiz report layout and highlighting. The
+        workbook is streamed in write-only mode. Returns the scored results.
+        """
+        from openpyxl import Workbook
+        from report_writer import StreamingExcelWriter, append_frame_sheet, iter_result_rows
+
+        results = self.score()
+        workbook = Workbook(write_only=True)
+        append_frame_sheet(workbook, self._summary_sheet_name(), self.summary_frame(results))
+        for name, result in results.items():
+            processor = self.processors[name]
+            writer = StreamingExcelWriter(processor.question_numbers, processor.changed_scores)
+            writer.append_sheet(workbook, iter_result_rows(result), name)
+        workbook.save(output_file)
+        return results
+
+    def _summary_sheet_name(self) -> str:
+        """Get a summary sheet name that does not clash with a quiz sheet."""
+        name, suffix = SUMMARY_SHEET, 1
+        while name in self.processors:
+            suffix += 1
+            name = f"{SUMMARY_SHEET} {suffix}"
+        return name